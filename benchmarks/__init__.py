@@ -0,0 +1,3 @@
+"""
+Benchmarks - Benchmark suite untuk pipeline analisis
+"""
@@ -0,0 +1,180 @@
+"""
+Benchmark Fixtures - Generator data sintetis (deteksi, keypoints, image)
+"""
+import os
+import numpy as np
+from config.config import POSTURE_MAPPING, KEYPOINT_NAMES
+
+CLASS_NAMES = {i: name for i, name in enumerate(POSTURE_MAPPING.keys())}
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class _Array:
+    """Wrapper numpy dengan interface .cpu().numpy() seperti tensor"""
+
+    def __init__(self, data):
+        self.data = np.asarray(data)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.data
+
+    def __getitem__(self, idx):
+        item = self.data[idx]
+        return _Array(item) if isinstance(item, np.ndarray) else item
+
+    def __len__(self):
+        return len(self.data)
+
+    def __int__(self):
+        return int(self.data)
+
+    def __float__(self):
+        return float(self.data)
+
+
+class _Boxes:
+    """Meniru ultralytics Boxes (cls, conf, xyxy)"""
+
+    def __init__(self, cls, conf, xyxy):
+        self.cls = _Array(cls)
+        self.conf = _Array(conf)
+        self.xyxy = _Array(xyxy)
+
+    def __len__(self):
+        return len(self.cls)
+
+
+class _KeypointItem:
+    """Meniru satu item ultralytics Keypoints (data shape (1, 17, 3))"""
+
+    def __init__(self, data):
+        self.data = _Array(data[None, :])
+
+
+class _Keypoints:
+    """Meniru ultralytics Keypoints"""
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, idx):
+        return _KeypointItem(self._data[idx])
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SyntheticResult:
+    """Meniru satu ultralytics Results untuk benchmark _parse_results"""
+
+    def __init__(self, detections):
+        self.names = CLASS_NAMES
+        self.boxes = _Boxes(
+            [d['class_id'] for d in detections],
+            [d['confidence'] for d in detections],
+            np.array([d['bbox'] for d in detections], dtype=np.float32).reshape(-1, 4)
+        )
+        self.keypoints = _Keypoints(
+            np.array([d['keypoints'] for d in detections], dtype=np.float32).reshape(-1, len(KEYPOINT_NAMES), 3)
+        )
+
+
+def make_keypoints(rng, bbox):
+    """
+    Generate 17 keypoints anatomis kasar di dalam bbox
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        bbox (list): [x1, y1, x2, y2]
+
+    Returns:
+        list: Keypoints flat [x, y, conf, ...]
+    """
+    x1, y1, x2, y2 = bbox
+    w, h = x2 - x1, y2 - y1
+
+    # Posisi relatif (x, y) dalam bbox untuk setiap keypoint COCO
+    template = np.array([
+        [0.50, 0.06], [0.47, 0.05], [0.53, 0.05], [0.44, 0.06], [0.56, 0.06],
+        [0.38, 0.20], [0.62, 0.20], [0.33, 0.35], [0.67, 0.35], [0.30, 0.48],
+        [0.70, 0.48], [0.42, 0.52], [0.58, 0.52], [0.42, 0.73], [0.58, 0.73],
+        [0.42, 0.95], [0.58, 0.95],
+    ])
+    jitter = rng.normal(0, 0.01, template.shape)
+    xy = (template + jitter) * [w, h] + [x1, y1]
+    conf = rng.uniform(0.3, 0.99, (len(template), 1))
+
+    return np.hstack([xy, conf]).reshape(-1).tolist()
+
+
+def make_detections(rng, image_size=(640, 480), max_persons=2):
+    """
+    Generate list deteksi sintetis (format output YOLOAnalyzer._parse_results)
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        image_size (tuple): (width, height)
+        max_persons (int): Jumlah maksimum orang per image
+
+    Returns:
+        list: List of detections
+    """
+    width, height = image_size
+    detections = []
+
+    for _ in range(int(rng.integers(1, max_persons + 1))):
+        bw = rng.uniform(0.2, 0.4) * width
+        bh = rng.uniform(0.6, 0.9) * height
+        x1 = rng.uniform(0, width - bw)
+        y1 = rng.uniform(0, height - bh)
+        bbox = [float(x1), float(y1), float(x1 + bw), float(y1 + bh)]
+
+        class_id = int(rng.integers(0, len(CLASS_NAMES)))
+        detections.append({
+            'class_id': class_id,
+            'class_name': CLASS_NAMES[class_id],
+            'confidence': float(rng.uniform(0.3, 0.99)),
+            'bbox': bbox,
+            'keypoints': make_keypoints(rng, bbox)
+        })
+
+    return detections
+
+
+def make_image(rng, image_size=(640, 480)):
+    """
+    Generate image RGB sintetis
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        image_size (tuple): (width, height)
+
+    Returns:
+        numpy.ndarray: Image array
+    """
+    width, height = image_size
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def list_real_images(images_dir, limit=None):
+    """
+    List image dari folder lokal (opsional)
+
+    Args:
+        images_dir (str): Path folder
+        limit (int): Jumlah maksimum image
+
+    Returns:
+        list: List path image (terurut)
+    """
+    if not images_dir or not os.path.isdir(images_dir):
+        return []
+
+    paths = sorted(
+        os.path.join(images_dir, name) for name in os.listdir(images_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    return paths[:limit] if limit else paths
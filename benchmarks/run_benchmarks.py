@@ -0,0 +1,307 @@
+"""
+Benchmark Suite - Throughput dan latency percentiles untuk pipeline analisis
+
+Usage:
+    python benchmarks/run_benchmarks.py run --output bench.json
+    python benchmarks/run_benchmarks.py run --images-dir foto/ --model models/best.pt
+    python benchmarks/run_benchmarks.py compare base.json bench.json --threshold 0.10
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.fixtures import SyntheticResult, make_detections, make_image, list_real_images
+from src.analysis.yolo_analyzer import YOLOAnalyzer
+from src.analysis.posture_analyzer import PostureAnalyzer
+from src.analysis.report_templates import get_report_text
+from src.utils.image_utils import load_image, create_side_by_side_image
+from src.utils.export_utils import export_to_csv
+
+DEFAULT_SESSION_SIZES = [1, 10, 100, 1000]
+
+
+def measure(func, inputs, warmup=3):
+    """
+    Ukur latency setiap pemanggilan func untuk setiap input
+
+    Args:
+        func (callable): Fungsi yang diukur (satu argumen)
+        inputs (list): List input
+        warmup (int): Jumlah pemanggilan warmup (tidak dihitung)
+
+    Returns:
+        dict: Statistik latency (ms) dan throughput (ops/s)
+    """
+    for item in inputs[:warmup]:
+        func(item)
+
+    samples = np.empty(len(inputs), dtype=np.int64)
+    for i, item in enumerate(inputs):
+        start_ns = time.perf_counter_ns()
+        func(item)
+        samples[i] = time.perf_counter_ns() - start_ns
+
+    return summarize(samples)
+
+
+def summarize(samples_ns):
+    """
+    Hitung statistik dari sample durasi
+
+    Args:
+        samples_ns (numpy.ndarray): Durasi dalam nanodetik
+
+    Returns:
+        dict: Statistik latency dan throughput
+    """
+    samples_ms = samples_ns / 1e6
+    total_s = samples_ns.sum() / 1e9
+
+    return {
+        'count': int(len(samples_ms)),
+        'mean_ms': float(samples_ms.mean()),
+        'p50_ms': float(np.percentile(samples_ms, 50)),
+        'p90_ms': float(np.percentile(samples_ms, 90)),
+        'p99_ms': float(np.percentile(samples_ms, 99)),
+        'max_ms': float(samples_ms.max()),
+        'throughput_per_s': float(len(samples_ms) / total_s) if total_s > 0 else 0.0
+    }
+
+
+def bench_stages(rng, images, height_mm, iterations, export_dir):
+    """
+    Benchmark setiap stage pipeline secara terpisah
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        images (list): List image RGB
+        height_mm (float): Tinggi badan untuk PostureAnalyzer
+        iterations (int): Jumlah sample per stage
+        export_dir (str): Folder sementara untuk export CSV
+
+    Returns:
+        dict: Statistik per stage
+    """
+    yolo_analyzer = YOLOAnalyzer()
+    posture_analyzer = PostureAnalyzer(height_mm)
+
+    detections = [make_detections(rng) for _ in range(iterations)]
+    raw_results = [[SyntheticResult(dets)] for dets in detections]
+    posture_results = [posture_analyzer.analyze(dets) for dets in detections]
+    pairs = [(images[i % len(images)], detections[i]) for i in range(iterations)]
+    annotated = [yolo_analyzer.annotate_image(img, dets) for img, dets in pairs[:len(images)]]
+
+    return {
+        'parse_results': measure(yolo_analyzer._parse_results, raw_results),
+        'posture_analyze': measure(posture_analyzer.analyze, detections),
+        'generate_report_text': measure(posture_analyzer.generate_report_text, posture_results),
+        'annotate_image': measure(lambda p: yolo_analyzer.annotate_image(*p), pairs),
+        'create_side_by_side_image': measure(
+            lambda i: create_side_by_side_image(images[i], annotated[i], "BEFORE", "AFTER ANALYSIS"),
+            [i % len(annotated) for i in range(iterations)]
+        ),
+        'export_to_csv': measure(
+            lambda r: export_to_csv(r, 'benchmark', export_dir),
+            posture_results[:max(1, iterations // 10)]
+        ),
+    }
+
+
+def run_session(yolo_analyzer, posture_analyzer, items):
+    """
+    Jalankan satu sesi end-to-end seperti Dashboard3.run_analysis
+
+    Args:
+        yolo_analyzer (YOLOAnalyzer): Analyzer (model opsional)
+        posture_analyzer (PostureAnalyzer): Posture analyzer
+        items (list): List of (image atau path, detections atau None)
+    """
+    for source, detections in items:
+        if detections is None:
+            detections = yolo_analyzer.predict(source)['detections']
+        image = load_image(source) if isinstance(source, str) else source
+
+        posture_results = posture_analyzer.analyze(detections)
+        annotated = yolo_analyzer.annotate_image(image, detections)
+        create_side_by_side_image(image, annotated, label1="BEFORE", label2="AFTER ANALYSIS")
+        # Sesi diukur seperti hasil yang ditampilkan: report text ikut di-render
+        get_report_text({'posture_results': posture_results})
+
+
+def bench_sessions(rng, images, real_paths, yolo_analyzer, height_mm, sizes):
+    """
+    Benchmark sesi end-to-end dengan berbagai jumlah image
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        images (list): List image RGB sintetis
+        real_paths (list): List path image asli (dipakai jika model tersedia)
+        yolo_analyzer (YOLOAnalyzer): Analyzer (model opsional)
+        height_mm (float): Tinggi badan
+        sizes (list): Jumlah image per sesi
+
+    Returns:
+        dict: Statistik per ukuran sesi
+    """
+    posture_analyzer = PostureAnalyzer(height_mm)
+    sessions = {}
+
+    for size in sizes:
+        if yolo_analyzer.model and real_paths:
+            items = [(real_paths[i % len(real_paths)], None) for i in range(size)]
+        else:
+            items = [(images[i % len(images)], make_detections(rng)) for i in range(size)]
+
+        start_ns = time.perf_counter_ns()
+        run_session(yolo_analyzer, posture_analyzer, items)
+        elapsed_ns = time.perf_counter_ns() - start_ns
+
+        sessions[str(size)] = {
+            'images': size,
+            'total_ms': elapsed_ns / 1e6,
+            'per_image_ms': elapsed_ns / 1e6 / size,
+            'throughput_per_s': size / (elapsed_ns / 1e9) if elapsed_ns else 0.0
+        }
+        print(f"   session {size:>5} images: {elapsed_ns / 1e9:.2f}s")
+
+    return sessions
+
+
+def git_commit():
+    """Get commit hash saat ini (jika tersedia)"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """Jalankan benchmark suite dan simpan hasil ke JSON"""
+    rng = np.random.default_rng(args.seed)
+
+    real_paths = list_real_images(args.images_dir, args.max_images)
+    if real_paths:
+        images = [load_image(p) for p in real_paths]
+    else:
+        images = [make_image(rng) for _ in range(8)]
+
+    yolo_analyzer = YOLOAnalyzer(args.model, args.confidence) if args.model else YOLOAnalyzer()
+
+    print("📊 Benchmark stages...")
+    with tempfile.TemporaryDirectory() as export_dir:
+        stages = bench_stages(rng, images, args.height, args.iterations, export_dir)
+    for name, stats in stages.items():
+        print(f"   {name:<28} p50 {stats['p50_ms']:8.3f} ms  p99 {stats['p99_ms']:8.3f} ms")
+
+    if yolo_analyzer.model and real_paths:
+        stages['yolo_predict'] = measure(yolo_analyzer.predict, real_paths)
+
+    print("📊 Benchmark sessions...")
+    sessions = bench_sessions(rng, images, real_paths, yolo_analyzer, args.height, args.sessions)
+
+    output = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'real_images': len(real_paths),
+            'model': os.path.basename(args.model) if args.model else None
+        },
+        'stages': stages,
+        'sessions': sessions
+    }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+
+    print(f"✅ Hasil disimpan: {args.output}")
+    return 0
+
+
+def compare(args):
+    """Bandingkan dua file hasil benchmark dan tandai regresi"""
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding='utf-8') as f:
+        candidate = json.load(f)
+
+    print(f"Baseline : {baseline['meta'].get('commit')} ({baseline['meta']['timestamp']})")
+    print(f"Candidate: {candidate['meta'].get('commit')} ({candidate['meta']['timestamp']})")
+    print("")
+
+    rows = []
+    for name, stats in candidate['stages'].items():
+        if name in baseline['stages']:
+            rows.append((f"stage:{name}", baseline['stages'][name][args.metric], stats[args.metric]))
+    for size, stats in candidate['sessions'].items():
+        if size in baseline['sessions']:
+            rows.append((f"session:{size}", baseline['sessions'][size]['per_image_ms'], stats['per_image_ms']))
+
+    regressions = 0
+    for name, old, new in rows:
+        change = (new - old) / old if old > 0 else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "❌ REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "✅ faster"
+        print(f"{name:<36} {old:10.3f} → {new:10.3f} ms  {change:+7.1%}  {flag}")
+
+    print("")
+    if regressions:
+        print(f"❌ {regressions} regresi (threshold {args.threshold:.0%})")
+        return 1
+
+    print("✅ Tidak ada regresi")
+    return 0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark pipeline analisis postur")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Jalankan benchmark")
+    run_parser.add_argument('--output', default='bench_output.json', help="File hasil JSON")
+    run_parser.add_argument('--images-dir', default=None, help="Folder image asli (opsional)")
+    run_parser.add_argument('--max-images', type=int, default=50, help="Jumlah maksimum image asli")
+    run_parser.add_argument('--model', default=None, help="Model YOLO .pt (opsional)")
+    run_parser.add_argument('--confidence', type=float, default=0.25)
+    run_parser.add_argument('--height', type=float, default=1700, help="Tinggi badan (mm)")
+    run_parser.add_argument('--iterations', type=int, default=200, help="Sample per stage")
+    run_parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSION_SIZES)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser('compare', help="Bandingkan dua hasil benchmark")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help="Batas regresi relatif")
+    compare_parser.add_argument('--metric', default='p50_ms', choices=['mean_ms', 'p50_ms', 'p90_ms', 'p99_ms'])
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Command Line Interface - Akses riwayat dan tools tanpa GUI
+
+Usage:
+    python cli.py history patients
+    python cli.py history sessions "Nama Pasien"
+    python cli.py history compare 3 7
+    python cli.py history outliers --max-score 40
+    python cli.py serve --model models/best.pt --port 8765
+    python cli.py watch foto_kamera/ --model models/best.pt --patient "Nama Pasien"
+    python cli.py archive build data/keypoint_archive
+    python cli.py archive metrics data/keypoint_archive --output metrics.csv
+    python cli.py tune --mode latency --model models/best.pt --save
+"""
+import argparse
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.config import *
+from src.utils.results_db import ResultsDatabase
+
+
+def print_table(rows, columns):
+    """
+    Print list dict sebagai tabel sederhana
+
+    Args:
+        rows (list): List dict
+        columns (list): Nama kolom yang ditampilkan
+    """
+    if not rows:
+        print("(tidak ada data)")
+        return
+
+    def fmt(value):
+        if isinstance(value, float):
+            return f"{value:.1f}"
+        return '-' if value is None else str(value)
+
+    widths = [max(len(col), *(len(fmt(row[col])) for row in rows)) for col in columns]
+    print("  ".join(col.ljust(w) for col, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(fmt(row[col]).ljust(w) for col, w in zip(columns, widths)))
+
+
+def add_status(rows, score_column):
+    """
+    Tambahkan kolom status overall (dari aturan scoring) ke setiap baris
+
+    Args:
+        rows (list): List dict
+        score_column (str): Nama kolom score
+    """
+    from src.analysis.scoring_rules import get_scoring_rules
+
+    scored = [row for row in rows if row[score_column] is not None]
+    statuses = get_scoring_rules().overall_statuses([row[score_column] for row in scored])
+    for row in rows:
+        row['status'] = None
+    for row, status in zip(scored, statuses):
+        row['status'] = status
+
+
+def cmd_history(args):
+    """Query riwayat hasil analisis dari database"""
+    db = ResultsDatabase(args.db)
+
+    try:
+        if args.history_command == 'patients':
+            print_table(db.list_patients(), ['patient', 'sessions', 'last_session'])
+
+        elif args.history_command == 'sessions':
+            sessions = db.get_patient_sessions(args.patient, since=args.since, until=args.until)
+            add_status(sessions, 'mean_score')
+            print_table(sessions, ['id', 'created_at', 'image_count', 'mean_score', 'status'])
+
+        elif args.history_command == 'compare':
+            comparison = db.compare_sessions(args.session_a, args.session_b)
+            rows = [{'component': k, **v} for k, v in comparison.items()]
+            print_table(rows, ['component', 'a', 'b', 'delta'])
+
+        elif args.history_command == 'outliers':
+            images = db.find_images_by_score(args.max_score, patient=args.patient, limit=args.limit)
+            add_status(images, 'score')
+            print_table(images, ['id', 'patient', 'created_at', 'score', 'status', 'image_path'])
+    finally:
+        db.close()
+
+    return 0
+
+
+def cmd_serve(args):
+    """Jalankan local HTTP inference server"""
+    from src.analysis.yolo_analyzer import YOLOAnalyzer
+    from src.server.inference_server import run_server
+    from src.utils.runtime_tuning import configure_runtime
+
+    configure_runtime()
+
+    yolo_analyzer = YOLOAnalyzer(args.model, args.confidence)
+    run_server(
+        yolo_analyzer,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue=args.max_queue
+    )
+    return 0
+
+
+def cmd_watch(args):
+    """Pantau folder kamera dan analisis foto baru secara otomatis"""
+    from src.analysis.pipeline import AnalysisPipeline
+    from src.analysis.watch_folder import WatchFolder
+    from src.utils.runtime_tuning import configure_runtime
+
+    configure_runtime()
+
+    if not args.model and not args.server_url:
+        print("❌ Isi --model atau --server-url")
+        return 1
+
+    # Model di-load sekali dan tetap warm selama folder dipantau
+    pipeline = AnalysisPipeline(
+        args.model,
+        args.confidence,
+        args.height_mm,
+        refine_keypoints=args.refine,
+        server_url=args.server_url,
+        deduplicate=args.dedup,
+        quality_gate=not args.no_quality_gate
+    )
+    db = None if args.no_db else ResultsDatabase(args.db)
+
+    watcher = WatchFolder(
+        args.folder,
+        pipeline,
+        patient=args.patient,
+        height_mm=args.height_mm,
+        output_dir=args.output,
+        db=db,
+        settle_seconds=args.settle,
+        poll_interval=args.poll_interval,
+        batch_size=args.batch_size,
+        process_existing=args.process_existing,
+        save_annotated=not args.no_annotated,
+        model_path=args.model or args.server_url,
+        confidence=args.confidence
+    )
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+    finally:
+        if db is not None:
+            db.close()
+    return 0
+
+
+def cmd_archive(args):
+    """Bangun arsip keypoint dari database, atau hitung ulang metrik dari arsip"""
+    from src.utils.keypoint_archive import KeypointArchive, marker_scale, recompute_metrics
+
+    if args.archive_command == 'build':
+        db = ResultsDatabase(args.db)
+        try:
+            with KeypointArchive(args.archive_dir, mode='a') as archive:
+                before = len(archive)
+                # Build ulang hanya menambahkan image yang belum diarsipkan
+                archived = archive.image_ids()
+                skipped = 0
+                for image, detections in db.iter_image_detections(patient=args.patient):
+                    if image['image_id'] in archived:
+                        skipped += 1
+                        continue
+                    archive.append(
+                        image['image_path'],
+                        detections,
+                        image['height_mm'] or args.height_mm,
+                        patient=image['patient'],
+                        marker_mm_per_px=marker_scale(detections),
+                        image_id=image['image_id']
+                    )
+                print(f"✅ {len(archive) - before} image ditambahkan, {skipped} sudah ada di arsip "
+                      f"({len(archive)} total, {archive.num_detections} deteksi)")
+        finally:
+            db.close()
+
+    elif args.archive_command == 'metrics':
+        import pandas as pd
+
+        archive = KeypointArchive(args.archive_dir)
+        metrics = recompute_metrics(archive, chunk_images=args.chunk, height_mm=args.height_mm)
+
+        df = pd.DataFrame(metrics['imbalance'], columns=metrics['components'])
+        df.insert(0, 'patient', [image['patient'] for image in archive.images()])
+        df.insert(0, 'image_path', [image['image_path'] for image in archive.images()])
+        df['score'] = metrics['score']
+
+        if args.output:
+            df.to_csv(args.output, index=False, float_format='%.2f')
+            print(f"✅ Metrik {len(df)} image disimpan ke {args.output}")
+        else:
+            print(df.describe().to_string())
+        archive.close()
+
+    return 0
+
+
+def cmd_tune(args):
+    """Auto-tune jumlah thread torch/OpenCV/BLAS untuk mesin ini"""
+    from src.utils.runtime_tuning import autotune, available_cpus, cgroup_cpu_limit, save_tuning
+
+    limit = cgroup_cpu_limit()
+    print(f"🖥️ Core tersedia: {available_cpus()}" + (f" (quota cgroup {limit:.2f} CPU)" if limit else ""))
+
+    rows = []
+
+    def on_progress(measured):
+        rows.append(measured)
+        print(f"  workers={measured['workers']} torch={measured['torch']} opencv={measured['opencv']}: "
+              f"{measured['throughput']:.1f} item/s, p95 {measured['p95_ms']:.1f} ms")
+
+    if not args.model:
+        print("ℹ️ Workload sintetis (tanpa --model) tidak memakai torch: thread torch tidak di-tune")
+
+    best = autotune(args.mode, model_path=args.model, seconds=args.seconds, on_progress=on_progress)
+
+    print()
+    print_table(rows, ['workers', 'torch', 'opencv', 'blas', 'throughput', 'p50_ms', 'p95_ms'])
+    print(f"\n✅ Terbaik ({args.mode}): workers={best['workers']} torch={best['torch']} "
+          f"opencv={best['opencv']} blas={best['blas']}")
+
+    if args.save:
+        print(f"💾 Disimpan ke {save_tuning(best)}")
+    return 0
+
+
+def build_parser():
+    """
+    Build argument parser untuk semua subcommand
+
+    Returns:
+        argparse.ArgumentParser: Parser
+    """
+    parser = argparse.ArgumentParser(description="Aplikasi Analisis Postur - CLI")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # history
+    history_parser = subparsers.add_parser('history', help="Query riwayat hasil analisis")
+    history_parser.add_argument('--db', default=RESULTS_DB_PATH, help="Path database hasil")
+    history_sub = history_parser.add_subparsers(dest='history_command', required=True)
+
+    history_sub.add_parser('patients', help="Daftar pasien")
+
+    sessions_parser = history_sub.add_parser('sessions', help="Riwayat sesi seorang pasien")
+    sessions_parser.add_argument('patient')
+    sessions_parser.add_argument('--since', default=None, help="Tanggal awal (YYYY-MM-DD)")
+    sessions_parser.add_argument('--until', default=None, help="Tanggal akhir (YYYY-MM-DD)")
+
+    compare_parser = history_sub.add_parser('compare', help="Bandingkan dua sesi")
+    compare_parser.add_argument('session_a', type=int)
+    compare_parser.add_argument('session_b', type=int)
+
+    outliers_parser = history_sub.add_parser('outliers', help="Image dengan score rendah")
+    outliers_parser.add_argument('--max-score', type=float, default=40)
+    outliers_parser.add_argument('--patient', default=None)
+    outliers_parser.add_argument('--limit', type=int, default=50)
+
+    history_parser.set_defaults(func=cmd_history)
+
+    # serve
+    serve_parser = subparsers.add_parser('serve', help="Jalankan local HTTP inference server")
+    serve_parser.add_argument('--model', required=True, help="Path model YOLO .pt")
+    serve_parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE)
+    serve_parser.add_argument('--host', default=SERVER_HOST, help="Gunakan 0.0.0.0 untuk akses dari jaringan klinik")
+    serve_parser.add_argument('--port', type=int, default=SERVER_PORT)
+    serve_parser.add_argument('--max-batch-size', type=int, default=SERVER_MAX_BATCH_SIZE)
+    serve_parser.add_argument('--max-wait-ms', type=float, default=SERVER_MAX_WAIT_MS)
+    serve_parser.add_argument('--max-queue', type=int, default=SERVER_MAX_QUEUE)
+    serve_parser.set_defaults(func=cmd_serve)
+
+    # watch
+    watch_parser = subparsers.add_parser('watch', help="Analisis otomatis foto baru di folder")
+    watch_parser.add_argument('folder', help="Folder yang dipantau (subfolder = nama pasien)")
+    watch_parser.add_argument('--model', default=None, help="Path model YOLO .pt")
+    watch_parser.add_argument('--server-url', default=ANALYSIS_SERVER_URL, help="Analisis lewat inference server")
+    watch_parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE)
+    watch_parser.add_argument('--patient', default='Pasien', help="Nama pasien untuk foto di root folder")
+    watch_parser.add_argument('--height-mm', type=float, default=1700)
+    watch_parser.add_argument('--refine', action='store_true', help="Refine keypoints dari person crop")
+    watch_parser.add_argument('--dedup', action='store_true', default=DEDUP_ENABLED,
+                              help="Analisis hanya foto paling tajam dari foto burst yang hampir identik")
+    watch_parser.add_argument('--no-quality-gate', action='store_true', help="Jangan tolak foto blur/gelap")
+    watch_parser.add_argument('--output', default=EXPORTS_DIR, help="Folder output CSV dan image annotasi")
+    watch_parser.add_argument('--db', default=RESULTS_DB_PATH, help="Path database hasil")
+    watch_parser.add_argument('--no-db', action='store_true', help="Jangan simpan ke database")
+    watch_parser.add_argument('--no-annotated', action='store_true', help="Jangan simpan image annotasi")
+    watch_parser.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS)
+    watch_parser.add_argument('--poll-interval', type=float, default=WATCH_POLL_INTERVAL)
+    watch_parser.add_argument('--batch-size', type=int, default=WATCH_BATCH_SIZE)
+    watch_parser.add_argument('--process-existing', action='store_true', help="Proses juga foto yang sudah ada")
+    watch_parser.set_defaults(func=cmd_watch)
+
+    # archive
+    archive_parser = subparsers.add_parser('archive', help="Arsip keypoint binary untuk studi retrospektif")
+    archive_sub = archive_parser.add_subparsers(dest='archive_command', required=True)
+
+    build_archive_parser = archive_sub.add_parser('build', help="Tambahkan deteksi dari database ke arsip")
+    build_archive_parser.add_argument('archive_dir', nargs='?', default=KEYPOINT_ARCHIVE_DIR)
+    build_archive_parser.add_argument('--db', default=RESULTS_DB_PATH, help="Path database hasil")
+    build_archive_parser.add_argument('--patient', default=None)
+    build_archive_parser.add_argument('--height-mm', type=float, default=1700,
+                                      help="Tinggi badan jika sesi tidak menyimpannya")
+
+    metrics_parser = archive_sub.add_parser('metrics', help="Hitung ulang imbalance dan score seluruh arsip")
+    metrics_parser.add_argument('archive_dir', nargs='?', default=KEYPOINT_ARCHIVE_DIR)
+    metrics_parser.add_argument('--output', default=None, help="Path CSV (default: ringkasan ke stdout)")
+    metrics_parser.add_argument('--height-mm', type=float, default=None, help="Override tinggi badan semua image")
+    metrics_parser.add_argument('--chunk', type=int, default=KEYPOINT_ARCHIVE_CHUNK_IMAGES)
+
+    archive_parser.set_defaults(func=cmd_archive)
+
+    # tune
+    tune_parser = subparsers.add_parser('tune', help="Auto-tune thread torch/OpenCV/BLAS untuk mesin ini")
+    tune_parser.add_argument('--mode', choices=['latency', 'throughput'], default=RUNTIME_MODE)
+    tune_parser.add_argument('--model', default=None, help="Path model YOLO .pt (default: workload sintetis)")
+    tune_parser.add_argument('--seconds', type=float, default=RUNTIME_TUNING_SECONDS, help="Durasi per kandidat")
+    tune_parser.add_argument('--save', action='store_true', help="Simpan hasil untuk dipakai saat startup")
+    tune_parser.set_defaults(func=cmd_tune)
+
+    return parser
+
+
+def main():
+    """Main function"""
+    args = build_parser().parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
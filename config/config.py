@@ -1,6 +1,7 @@
 """
 Konfigurasi Aplikasi GUI Analisis Postur
 """
+import bisect
 import os
 
 # Paths
@@ -8,11 +9,16 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 MODELS_DIR = os.path.join(BASE_DIR, 'models')
 EXPORTS_DIR = os.path.join(BASE_DIR, 'exports')
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, 'checkpoints')
+DATA_DIR = os.path.join(BASE_DIR, 'data')
 
 # Ensure directories exist
 os.makedirs(ASSETS_DIR, exist_ok=True)
 os.makedirs(MODELS_DIR, exist_ok=True)
 os.makedirs(EXPORTS_DIR, exist_ok=True)
+os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+os.makedirs(DATA_DIR, exist_ok=True)
 
 # GUI Settings
 WINDOW_TITLE = "Aplikasi Analisis Postur - YOLO"
@@ -25,6 +31,99 @@ SUCCESS_COLOR = "#27ae60"
 WARNING_COLOR = "#f39c12"
 DANGER_COLOR = "#e74c3c"
 
+# Display / Thumbnail Cache Settings
+DISPLAY_COMBINED_SIZE = (1000, 500)  # Before/after di Dashboard 3
+DISPLAY_ANNOTATED_SIZE = (800, 500)  # Annotated image di Dashboard 4
+THUMBNAIL_CACHE_SIZE = 256  # Jumlah thumbnail (array) yang di-cache
+PHOTO_CACHE_SIZE = 32  # Jumlah PhotoImage Tk yang di-cache
+THUMBNAIL_WORKERS = 2
+
+# Gallery Settings (Dashboard 4)
+GALLERY_CACHE_DIR = os.path.join(CACHE_DIR, 'thumbnails')
+GALLERY_TILE_SIZE = 160  # Ukuran thumbnail (px)
+GALLERY_PHOTO_CACHE_SIZE = 300  # PhotoImage tile yang disimpan di memori
+
+# Results Database Settings
+RESULTS_DB_PATH = os.path.join(DATA_DIR, 'results.db')
+AUTO_SAVE_RESULTS = True  # Simpan setiap sesi ke database secara otomatis
+TREND_PLOT_CACHE_SIZE = 16  # Grafik trend yang di-cache (per pasien)
+
+# Inference Server Settings
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_MAX_BATCH_SIZE = 8  # Image per batch inference
+SERVER_MAX_WAIT_MS = 20  # Waktu tunggu maksimum untuk mengisi batch
+SERVER_MAX_QUEUE = 64  # Request di atas ini ditolak (503)
+SERVER_REQUEST_TIMEOUT = 60  # Detik
+SERVER_MAX_UPLOAD_MB = 20
+
+# Thin-Client Settings (analisis di server, GUI tanpa PyTorch)
+ANALYSIS_SERVER_URL = os.environ.get('POSTURE_SERVER_URL', '')  # Kosong = analisis lokal
+REMOTE_TIMEOUT = 120  # Detik per request
+REMOTE_MAX_IN_FLIGHT = 4  # Request paralel agar server bisa batching
+REMOTE_MAX_RETRIES = 3  # Retry ketika server sibuk (503)
+
+# Scale Estimation Settings (pixel -> mm)
+SCALE_MIN_KEYPOINT_CONF = 0.3  # Keypoint dipakai untuk estimasi skala jika confidence >= ini
+CALIBRATION_MARKER_SIZE_MM = None  # Sisi marker ArUco di frame (mm); None = tidak dipakai
+CALIBRATION_MARKER_DICT = 'DICT_4X4_50'
+
+# Image Export Settings (annotated / side-by-side)
+IMAGE_EXPORT_FORMAT = 'jpg'  # jpg, png, webp
+IMAGE_EXPORT_QUALITY = 90  # JPEG/WebP quality (0-100)
+IMAGE_EXPORT_PNG_COMPRESSION = 3  # PNG compression level (0-9)
+IMAGE_EXPORT_WORKERS = 4  # Thread encoding (OpenCV melepas GIL saat encode)
+IMAGE_EXPORT_MAX_IN_FLIGHT = 8  # Batas image yang sedang di-encode (membatasi peak memory)
+
+# Session Report Settings (HTML/PDF)
+REPORT_THUMBNAIL_SIZE = GALLERY_TILE_SIZE  # Sama dengan gallery agar thumbnail cache dipakai ulang
+REPORT_PDF_IMAGES_PER_PAGE = 3
+
+# Watch Folder Settings (ingestion otomatis dari folder kamera)
+WATCH_POLL_INTERVAL = 0.5  # Detik antar scan (fallback jika watchdog tidak ter-install)
+WATCH_SETTLE_SECONDS = 1.0  # File dianggap selesai ditulis jika ukuran/mtime stabil selama ini
+WATCH_BATCH_SIZE = 8  # Maksimum image per batch analisis
+WATCH_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Worker Process Settings (analisis di proses terpisah, image lewat shared memory)
+ANALYSIS_WORKER_PROCESS = os.environ.get('POSTURE_WORKER_PROCESS', '0') == '1'
+SHM_RING_MB = 256  # Ukuran ring buffer image hasil render
+SHM_ALLOC_TIMEOUT = 2.0  # Detik menunggu ruang ring sebelum fallback kirim lewat queue
+
+# Keypoint Archive Settings (studi retrospektif, kolom memory-mapped)
+KEYPOINT_ARCHIVE_DIR = os.path.join(DATA_DIR, 'keypoint_archive')
+KEYPOINT_ARCHIVE_CHUNK_IMAGES = 20000  # Image per chunk saat hitung ulang metrik
+
+# Deduplication Settings (foto burst hampir identik, sebelum inference)
+DEDUP_ENABLED = False
+DEDUP_HASH_SIZE = 8  # dHash 8x8 = 64 bit
+DEDUP_MAX_DISTANCE = 4  # Hamming distance maksimum untuk dianggap duplikat
+DEDUP_MAX_INTERVAL = 2.0  # Selisih waktu foto (detik) maksimum antar foto berurutan dalam satu burst
+
+# Quality Gate Settings (tolak foto tidak layak sebelum inference)
+QUALITY_GATE_ENABLED = True
+QUALITY_ANALYSIS_SIZE = 640  # Sisi terpanjang image untuk cek kualitas (px)
+QUALITY_MIN_SHARPNESS = 20  # Variance Laplacian minimum; di bawah ini dianggap blur
+QUALITY_MIN_BRIGHTNESS = 40  # Rata-rata brightness (0-255)
+QUALITY_MAX_BRIGHTNESS = 230
+QUALITY_DARK_LEVEL = 10  # Pixel <= ini dianggap hitam (clipped)
+QUALITY_BRIGHT_LEVEL = 245  # Pixel >= ini dianggap putih (clipped)
+QUALITY_MAX_CLIPPED_FRACTION = 0.85  # Maksimum fraksi pixel clipped hitam/putih
+QUALITY_PERSON_IMGSZ = None  # Mis. 160: cek ada orang dengan model resolusi rendah; None = tidak dicek
+
+# UI Bridge Settings (update Tk dari worker thread)
+UI_BRIDGE_INTERVAL_MS = 16  # Interval pump event di Tk thread (~60 fps)
+UI_BRIDGE_FRAME_BUDGET_MS = 8  # Maksimum waktu eksekusi event per pump; sisanya frame berikutnya
+
+# Runtime Tuning Settings (jumlah thread torch/OpenCV/BLAS untuk CPU inference)
+RUNTIME_TUNING_ENABLED = True
+RUNTIME_MODE = 'latency'  # latency: satu analisis memakai semua core; throughput: core dibagi per worker
+RUNTIME_TUNING_PATH = os.path.join(DATA_DIR, 'runtime_tuning.json')  # Hasil `cli.py tune --save`
+RUNTIME_TUNING_SECONDS = 2.0  # Durasi pengukuran per kandidat saat autotune
+
+# Scoring Rules (threshold, level dan rekomendasi; di-compile sekali saat load)
+SCORING_RULES_PATH = os.path.join(BASE_DIR, 'config', 'scoring_rules.json')
+
 # Logo Settings
 LOGO_PATH = os.path.join(ASSETS_DIR, 'logo.png')
 
@@ -33,6 +132,17 @@ DEFAULT_CONFIDENCE = 0.25
 MIN_CONFIDENCE = 0.1
 MAX_CONFIDENCE = 1.0
 
+# Keypoint Refinement Settings (second-stage, person crop)
+KEYPOINT_REFINEMENT = False
+REFINEMENT_PADDING = 0.15  # Padding crop relatif terhadap ukuran bbox
+REFINEMENT_BATCH_SIZE = 16  # Jumlah crop per model call
+REFINEMENT_MIN_CROP_SIZE = 32  # Crop lebih kecil dari ini (px) di-skip
+
+# Profiling / Diagnostics Settings
+PROFILING_ENABLED = True
+PROFILING_MAX_EVENTS = 20000  # Event terakhir yang disimpan untuk Chrome trace
+SHOW_DIAGNOSTICS_PANEL = False  # Tampilkan tombol Diagnostics di Dashboard 4
+
 # Posture Classification Mapping
 POSTURE_MAPPING = {
     'Normal-Kanan': 'Normal',
@@ -91,15 +201,10 @@ KEYPOINT_EMOJIS = {
 }
 
 # Confidence Levels
+CONFIDENCE_LEVEL_THRESHOLDS = [0.3, 0.5, 0.7, 0.9]  # Batas bawah (inklusif) level berikutnya
+CONFIDENCE_LEVEL_LABELS = ["Sangat Rendah", "Rendah", "Sedang", "Tinggi", "Sangat Tinggi"]
+
+
 def get_confidence_level(conf):
     """Get confidence level label"""
-    if conf >= 0.9:
-        return "Sangat Tinggi"
-    elif conf >= 0.7:
-        return "Tinggi"
-    elif conf >= 0.5:
-        return "Sedang"
-    elif conf >= 0.3:
-        return "Rendah"
-    else:
-        return "Sangat Rendah"
+    return CONFIDENCE_LEVEL_LABELS[bisect.bisect_right(CONFIDENCE_LEVEL_THRESHOLDS, conf)]
@@ -18,6 +18,9 @@ from src.gui.dashboard_1 import Dashboard1
 from src.gui.dashboard_2 import Dashboard2
 from src.gui.dashboard_3 import Dashboard3
 from src.gui.dashboard_4 import Dashboard4
+from src.utils.thumbnail_cache import ThumbnailCache
+from src.utils.results_db import ResultsDatabase
+from src.utils.runtime_tuning import configure_runtime
 
 
 class PostureAnalysisApp:
@@ -41,10 +44,21 @@ class PostureAnalysisApp:
         self.analysis_data = {
             'model_path': None,
             'image_paths': [],
-            'confidence': DEFAULT_CONFIDENCE
+            'confidence': DEFAULT_CONFIDENCE,
+            'refine_keypoints': KEYPOINT_REFINEMENT,
+            'server_url': ANALYSIS_SERVER_URL,
+            'multi_view': False,
+            'deduplicate': DEDUP_ENABLED
         }
 
         self.results_data = []
+        self.multi_view_result = None
+
+        # Thumbnail cache bersama untuk semua dashboard
+        self.thumbnail_cache = ThumbnailCache()
+
+        # Database riwayat (dibuka saat pertama dipakai)
+        self.results_db = None
 
         # Current dashboard
         self.current_dashboard = None
@@ -52,6 +66,9 @@ class PostureAnalysisApp:
         # Show first dashboard
         self.show_dashboard(1)
 
+        # Handle window close (cancel job yang sedang berjalan)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def center_window(self):
         """Center window pada screen"""
         self.root.update_idletasks()
@@ -87,6 +104,23 @@ class PostureAnalysisApp:
 
         self.current_dashboard.pack(fill='both', expand=True)
 
+    def on_close(self):
+        """Handle penutupan aplikasi"""
+        if self.current_dashboard and hasattr(self.current_dashboard, 'on_close'):
+            self.current_dashboard.on_close()
+        self.root.destroy()
+
+    def get_results_db(self):
+        """
+        Get results database (lazy open)
+
+        Returns:
+            ResultsDatabase: Database riwayat hasil analisis
+        """
+        if self.results_db is None:
+            self.results_db = ResultsDatabase()
+        return self.results_db
+
     def set_user_data(self, name, height):
         """
         Set user data
@@ -107,7 +141,8 @@ class PostureAnalysisApp:
         """
         return self.user_data
 
-    def set_analysis_data(self, model_path, image_paths, confidence):
+    def set_analysis_data(self, model_path, image_paths, confidence, refine_keypoints=KEYPOINT_REFINEMENT,
+                          server_url=ANALYSIS_SERVER_URL, multi_view=False, deduplicate=DEDUP_ENABLED):
         """
         Set analysis data
 
@@ -115,10 +150,18 @@ class PostureAnalysisApp:
             model_path (str): Path ke model YOLO
             image_paths (list): List path ke images
             confidence (float): Confidence threshold
+            refine_keypoints (bool): Aktifkan refinement keypoints dari person crop
+            server_url (str): URL inference server (kosong = analisis lokal)
+            multi_view (bool): Gabungkan semua image sebagai view satu pasien
+            deduplicate (bool): Analisis hanya satu foto per kelompok foto hampir identik
         """
         self.analysis_data['model_path'] = model_path
         self.analysis_data['image_paths'] = image_paths
         self.analysis_data['confidence'] = confidence
+        self.analysis_data['refine_keypoints'] = refine_keypoints
+        self.analysis_data['server_url'] = server_url
+        self.analysis_data['multi_view'] = multi_view
+        self.analysis_data['deduplicate'] = deduplicate
 
     def get_analysis_data(self):
         """
@@ -129,14 +172,16 @@ class PostureAnalysisApp:
         """
         return self.analysis_data
 
-    def set_results_data(self, results):
+    def set_results_data(self, results, multi_view_result=None):
         """
         Set results data
 
         Args:
             results (list): List of analysis results
+            multi_view_result (dict): Hasil gabungan multi-view (jika ada)
         """
         self.results_data = results
+        self.multi_view_result = multi_view_result
 
     def get_results_data(self):
         """
@@ -147,10 +192,22 @@ class PostureAnalysisApp:
         """
         return self.results_data
 
+    def get_multi_view_result(self):
+        """
+        Get hasil gabungan multi-view
+
+        Returns:
+            dict: Hasil fuse_views atau None
+        """
+        return self.multi_view_result
+
 
 def main():
     """Main function"""
     try:
+        # Thread torch/OpenCV/BLAS sesuai core yang tersedia (sebelum model di-load)
+        configure_runtime()
+
         # Create root window
         root = tk.Tk()
 
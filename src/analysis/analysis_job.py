@@ -0,0 +1,203 @@
+"""
+Analysis Job - Job analisis yang bisa di-pause, di-cancel dan di-resume dari checkpoint
+"""
+import hashlib
+import json
+import os
+import threading
+from config.config import CHECKPOINT_DIR
+
+
+def make_job_key(image_paths, **params):
+    """
+    Buat key unik untuk job berdasarkan daftar image dan parameter analisis
+
+    Args:
+        image_paths (list): List path image
+        **params: Parameter analisis (model, confidence, tinggi, dll)
+
+    Returns:
+        str: Key job (hex)
+    """
+    payload = json.dumps({
+        'image_paths': [os.path.abspath(p) for p in image_paths],
+        'params': params
+    }, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class JobCancelled(Exception):
+    """Raised ketika job di-cancel"""
+
+
+class AnalysisJob:
+    """
+    Job analisis batch dengan cooperative cancellation, pause/resume dan checkpoint.
+
+    Checkpoint berupa file JSON Lines: baris pertama header job, setiap baris
+    berikutnya satu hasil compact image yang sudah selesai. File dihapus ketika
+    job selesai seluruhnya.
+    """
+
+    def __init__(self, image_paths, process_batch, job_key, chunk_size=1, checkpoint_dir=CHECKPOINT_DIR):
+        """
+        Initialize Analysis Job
+
+        Args:
+            image_paths (list): List path image
+            process_batch (callable): Fungsi list path -> list hasil compact
+            job_key (str): Key unik job (lihat make_job_key)
+            chunk_size (int): Jumlah image per pemanggilan process_batch
+            checkpoint_dir (str): Folder checkpoint
+        """
+        self.image_paths = list(image_paths)
+        self.process_batch = process_batch
+        self.job_key = job_key
+        self.chunk_size = max(1, int(chunk_size))
+        self.checkpoint_path = os.path.join(checkpoint_dir, f"{job_key}.jsonl")
+
+        self._cancel_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def is_paused(self):
+        return not self._resume_event.is_set()
+
+    def cancel(self):
+        """Request cancel (diproses di antara chunk)"""
+        self._cancel_event.set()
+        self._resume_event.set()
+
+    def pause(self):
+        """Pause job setelah chunk yang sedang berjalan"""
+        if not self.is_cancelled:
+            self._resume_event.clear()
+
+    def resume(self):
+        """Lanjutkan job yang di-pause"""
+        self._resume_event.set()
+
+    def load_checkpoint(self):
+        """
+        Load hasil compact yang sudah selesai dari checkpoint
+
+        Returns:
+            dict: image_path -> hasil compact
+        """
+        completed = {}
+
+        if not os.path.exists(self.checkpoint_path):
+            return completed
+
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            header = f.readline()
+            try:
+                if json.loads(header).get('job_key') != self.job_key:
+                    return completed
+            except ValueError:
+                return completed
+
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Baris bisa terpotong jika aplikasi ditutup paksa
+                    continue
+                if isinstance(entry, dict) and 'image_path' in entry:
+                    completed[entry['image_path']] = entry
+
+        return completed
+
+    def _open_checkpoint(self, completed):
+        """
+        Tulis ulang checkpoint (header + hasil yang valid) lalu buka untuk append
+
+        Checkpoint lama tidak di-append langsung: baris terpotong dari close
+        paksa akan tergabung dengan record berikutnya dan merusak resume
+        selanjutnya. File baru ditulis ke .tmp lalu di-replace atomik.
+        """
+        os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'job_key': self.job_key, 'total': len(self.image_paths)}) + "\n")
+            for compact in completed.values():
+                f.write(json.dumps(compact) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+        return open(self.checkpoint_path, 'a', encoding='utf-8')
+
+    def _wait_if_paused(self):
+        """Block selama job di-pause; raise JobCancelled jika di-cancel"""
+        self._resume_event.wait()
+        if self.is_cancelled:
+            raise JobCancelled()
+
+    def run(self, on_result=None, on_progress=None):
+        """
+        Jalankan job sampai selesai atau di-cancel
+
+        Args:
+            on_result (callable): Dipanggil (index, compact, from_checkpoint) per image
+            on_progress (callable): Dipanggil (done, total, message)
+
+        Returns:
+            bool: True jika selesai, False jika di-cancel
+        """
+        completed = self.load_checkpoint()
+        total = len(self.image_paths)
+        done = 0
+
+        # Hasil dari checkpoint tidak di-inference ulang
+        pending = []
+        for index, img_path in enumerate(self.image_paths):
+            if img_path in completed:
+                done += 1
+                if on_result:
+                    on_result(index, completed[img_path], True)
+            else:
+                pending.append((index, img_path))
+
+        if done and on_progress:
+            on_progress(done, total, f"Melanjutkan dari checkpoint: {done}/{total}")
+
+        checkpoint = self._open_checkpoint(completed)
+        try:
+            for start in range(0, len(pending), self.chunk_size):
+                self._wait_if_paused()
+
+                chunk = pending[start:start + self.chunk_size]
+                if on_progress:
+                    on_progress(done, total, f"Menganalisis: {chunk[0][1]}")
+
+                results = self.process_batch([img_path for _, img_path in chunk])
+                if len(results) != len(chunk):
+                    raise Exception(
+                        f"❌ process_batch mengembalikan {len(results)} hasil untuk {len(chunk)} image"
+                    )
+
+                for (index, _), compact in zip(chunk, results):
+                    checkpoint.write(json.dumps(compact) + "\n")
+                    done += 1
+                    if on_result:
+                        on_result(index, compact, False)
+                checkpoint.flush()
+
+        except JobCancelled:
+            return False
+        finally:
+            checkpoint.close()
+
+        # Job selesai: checkpoint tidak diperlukan lagi
+        os.remove(self.checkpoint_path)
+        if on_progress:
+            on_progress(done, total, "Selesai")
+
+        return True
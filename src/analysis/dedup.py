@@ -0,0 +1,257 @@
+"""
+Deduplication - Kelompokkan foto burst yang hampir identik sebelum inference
+
+Setiap image di-hash dengan dHash dari decode yang diperkecil (JPEG di-decode
+langsung pada 1/8 resolusi), lalu image dengan Hamming distance kecil
+dikelompokkan. Hanya image paling tajam per kelompok yang dianalisis; hasilnya
+di-link ke image lain dalam kelompok.
+
+Hanya foto yang berurutan dalam satu burst (waktu foto berdekatan) yang bisa
+dikelompokkan, sehingga view berbeda dengan latar yang sama (mis. Depan dan
+Belakang) tidak pernah saling menggantikan.
+"""
+import copy
+import os
+from datetime import datetime
+import cv2
+import numpy as np
+from PIL import Image
+from config.config import DEDUP_HASH_SIZE, DEDUP_MAX_DISTANCE, DEDUP_MAX_INTERVAL
+from src.utils.profiling import timed
+
+# Tag EXIF waktu foto
+EXIF_IFD = 0x8769
+EXIF_DATETIME = 306
+EXIF_DATETIME_ORIGINAL = 36867
+EXIF_SUBSEC_ORIGINAL = 37521
+
+# Jumlah bit 1 untuk setiap nilai byte (popcount lookup)
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _load_reduced(image_path):
+    """Decode grayscale yang diperkecil (cukup untuk hash dan ketajaman)"""
+    img = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if img is None or min(img.shape[:2]) < DEDUP_HASH_SIZE + 1:
+        img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        raise ValueError(f"Tidak dapat membaca gambar: {image_path}")
+    return img
+
+
+def dhash(gray, hash_size=DEDUP_HASH_SIZE):
+    """
+    Difference hash: arah gradient horizontal pada image (hash_size+1) x hash_size
+
+    Args:
+        gray (numpy.ndarray): Image grayscale
+        hash_size (int): Ukuran hash (8 = 64 bit)
+
+    Returns:
+        numpy.ndarray: Hash sebagai byte array (hash_size * hash_size / 8 byte)
+    """
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1])
+
+
+def sharpness(gray):
+    """Ketajaman image (variance Laplacian); foto blur bernilai kecil"""
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def capture_time(image_path):
+    """
+    Waktu foto diambil (detik): EXIF DateTimeOriginal, fallback mtime file
+
+    Args:
+        image_path (str): Path image
+
+    Returns:
+        float: Timestamp
+    """
+    try:
+        # Hanya header yang dibaca (pixel tidak di-decode)
+        with Image.open(image_path) as img:
+            exif = img.getexif()
+            exif_ifd = exif.get_ifd(EXIF_IFD)
+            value = exif_ifd.get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+            if value:
+                timestamp = datetime.strptime(str(value).strip('\x00 '), '%Y:%m:%d %H:%M:%S').timestamp()
+                subsec = str(exif_ifd.get(EXIF_SUBSEC_ORIGINAL) or '').strip('\x00 ')
+                return timestamp + (float(f"0.{subsec}") if subsec.isdigit() else 0.0)
+    except (OSError, ValueError, SyntaxError):
+        pass
+    return os.path.getmtime(image_path)
+
+
+def burst_ids(times, distances, max_distance=DEDUP_MAX_DISTANCE, max_interval=DEDUP_MAX_INTERVAL):
+    """
+    Bagi image menjadi burst: foto berurutan (waktu foto, lalu urutan pilih)
+    dengan selisih waktu <= max_interval dan hash yang mirip dengan foto sebelumnya
+
+    Args:
+        times (numpy.ndarray): Waktu foto per image (N,)
+        distances (numpy.ndarray): Matrix Hamming distance (N, N)
+        max_distance (int): Distance maksimum antar foto berurutan
+        max_interval (float): Selisih waktu maksimum antar foto berurutan (detik)
+
+    Returns:
+        numpy.ndarray: ID burst per image (N,)
+    """
+    order = np.argsort(times, kind='stable')
+    bursts = np.zeros(len(times), dtype=int)
+    current = 0
+    for prev, cur in zip(order[:-1], order[1:]):
+        if times[cur] - times[prev] > max_interval or distances[prev, cur] > max_distance:
+            current += 1
+        bursts[cur] = current
+    return bursts
+
+
+@timed('dedup.hash')
+def hash_images(image_paths, hash_size=DEDUP_HASH_SIZE):
+    """
+    Hitung dHash dan ketajaman semua image
+
+    Args:
+        image_paths (list): List path image
+        hash_size (int): Ukuran hash
+
+    Returns:
+        tuple: (hashes (N, bytes) uint8, sharpness (N,))
+    """
+    hashes = []
+    scores = []
+    for path in image_paths:
+        gray = _load_reduced(path)
+        hashes.append(dhash(gray, hash_size))
+        scores.append(sharpness(gray))
+    return np.array(hashes, dtype=np.uint8).reshape(len(image_paths), -1), np.array(scores, dtype=float)
+
+
+def hamming_matrix(hashes):
+    """
+    Hamming distance antar semua pasangan hash
+
+    Args:
+        hashes (numpy.ndarray): Hash (N, bytes) uint8
+
+    Returns:
+        numpy.ndarray: Matrix distance (N, N)
+    """
+    return _POPCOUNT[hashes[:, None, :] ^ hashes[None, :, :]].sum(axis=2, dtype=np.int32)
+
+
+class DuplicateGroups:
+    """
+    Kelompok image hampir identik dalam satu batch.
+
+    Image paling tajam menjadi representative dan membentuk kelompok dengan
+    semua image yang belum berkelompok dalam burst yang sama dan dalam jarak
+    max_distance darinya (tanpa chaining, sehingga image dalam satu kelompok
+    selalu dekat dengan representative-nya).
+    """
+
+    def __init__(self, image_paths, max_distance=DEDUP_MAX_DISTANCE, hash_size=DEDUP_HASH_SIZE,
+                 max_interval=DEDUP_MAX_INTERVAL):
+        """
+        Hash dan kelompokkan image
+
+        Args:
+            image_paths (list): List path image
+            max_distance (int): Hamming distance maksimum untuk dianggap duplikat
+            hash_size (int): Ukuran dHash
+            max_interval (float): Selisih waktu foto maksimum dalam satu burst (detik)
+        """
+        self.image_paths = list(image_paths)
+        n = len(self.image_paths)
+        # Setiap image menunjuk ke index representative-nya
+        self.representative_of = np.arange(n)
+
+        if n > 1:
+            hashes, scores = hash_images(self.image_paths, hash_size)
+            distances = hamming_matrix(hashes)
+            times = np.array([capture_time(path) for path in self.image_paths])
+            bursts = burst_ids(times, distances, max_distance, max_interval)
+            close = (distances <= max_distance) & (bursts[:, None] == bursts[None, :])
+            assigned = np.zeros(n, dtype=bool)
+
+            # Urut ketajaman (stabil), sehingga representative = foto paling tajam
+            for i in np.argsort(-scores, kind='stable'):
+                if assigned[i]:
+                    continue
+                members = close[i] & ~assigned
+                self.representative_of[members] = i
+                assigned |= members
+
+        self.representatives = sorted(set(self.representative_of.tolist()))
+
+    @property
+    def representative_paths(self):
+        """Path image yang perlu dianalisis (urutan asli)"""
+        return [self.image_paths[i] for i in self.representatives]
+
+    @property
+    def num_duplicates(self):
+        """Jumlah image yang tidak perlu dianalisis"""
+        return len(self.image_paths) - len(self.representatives)
+
+    def members(self, representative):
+        """Index semua image (termasuk representative) dalam kelompok"""
+        return np.flatnonzero(self.representative_of == representative).tolist()
+
+    def expand(self, representative, compact):
+        """
+        Hasil untuk semua image dalam kelompok dari hasil representative
+
+        Args:
+            representative (int): Index representative
+            compact (dict): Hasil compact representative
+
+        Returns:
+            list: List (index image, hasil compact)
+        """
+        return [
+            (index, compact if index == representative else link_duplicate(compact, self.image_paths[index]))
+            for index in self.members(representative)
+        ]
+
+    def expand_all(self, compacts):
+        """
+        Hasil semua image (urutan asli) dari hasil representative_paths
+
+        Args:
+            compacts (list): Hasil compact, urut sama dengan representative_paths
+
+        Returns:
+            list: Hasil compact untuk setiap image_paths
+        """
+        results = [None] * len(self.image_paths)
+        for representative, compact in zip(self.representatives, compacts):
+            for index, result in self.expand(representative, compact):
+                results[index] = result
+        return results
+
+
+def link_duplicate(compact, image_path):
+    """
+    Salin hasil representative untuk image duplikat
+
+    Deteksi dan skor sama persis dengan representative; duplicate_of mencatat
+    image yang benar-benar dianalisis (annotasi di-render di image tersebut).
+
+    Args:
+        compact (dict): Hasil compact representative
+        image_path (str): Path image duplikat
+
+    Returns:
+        dict: Hasil compact duplikat
+    """
+    yolo_results = copy.deepcopy(compact['yolo_results'])
+    yolo_results['image_path'] = image_path
+    return {
+        'image_path': image_path,
+        'duplicate_of': compact.get('duplicate_of') or compact['image_path'],
+        'yolo_results': yolo_results,
+        'posture_results': copy.deepcopy(compact['posture_results'])
+    }
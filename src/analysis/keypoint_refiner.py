@@ -0,0 +1,177 @@
+"""
+Keypoint Refiner - Second-stage refinement keypoints dari person crop
+"""
+import cv2
+import numpy as np
+from config.config import REFINEMENT_PADDING, REFINEMENT_BATCH_SIZE, REFINEMENT_MIN_CROP_SIZE
+from src.utils.profiling import timed
+
+
+class KeypointRefiner:
+    """
+    Refine keypoints dengan menjalankan ulang model pada crop setiap orang.
+
+    Crop diambil dari image resolusi asli sehingga orang mengisi seluruh input
+    model, memberikan keypoints yang lebih presisi tanpa menjalankan seluruh
+    frame pada resolusi tinggi. Semua crop dalam satu sesi di-batch bersama.
+    """
+
+    def __init__(self, yolo_analyzer, padding=REFINEMENT_PADDING,
+                 batch_size=REFINEMENT_BATCH_SIZE, min_crop_size=REFINEMENT_MIN_CROP_SIZE):
+        """
+        Initialize Keypoint Refiner
+
+        Args:
+            yolo_analyzer (YOLOAnalyzer): Analyzer dengan model yang sudah di-load
+            padding (float): Padding crop relatif terhadap ukuran bbox
+            batch_size (int): Jumlah crop per model call
+            min_crop_size (int): Ukuran minimum crop dalam pixel
+        """
+        self.yolo_analyzer = yolo_analyzer
+        self.padding = padding
+        self.batch_size = max(1, int(batch_size))
+        self.min_crop_size = min_crop_size
+
+    @timed('keypoint_refinement')
+    def refine(self, items):
+        """
+        Refine keypoints untuk seluruh image dalam sesi
+
+        Args:
+            items (list): List of (image_path atau image BGR, detections).
+                Detections dimodifikasi in-place.
+
+        Returns:
+            int: Jumlah deteksi yang keypoints-nya di-refine
+        """
+        crops = []
+        targets = []
+
+        for source, detections in items:
+            if not any(det.get('keypoints') for det in detections):
+                continue
+
+            # Image resolusi asli dalam BGR (format input model)
+            image = source if isinstance(source, np.ndarray) else cv2.imread(source)
+            if image is None:
+                continue
+
+            for det in detections:
+                if not det.get('keypoints'):
+                    continue
+
+                region = self._crop_region(det['bbox'], image.shape)
+                if region is None:
+                    continue
+
+                x0, y0, x1, y1 = region
+                crops.append(image[y0:y1, x0:x1])
+                targets.append((det, x0, y0))
+
+        refined = 0
+
+        for start in range(0, len(crops), self.batch_size):
+            batch_crops = crops[start:start + self.batch_size]
+            batch_targets = targets[start:start + self.batch_size]
+
+            batch_detections = self.yolo_analyzer.predict_batch(batch_crops)
+
+            for crop, (det, x0, y0), crop_detections in zip(batch_crops, batch_targets, batch_detections):
+                best = self._select_detection(crop_detections, crop.shape)
+                if best is None:
+                    continue
+
+                if self._merge_keypoints(det, best['keypoints'], x0, y0):
+                    refined += 1
+
+        return refined
+
+    def _crop_region(self, bbox, image_shape):
+        """
+        Hitung region crop dengan padding, di-clip ke batas image
+
+        Args:
+            bbox (list): [x1, y1, x2, y2]
+            image_shape (tuple): Shape image
+
+        Returns:
+            tuple: (x0, y0, x1, y1) atau None jika crop terlalu kecil
+        """
+        img_h, img_w = image_shape[:2]
+        x1, y1, x2, y2 = bbox
+
+        pad_x = (x2 - x1) * self.padding
+        pad_y = (y2 - y1) * self.padding
+
+        x0 = max(0, int(x1 - pad_x))
+        y0 = max(0, int(y1 - pad_y))
+        x1 = min(img_w, int(np.ceil(x2 + pad_x)))
+        y1 = min(img_h, int(np.ceil(y2 + pad_y)))
+
+        if x1 - x0 < self.min_crop_size or y1 - y0 < self.min_crop_size:
+            return None
+
+        return x0, y0, x1, y1
+
+    def _select_detection(self, detections, crop_shape):
+        """
+        Pilih deteksi utama dalam crop (paling dekat ke tengah crop)
+
+        Args:
+            detections (list): Deteksi pada crop
+            crop_shape (tuple): Shape crop
+
+        Returns:
+            dict: Deteksi terpilih atau None
+        """
+        candidates = [det for det in detections if det.get('keypoints')]
+        if not candidates:
+            return None
+
+        crop_h, crop_w = crop_shape[:2]
+        cx, cy = crop_w / 2, crop_h / 2
+
+        def center_distance(det):
+            x1, y1, x2, y2 = det['bbox']
+            return ((x1 + x2) / 2 - cx) ** 2 + ((y1 + y2) / 2 - cy) ** 2
+
+        return min(candidates, key=center_distance)
+
+    def _merge_keypoints(self, det, crop_keypoints, x0, y0):
+        """
+        Gabungkan keypoints hasil crop ke deteksi asli
+
+        Keypoint hasil crop dipakai jika confidence-nya tidak lebih rendah
+        dari keypoint asli.
+
+        Args:
+            det (dict): Deteksi asli (dimodifikasi in-place)
+            crop_keypoints (list): Keypoints flat dalam koordinat crop
+            x0 (int): Offset x crop
+            y0 (int): Offset y crop
+
+        Returns:
+            bool: True jika ada keypoint yang diganti
+        """
+        original = np.asarray(det['keypoints'], dtype=np.float64)
+        refined = np.asarray(crop_keypoints, dtype=np.float64)
+
+        if original.size != refined.size or original.size % 3 != 0:
+            return False
+
+        original = original.reshape(-1, 3)
+        refined = refined.reshape(-1, 3)
+
+        # Kembalikan ke koordinat image asli
+        refined[:, 0] += x0
+        refined[:, 1] += y0
+
+        better = refined[:, 2] >= original[:, 2]
+        if not better.any():
+            return False
+
+        original[better] = refined[better]
+        det['keypoints'] = original.reshape(-1).tolist()
+        det['keypoints_refined'] = True
+
+        return True
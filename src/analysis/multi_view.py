@@ -0,0 +1,160 @@
+"""
+Multi-View - Gabungkan analisis foto Depan/Belakang/Kanan/Kiri satu pasien
+"""
+import os
+from src.analysis.posture_analyzer import PLAUSIBLE_LIMITS
+from src.analysis.scoring_rules import get_scoring_rules
+from src.analysis.report_templates import SEPARATOR, IMBALANCE_TEMPLATES
+
+VIEWS = ['Depan', 'Belakang', 'Kanan', 'Kiri']
+
+VIEW_EMOJIS = {
+    'Depan': '🧍',
+    'Belakang': '🔙',
+    'Kanan': '➡️',
+    'Kiri': '⬅️',
+}
+
+MIN_VIEWS = 2
+
+
+def detect_view(posture_results):
+    """
+    Tentukan view foto dari sub-kategori deteksi dengan confidence tertinggi
+
+    Args:
+        posture_results (dict): Hasil PostureAnalyzer satu image
+
+    Returns:
+        str: Nama view (Depan/Belakang/Kanan/Kiri) atau None
+    """
+    if not posture_results.get('success', True) or not posture_results['detections']:
+        return None
+
+    best = max(posture_results['detections'], key=lambda det: det['confidence'])
+    view = best['class'].split('-')[-1] if '-' in best['class'] else ''
+    return view if view in VIEWS else None
+
+
+def fuse_views(compacts):
+    """
+    Gabungkan hasil per view menjadi satu hasil analisis
+
+    Setiap komponen imbalance dirata-rata dari semua view yang mengukurnya
+    (nilai outlier per view diabaikan), lalu score dihitung ulang dari
+    imbalance gabungan. Jika satu view ada lebih dari sekali, foto dengan
+    deteksi paling yakin yang dipakai.
+
+    Args:
+        compacts (list): Hasil compact per image (image_path, posture_results)
+
+    Returns:
+        dict: Hasil gabungan (format seperti posture_results + views)
+    """
+    views = {}
+    for compact in compacts:
+        posture_results = compact['posture_results']
+        view = detect_view(posture_results)
+        if view is None:
+            continue
+
+        confidence = max(det['confidence'] for det in posture_results['detections'])
+        if view in views and views[view]['confidence'] >= confidence:
+            continue
+
+        views[view] = {
+            'image_path': compact['image_path'],
+            'analysis_type': posture_results['analysis_type'],
+            'confidence': confidence,
+            'score': posture_results['score'],
+            'imbalance': posture_results['imbalance'],
+            'outliers': posture_results.get('outliers', []),
+            'classifications': posture_results['classifications'],
+        }
+
+    if not views:
+        return {
+            'success': False,
+            'message': 'Tidak ada view yang terdeteksi'
+        }
+
+    # Nilai per komponen dari setiap view, urut sesuai VIEWS
+    per_component = {}
+    for view in VIEWS:
+        if view not in views:
+            continue
+        info = views[view]
+        for key, value in info['imbalance'].items():
+            if key in info['outliers']:
+                continue
+            per_component.setdefault(key, {})[view] = value
+
+    imbalance = {
+        key: sum(values.values()) / len(values)
+        for key, values in per_component.items()
+    }
+
+    classifications = {}
+    for info in views.values():
+        for classification, count in info['classifications'].items():
+            classifications[classification] = classifications.get(classification, 0) + count
+
+    return {
+        'success': True,
+        'analysis_type': 'multi_view',
+        'views': {view: views[view] for view in VIEWS if view in views},
+        'missing_views': [view for view in VIEWS if view not in views],
+        'imbalance': imbalance,
+        'per_view_imbalance': per_component,
+        'outliers': [
+            key for key, limit in PLAUSIBLE_LIMITS.items()
+            if imbalance.get(key, 0) > limit
+        ],
+        'classifications': classifications,
+        'total_detections': sum(classifications.values()),
+        'score': get_scoring_rules().score(imbalance)
+    }
+
+
+def render_multi_view_report(fused):
+    """
+    Render report text untuk hasil multi-view
+
+    Args:
+        fused (dict): Hasil dari fuse_views
+
+    Returns:
+        str: Report text
+    """
+    if not fused.get('success', True):
+        return f"⚠️ {fused.get('message', 'Tidak ada view yang terdeteksi')}"
+
+    report = [SEPARATOR, "🧍 ANALISIS MULTI-VIEW (GABUNGAN)", SEPARATOR, ""]
+
+    report.append("📷 VIEW:")
+    for view, info in fused['views'].items():
+        report.append(
+            f"   {VIEW_EMOJIS[view]} {view}: {os.path.basename(info['image_path'])}"
+            f" - Score {info['score']:.1f}/100"
+        )
+    if fused['missing_views']:
+        report.append(f"   ⚠️  View tidak tersedia: {', '.join(fused['missing_views'])}")
+    report.append("")
+
+    report.append("📊 IMBALANCE GABUNGAN:")
+    for key, template in IMBALANCE_TEMPLATES:
+        if key not in fused['imbalance']:
+            continue
+        per_view = fused['per_view_imbalance'][key]
+        breakdown = ", ".join(f"{view} {value:.1f}" for view, value in per_view.items())
+        report.append(f"{template(fused['imbalance'][key])}  [{breakdown}]")
+    if fused['outliers']:
+        report.append(f"   ⚠️  Di luar batas wajar (cek foto/keypoint): {', '.join(fused['outliers'])}")
+    report.append(f"   🏆 Overall Score: {fused['score']:.1f}/100")
+    report.append("")
+
+    report.append("💡 REKOMENDASI:")
+    report.append(f"    {get_scoring_rules().recommendation(fused['score'])}")
+    report.append("")
+
+    return "\n".join(report)
@@ -0,0 +1,184 @@
+"""
+Analysis Pipeline - Inference, posture analysis dan rendering hasil per image
+"""
+import time
+import uuid
+from config.config import QUALITY_GATE_ENABLED
+from src.analysis.yolo_analyzer import YOLOAnalyzer
+from src.analysis.posture_analyzer import PostureAnalyzer
+from src.analysis.keypoint_refiner import KeypointRefiner
+from src.analysis.remote_analyzer import RemoteAnalyzer
+from src.analysis.scale_estimator import get_marker_detector
+from src.analysis.dedup import DuplicateGroups
+from src.analysis.quality_gate import QualityGate, rejected_result
+from src.utils.image_utils import load_image, create_side_by_side_image
+
+
+class AnalysisPipeline:
+    """
+    Pipeline analisis dengan model yang tetap warm antar batch.
+
+    Hasil dibagi dua tahap: hasil compact (deteksi + posture, JSON-serializable,
+    dipakai untuk checkpoint) dan hasil render (image before/after; report text
+    di-render lazily lewat get_report_text).
+
+    Jika server_url diisi, inference dilakukan di server (thin-client) dan
+    model tidak di-load secara lokal; annotasi tetap di-render lokal.
+
+    Jika deduplicate aktif, foto burst yang hampir identik dalam satu batch
+    hanya dianalisis sekali (lihat DuplicateGroups). Jika quality_gate aktif,
+    foto blur/gelap ditolak sebelum model call (lihat QualityGate).
+    """
+
+    def __init__(self, model_path, confidence, height_mm, refine_keypoints=False, server_url=None,
+                 deduplicate=False, quality_gate=QUALITY_GATE_ENABLED):
+        """
+        Initialize Analysis Pipeline
+
+        Args:
+            model_path (str): Path ke model YOLO .pt (diabaikan jika server_url diisi)
+            confidence (float): Confidence threshold
+            height_mm (float): Tinggi badan dalam mm
+            refine_keypoints (bool): Aktifkan refinement keypoints dari person crop
+            server_url (str): URL inference server (thin-client mode)
+            deduplicate (bool): Analisis hanya satu foto per kelompok foto hampir identik
+            quality_gate (bool): Tolak foto blur/gelap/tanpa orang sebelum inference
+        """
+        self.deduplicate = deduplicate
+        self.quality_gate = None
+        self.posture_analyzer = PostureAnalyzer(height_mm)
+        self.remote = None
+        self.refiner = None
+        self.marker_detector = None
+
+        if server_url:
+            self.remote = RemoteAnalyzer(server_url, height_mm, confidence, refine_keypoints)
+            self.remote.check_health()
+            self.yolo_analyzer = YOLOAnalyzer(None, confidence)
+        else:
+            self.yolo_analyzer = YOLOAnalyzer(model_path, confidence)
+            self.marker_detector = get_marker_detector()
+            if refine_keypoints:
+                self.refiner = KeypointRefiner(self.yolo_analyzer)
+
+        if quality_gate:
+            # Cek orang resolusi rendah hanya jika model di-load lokal
+            self.quality_gate = QualityGate(self.yolo_analyzer if not self.remote else None)
+
+    def analyze_batch(self, image_paths):
+        """
+        Jalankan inference dan posture analysis untuk batch image
+
+        Args:
+            image_paths (list): List path image
+
+        Returns:
+            list: List hasil compact (image_path, yolo_results, posture_results)
+        """
+        if self.deduplicate and len(image_paths) > 1:
+            groups = DuplicateGroups(image_paths)
+            if groups.num_duplicates:
+                return groups.expand_all(self._analyze_checked(groups.representative_paths))
+        return self._analyze_checked(image_paths)
+
+    def _analyze_checked(self, image_paths):
+        """Tolak foto yang tidak layak, analisis sisanya (urutan hasil tetap)"""
+        if not self.quality_gate:
+            return self._analyze_paths(image_paths)
+
+        checks = self.quality_gate.check(image_paths)
+        accepted = [path for path, (issue, _) in zip(image_paths, checks) if issue is None]
+        analyzed = iter(self._analyze_paths(accepted) if accepted else [])
+
+        return [
+            next(analyzed) if issue is None else rejected_result(path, issue, metrics)
+            for path, (issue, metrics) in zip(image_paths, checks)
+        ]
+
+    def _analyze_paths(self, image_paths):
+        """Inference dan posture analysis untuk setiap image (tanpa deduplikasi)"""
+        if self.remote:
+            return [
+                {
+                    'image_path': yolo_results['image_path'],
+                    'yolo_results': yolo_results,
+                    'posture_results': posture_results
+                }
+                for yolo_results, posture_results in self.remote.predict_many(image_paths)
+            ]
+
+        # Satu model call untuk seluruh batch (mis. 4 view multi-view)
+        start_ns = time.perf_counter_ns()
+        detections_list = self.yolo_analyzer.predict_batch(image_paths)
+        elapsed_time = (time.perf_counter_ns() - start_ns) / 1e9 / max(1, len(image_paths))
+
+        predictions = [
+            {
+                'detections': detections,
+                'elapsed_time': elapsed_time,
+                'image_path': img_path
+            }
+            for img_path, detections in zip(image_paths, detections_list)
+        ]
+
+        # Semua person crop dalam batch di-refine bersama
+        if self.refiner:
+            self.refiner.refine([(r['image_path'], r['detections']) for r in predictions])
+
+        # Skala dari marker kalibrasi (jika diaktifkan), selain itu diestimasi dari keypoints
+        marker_scales = None
+        if self.marker_detector:
+            marker_scales = [self.marker_detector.detect_file(r['image_path']) for r in predictions]
+
+        posture_list = self.posture_analyzer.analyze_batch(
+            [r['detections'] for r in predictions],
+            marker_scales
+        )
+
+        return [
+            {
+                'image_path': yolo_results['image_path'],
+                'yolo_results': yolo_results,
+                'posture_results': posture_results
+            }
+            for yolo_results, posture_results in zip(predictions, posture_list)
+        ]
+
+    def render_result(self, compact):
+        """
+        Render hasil compact menjadi hasil lengkap untuk ditampilkan
+
+        Args:
+            compact (dict): Hasil compact dari analyze_batch atau checkpoint
+
+        Returns:
+            dict: Hasil lengkap (termasuk image)
+        """
+        img_path = compact['image_path']
+        yolo_results = compact['yolo_results']
+        posture_results = compact['posture_results']
+
+        # Load images (duplikat di-annotasi di image yang benar-benar dianalisis)
+        original_img = load_image(compact.get('duplicate_of') or img_path)
+        annotated_img = self.yolo_analyzer.annotate_image(original_img, yolo_results['detections'])
+
+        # Create side-by-side
+        combined_img = create_side_by_side_image(
+            original_img,
+            annotated_img,
+            label1="BEFORE",
+            label2="AFTER ANALYSIS"
+        )
+
+        return {
+            'result_id': uuid.uuid4().hex,
+            'image_path': img_path,
+            'duplicate_of': compact.get('duplicate_of'),
+            'yolo_results': yolo_results,
+            'posture_results': posture_results,
+            'original_img': original_img,
+            'annotated_img': annotated_img,
+            'combined_img': combined_img,
+            # Report text di-render lazily lewat get_report_text saat ditampilkan
+            'report_text': None
+        }
@@ -3,7 +3,19 @@ Posture Analyzer - Analisis postur dari keypoints
 """
 import numpy as np
 import math
-from config.config import POSTURE_MAPPING, ANALYSIS_TYPE_MAPPING, KEYPOINT_NAMES, KEYPOINT_EMOJIS, get_confidence_level
+from config.config import POSTURE_MAPPING, ANALYSIS_TYPE_MAPPING, get_confidence_level
+from src.analysis.report_templates import render_report_text
+from src.analysis.scoring_rules import get_scoring_rules
+from src.analysis.scale_estimator import estimate_scales, METHOD_MARKER, METHOD_BBOX
+from src.utils.profiling import timed
+
+# Nilai di atas batas ini hampir pasti karena keypoint/skala salah (ditandai sebagai outlier)
+PLAUSIBLE_LIMITS = {
+    'shoulder': 200,
+    'hip': 200,
+    'spine': 100,
+    'head_shift': 150,
+}
 
 
 class PostureAnalyzer:
@@ -17,13 +29,94 @@ class PostureAnalyzer:
             height_mm (float): Tinggi orang dalam mm
         """
         self.height_mm = height_mm
+        self.scoring_rules = get_scoring_rules()
+
+    def _detection_scales(self, detections, mm_per_px=None):
+        """
+        Skala mm per pixel untuk setiap deteksi (vectorized)
+
+        Args:
+            detections (list): List deteksi dari YOLO
+            mm_per_px (float): Skala dari marker kalibrasi (override estimasi)
+
+        Returns:
+            list: List of (mm_per_px, method) per deteksi
+        """
+        if mm_per_px:
+            return [(float(mm_per_px), METHOD_MARKER)] * len(detections)
+
+        scales = []
+        for det in detections:
+            x1, y1, x2, y2 = det['bbox']
+            scales.append((self.height_mm / max(y2 - y1, 1), METHOD_BBOX))
+
+        with_keypoints = [i for i, det in enumerate(detections) if det['keypoints'] and len(det['keypoints']) == 51]
+        if with_keypoints:
+            kp_values, methods = estimate_scales(
+                [detections[i]['keypoints'] for i in with_keypoints],
+                [detections[i]['bbox'] for i in with_keypoints],
+                self.height_mm
+            )
+            for i, value, method in zip(with_keypoints, kp_values.tolist(), methods):
+                scales[i] = (value, method)
+
+        return scales
+
+    def analyze_batch(self, detections_list, mm_per_px_list=None):
+        """
+        Analyze banyak image sekaligus; skala semua deteksi diestimasi dalam satu call
+
+        Args:
+            detections_list (list): List deteksi per image
+            mm_per_px_list (list): Skala marker per image (None = estimasi dari keypoints)
 
-    def analyze(self, detections):
+        Returns:
+            list: Hasil analisis per image
+        """
+        mm_per_px_list = mm_per_px_list or [None] * len(detections_list)
+        flat = [det for detections in detections_list for det in detections]
+        flat_scales = self._detection_scales(flat)
+
+        results = []
+        offset = 0
+        for detections, mm_per_px in zip(detections_list, mm_per_px_list):
+            scales = flat_scales[offset:offset + len(detections)]
+            offset += len(detections)
+            if mm_per_px:
+                scales = self._detection_scales(detections, mm_per_px)
+            results.append(self._analyze(detections, scales, score=False))
+
+        # Score semua image dalam satu call vectorized
+        analyzed = [r for r in results if r.get('success', True)]
+        if analyzed:
+            scores = self.scoring_rules.score_batch([r['imbalance'] for r in analyzed])
+            for r, value in zip(analyzed, scores.tolist()):
+                r['score'] = value if r['imbalance'] else 0
+
+        return results
+
+    def analyze(self, detections, mm_per_px=None):
         """
         Analyze deteksi untuk mendapatkan imbalance
 
         Args:
             detections (list): List deteksi dari YOLO
+            mm_per_px (float): Skala dari marker kalibrasi (None = estimasi dari keypoints)
+
+        Returns:
+            dict: Hasil analisis lengkap
+        """
+        return self._analyze(detections, self._detection_scales(detections, mm_per_px))
+
+    @timed('posture_analyze')
+    def _analyze(self, detections, scales, score=True):
+        """
+        Analyze deteksi dengan skala yang sudah diestimasi
+
+        Args:
+            detections (list): List deteksi dari YOLO
+            scales (list): List of (mm_per_px, method) per deteksi
+            score (bool): Hitung overall score (False jika di-score per batch)
 
         Returns:
             dict: Hasil analisis lengkap
@@ -41,10 +134,12 @@ class PostureAnalyzer:
             'imbalance': {},
             'score': 0,
             'analysis_type': None,
-            'total_detections': len(detections)
+            'total_detections': len(detections),
+            'scale': None,
+            'outliers': []
         }
 
-        for i, det in enumerate(detections):
+        for i, (det, (mm_per_px, scale_method)) in enumerate(zip(detections, scales)):
             # Parse detection
             class_name = det['class_name']
             confidence = det['confidence']
@@ -55,8 +150,7 @@ class PostureAnalyzer:
             classification = POSTURE_MAPPING.get(class_name, class_name)
 
             # Get analysis type
-            subcategory = class_name.split('-')[-1] if '-' in class_name else ''
-            analysis_type = ANALYSIS_TYPE_MAPPING.get(subcategory, 'back_front_analysis')
+            analysis_type = self.get_analysis_type(class_name)
 
             if results['analysis_type'] is None:
                 results['analysis_type'] = analysis_type
@@ -69,7 +163,7 @@ class PostureAnalyzer:
             # Calculate bbox properties
             x1, y1, x2, y2 = bbox
             width = x2 - x1
-            height = x2 - y1
+            height = y2 - y1
             center_x = (x1 + x2) / 2
             center_y = (y1 + y2) / 2
             area = width * height
@@ -87,33 +181,44 @@ class PostureAnalyzer:
                 'height': height,
                 'center': (center_x, center_y),
                 'area': area,
-                'keypoints': keypoints
+                'keypoints': keypoints,
+                'mm_per_px': mm_per_px,
+                'scale_method': scale_method
             }
 
             results['detections'].append(detection_info)
 
             # Analyze keypoints if available
             if keypoints:
-                imbalance = self._analyze_keypoints(keypoints, analysis_type, height)
+                imbalance = self._analyze_keypoints(keypoints, analysis_type, mm_per_px)
                 if imbalance:
+                    if results['scale'] is None:
+                        results['scale'] = {'mm_per_px': mm_per_px, 'method': scale_method}
+
                     # Merge imbalance results
                     for key, value in imbalance.items():
                         if key not in results['imbalance']:
                             results['imbalance'][key] = value
 
+        results['outliers'] = [
+            key for key, limit in PLAUSIBLE_LIMITS.items()
+            if results['imbalance'].get(key, 0) > limit
+        ]
+
         # Calculate overall score
-        results['score'] = self._calculate_score(results['imbalance'])
+        if score:
+            results['score'] = self._calculate_score(results['imbalance'])
 
         return results
 
-    def _analyze_keypoints(self, keypoints, analysis_type, bbox_height):
+    def _analyze_keypoints(self, keypoints, analysis_type, ratio_mm_per_px):
         """
         Analyze keypoints untuk mendapatkan imbalance
 
         Args:
             keypoints (list): List of keypoints
             analysis_type (str): Type of analysis
-            bbox_height (float): Height of bounding box
+            ratio_mm_per_px (float): Skala mm per pixel
 
         Returns:
             dict: Imbalance measurements
@@ -125,9 +230,6 @@ class PostureAnalyzer:
         else:
             return {}
 
-        # Calculate ratio (mm per pixel)
-        ratio_mm_per_px = self.height_mm / max(bbox_height, 1)
-
         imbalance = {}
 
         if analysis_type == 'back_front_analysis':
@@ -159,13 +261,7 @@ class PostureAnalyzer:
 
             if left_shoulder[2] > 0.1 and right_shoulder[2] > 0.1:
                 shoulder_diff_px = abs(left_shoulder[1] - right_shoulder[1])
-                shoulder_diff_mm = shoulder_diff_px * ratio
-
-                # Apply realistic limit
-                if shoulder_diff_mm > 200:
-                    shoulder_diff_mm = min(shoulder_diff_mm * 0.1, 50)
-
-                imbalance['shoulder'] = shoulder_diff_mm
+                imbalance['shoulder'] = shoulder_diff_px * ratio
 
         # Hip imbalance
         if len(keypoints) >= 13:
@@ -174,13 +270,7 @@ class PostureAnalyzer:
 
             if left_hip[2] > 0.1 and right_hip[2] > 0.1:
                 hip_diff_px = abs(left_hip[1] - right_hip[1])
-                hip_diff_mm = hip_diff_px * ratio
-
-                # Apply realistic limit
-                if hip_diff_mm > 200:
-                    hip_diff_mm = min(hip_diff_mm * 0.1, 50)
-
-                imbalance['hip'] = hip_diff_mm
+                imbalance['hip'] = hip_diff_px * ratio
 
         # Spine deviation (simplified)
         if len(keypoints) >= 13:
@@ -192,13 +282,7 @@ class PostureAnalyzer:
                 hip_mid_x = (keypoints[11][0] + keypoints[12][0]) / 2
 
                 spine_diff_px = abs(shoulder_mid_x - hip_mid_x)
-                spine_diff_mm = spine_diff_px * ratio
-
-                # Apply realistic limit
-                if spine_diff_mm > 100:
-                    spine_diff_mm = min(spine_diff_mm * 0.15, 30)
-
-                imbalance['spine'] = spine_diff_mm
+                imbalance['spine'] = spine_diff_px * ratio
 
         return imbalance
 
@@ -223,15 +307,7 @@ class PostureAnalyzer:
             if nose[2] > 0.1 and shoulders_available:
                 shoulder_mid_x = (keypoints[5][0] + keypoints[6][0]) / 2
                 head_shift_px = abs(nose[0] - shoulder_mid_x)
-                head_shift_mm = head_shift_px * ratio
-
-                # Apply realistic limit and auto-debug
-                if head_shift_mm > 150:
-                    head_shift_mm = min(head_shift_mm * 0.2, 40)
-                elif head_shift_mm > 100:
-                    head_shift_mm = min(head_shift_mm * 0.3, 35)
-
-                imbalance['head_shift'] = head_shift_mm
+                imbalance['head_shift'] = head_shift_px * ratio
 
         # Head tilt
         if len(keypoints) >= 5:
@@ -255,37 +331,71 @@ class PostureAnalyzer:
 
         return imbalance
 
-    def _calculate_score(self, imbalance):
+    @staticmethod
+    def get_analysis_type(class_name):
         """
-        Calculate overall score dari imbalance
+        Jenis analisis dari sub-kategori kelas (mis. Normal-Kanan -> back_front_analysis)
 
         Args:
-            imbalance (dict): Dictionary of imbalance measurements
+            class_name (str): Nama kelas YOLO
 
         Returns:
-            float: Score dari 0-100
+            str: Jenis analisis
+        """
+        subcategory = class_name.split('-')[-1] if '-' in class_name else ''
+        return ANALYSIS_TYPE_MAPPING.get(subcategory, 'back_front_analysis')
+
+    @staticmethod
+    def batch_imbalance(keypoints, side_view, mm_per_px):
         """
-        if not imbalance:
-            return 0
+        Imbalance untuk banyak deteksi sekaligus (versi vectorized dari
+        _analyze_back_front / _analyze_side)
 
-        total_score = 0
-        count = 0
+        Args:
+            keypoints (numpy.ndarray): Keypoints (N, 17, 3)
+            side_view (numpy.ndarray): Bool (N,), True = side_analysis
+            mm_per_px (numpy.ndarray): Skala per deteksi (N,)
 
-        # Score untuk setiap komponen
-        for key, value in imbalance.items():
-            if key in ['shoulder', 'hip', 'spine', 'head_shift']:
-                # Linear scoring: 0mm = 100, 50mm = 0
-                score = max(0, 100 - (value * 2))
-            elif key == 'head_tilt':
-                # Angular scoring: 0° = 100, 30° = 0
-                score = max(0, 100 - (value * 3.33))
-            else:
-                score = 0
+        Returns:
+            dict: Komponen -> array (N,), NaN jika tidak terukur
+        """
+        kp = np.asarray(keypoints, dtype=np.float64)
+        ratio = np.asarray(mm_per_px, dtype=np.float64)
+        side = np.asarray(side_view, dtype=bool)
+        ok = kp[:, :, 2] > 0.1
+        x = kp[:, :, 0]
+        y = kp[:, :, 1]
+
+        shoulders = ok[:, 5] & ok[:, 6]
+        hips = ok[:, 11] & ok[:, 12]
+        shoulder_mid_x = (x[:, 5] + x[:, 6]) / 2
+        hip_mid_x = (x[:, 11] + x[:, 12]) / 2
+
+        # Head tilt: sudut garis mata, dinormalisasi seperti _analyze_side
+        angle = np.abs(np.degrees(np.arctan2(y[:, 2] - y[:, 1], x[:, 2] - x[:, 1])))
+        angle = np.where(angle > 90, 180 - angle, angle)
+        angle = np.where(angle > 45, np.minimum(angle * 0.5, 30), angle)
+
+        front = ~side
+        return {
+            'shoulder': np.where(front & shoulders, np.abs(y[:, 5] - y[:, 6]) * ratio, np.nan),
+            'hip': np.where(front & hips, np.abs(y[:, 11] - y[:, 12]) * ratio, np.nan),
+            'spine': np.where(front & shoulders & hips, np.abs(shoulder_mid_x - hip_mid_x) * ratio, np.nan),
+            'head_shift': np.where(side & ok[:, 0] & shoulders, np.abs(x[:, 0] - shoulder_mid_x) * ratio, np.nan),
+            'head_tilt': np.where(side & ok[:, 1] & ok[:, 2], angle, np.nan),
+        }
+
+    def _calculate_score(self, imbalance):
+        """
+        Calculate overall score dari imbalance
 
-            total_score += score
-            count += 1
+        Args:
+            imbalance (dict): Dictionary of imbalance measurements
 
-        return total_score / count if count > 0 else 0
+        Returns:
+            float: Score dari 0-100
+        """
+        return self.scoring_rules.score(imbalance)
 
     def generate_report_text(self, results):
         """
@@ -297,87 +407,7 @@ class PostureAnalyzer:
         Returns:
             str: Report text
         """
-        report = []
-
-        # Header
-        report.append("="*60)
-        report.append("📊 DETEKSI DAN KLASIFIKASI POSTURAL")
-        report.append("="*60)
-        report.append("")
-
-        # Deteksi
-        for det in results['detections']:
-            emoji = "🔸" if det['index'] % 2 == 1 else "🔹"
-            report.append(f"{emoji} Deteksi {det['index']}:")
-            report.append(f"   🦴 Kelas: {det['class']}")
-            report.append(f"   🏷️  Klasifikasi: {det['classification']}")
-            report.append(f"   📌 Sub-kategori: {det['subcategory']}")
-            report.append(f"   🎯 Jenis Analisis: {det['analysis_type']}")
-            report.append(f"   🎯 Confidence: {det['confidence']:.4f} ({det['confidence']*100:.1f}%)")
-            report.append(f"   📊 Klasifikasi Confidence: {det['confidence_level']}")
-
-            bbox = det['bbox']
-            report.append(f"   📍 Bounding Box: [{bbox[0]:.1f}, {bbox[1]:.1f}, {bbox[2]:.1f}, {bbox[3]:.1f}]")
-            report.append(f"   📏 Lebar: {det['width']:.1f}px")
-            report.append(f"   📐 Tinggi: {det['height']:.1f}px")
-            report.append(f"   🎯 Center: ({det['center'][0]:.1f}, {det['center'][1]:.1f})")
-            report.append(f"   📊 Area: {det['area']:.1f}px²")
-            report.append("")
-
-            # Keypoints
-            if det['keypoints']:
-                report.append("  🔹 KEYPOINT DETECTION:")
-                keypoints = det['keypoints']
-
-                if len(keypoints) % 3 == 0:
-                    num_points = len(keypoints) // 3
-                    kp_array = np.array(keypoints).reshape(num_points, 3)
-
-                    for i, kp in enumerate(kp_array):
-                        if i < len(KEYPOINT_NAMES):
-                            name = KEYPOINT_NAMES[i]
-                            emoji = KEYPOINT_EMOJIS.get(name, '🔸')
-
-                            if kp[2] > 0.05:
-                                report.append(f"     {emoji} {name}: ({kp[0]:.1f}, {kp[1]:.1f}) - Confidence: {kp[2]:.2f} ({get_confidence_level(kp[2])})")
-
-                report.append("")
-
-        report.append(f"TOTAL DETEKSI: {results['total_detections']} objek/keypoint")
-        report.append("="*60)
-        report.append("")
-
-        # Statistik
-        report.append("📊 STATISTIK KLASIFIKASI:")
-        for classification, count in results['classifications'].items():
-            percentage = (count / results['total_detections']) * 100
-            emoji = "🦴" if classification != 'Normal' else "✅"
-            report.append(f"   {emoji} {classification}: {count} deteksi ({percentage:.1f}%)")
-        report.append("")
-
-        # Imbalance
-        if results['imbalance']:
-            report.append("📊 ANALISIS POSTUR BERDASARKAN KEYPOINT")
-            report.append("="*50)
-            report.append(f"📋 Jenis Analisis: {results['analysis_type']}")
-            report.append("")
-
-            imb = results['imbalance']
-            if 'shoulder' in imb:
-                report.append(f"   👤 Shoulder Imbalance: {imb['shoulder']:.1f} mm")
-            if 'hip' in imb:
-                report.append(f"   🏋️  Hip Imbalance: {imb['hip']:.1f} mm")
-            if 'spine' in imb:
-                report.append(f"   🦴 Spine Deviation: {imb['spine']:.1f} mm")
-            if 'head_shift' in imb:
-                report.append(f"   📏 Head Shift: {imb['head_shift']:.1f} mm")
-            if 'head_tilt' in imb:
-                report.append(f"   📐 Head Tilt: {imb['head_tilt']:.1f}°")
-
-            report.append(f"   🏆 Overall Score: {results['score']:.1f}/100")
-            report.append("")
-
-        return "\n".join(report)
+        return render_report_text(results)
 
     def generate_classification_summary(self, results):
         """
@@ -393,6 +423,10 @@ class PostureAnalyzer:
 
         summary.append("HASIL KLASIFIKASI POSTURAL:")
 
+        if not results.get('success', True):
+            summary.append(f"⚠️ {results.get('message', 'Tidak ada deteksi')}")
+            return "\n".join(summary)
+
         for classification, count in results['classifications'].items():
             if classification != 'Normal':
                 emoji = "🦴"
@@ -403,17 +437,19 @@ class PostureAnalyzer:
 
         summary.append("")
         summary.append("💡 REKOMENDASI BERDASARKAN ANALISIS:")
-
-        score = results['score']
-        if score >= 80:
-            summary.append("    Postur baik. Pertahankan dan lakukan peregangan rutin.")
-        elif score >= 60:
-            summary.append("    Postur cukup baik. Perhatikan posisi duduk dan berdiri.")
-        elif score >= 40:
-            summary.append("    Postur perlu perbaikan. Konsultasi dengan fisioterapis direkomendasikan.")
-        elif score >= 20:
-            summary.append("    Postur buruk. Segera konsultasi dengan spesialis.")
-        else:
-            summary.append("    Postur kritis. Segera konsultasi dengan spesialis.")
+        summary.append(f"    {self.get_recommendation(results['score'])}")
 
         return "\n".join(summary)
+
+    @staticmethod
+    def get_recommendation(score):
+        """
+        Get rekomendasi berdasarkan overall score
+
+        Args:
+            score (float): Overall score
+
+        Returns:
+            str: Rekomendasi
+        """
+        return get_scoring_rules().recommendation(score)
@@ -0,0 +1,176 @@
+"""
+Process Pipeline - AnalysisPipeline yang berjalan di worker process terpisah
+"""
+import multiprocessing
+from config.config import *
+from src.analysis.yolo_analyzer import YOLOAnalyzer
+from src.analysis.posture_analyzer import PostureAnalyzer
+from src.utils.shared_memory_transport import ResultTransport, ResultProducer
+
+FRAME_KEYS = ('original_img', 'annotated_img', 'combined_img')
+WORKER_STOP_TIMEOUT = 5
+
+
+def _worker_main(pipeline_args, producer_args, request_queue):
+    """
+    Loop worker process: inference + render, image dikirim lewat shared memory
+
+    Args:
+        pipeline_args (tuple): Argumen AnalysisPipeline
+        producer_args (tuple): Argumen ResultProducer
+        request_queue: Queue request ('analyze', paths) / ('render', compacts) / None
+    """
+    from src.analysis.pipeline import AnalysisPipeline
+    from src.utils.runtime_tuning import configure_runtime
+
+    # Proses spawn tidak mewarisi setting thread torch/OpenCV dari GUI
+    configure_runtime()
+
+    producer = ResultProducer(*producer_args)
+    try:
+        try:
+            pipeline = AnalysisPipeline(*pipeline_args)
+        except Exception as e:
+            producer.put({'type': 'error', 'message': str(e)})
+            return
+        producer.put({'type': 'ready'})
+
+        while True:
+            request = request_queue.get()
+            if request is None:
+                break
+
+            kind, payload = request
+            producer.begin_request()
+            try:
+                compacts = pipeline.analyze_batch(payload) if kind == 'analyze' else payload
+                for compact in compacts:
+                    rendered = pipeline.render_result(compact)
+                    producer.send(compact, rendered['result_id'], {key: rendered[key] for key in FRAME_KEYS})
+                producer.put({'type': 'done'})
+            except Exception as e:
+                producer.put({'type': 'error', 'message': str(e)})
+    finally:
+        producer.close()
+
+
+class ProcessAnalysisPipeline:
+    """
+    Interface sama dengan AnalysisPipeline, tetapi inference dan rendering
+    dijalankan di worker process.
+
+    Image hasil render dikirim lewat ring buffer shared memory dan diterima
+    sebagai view zero-copy (SharedFrame); hanya hasil compact yang di-pickle.
+    Panggil detach_frames() pada hasil yang disimpan lama, dan close() setelah
+    job selesai.
+    """
+
+    def __init__(self, model_path, confidence, height_mm, refine_keypoints=False, server_url=None,
+                 deduplicate=False, quality_gate=QUALITY_GATE_ENABLED, ring_mb=SHM_RING_MB):
+        """
+        Initialize Process Analysis Pipeline (menunggu model selesai di-load di worker)
+
+        Args:
+            model_path (str): Path ke model YOLO .pt
+            confidence (float): Confidence threshold
+            height_mm (float): Tinggi badan dalam mm
+            refine_keypoints (bool): Aktifkan refinement keypoints dari person crop
+            server_url (str): URL inference server (thin-client mode)
+            deduplicate (bool): Analisis hanya satu foto per kelompok foto hampir identik
+            quality_gate (bool): Tolak foto blur/gelap/tanpa orang sebelum inference
+            ring_mb (int): Ukuran ring buffer shared memory (MB)
+        """
+        # Model tidak di-load di proses GUI; analyzer lokal hanya untuk atribut/annotasi
+        self.yolo_analyzer = YOLOAnalyzer(None, confidence)
+        self.posture_analyzer = PostureAnalyzer(height_mm)
+
+        # spawn: aman dipakai bersama thread Tk (tanpa fork)
+        context = multiprocessing.get_context('spawn')
+        self.transport = ResultTransport(context, ring_mb)
+        self.request_queue = context.Queue()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(
+                (model_path, confidence, height_mm, refine_keypoints, server_url, deduplicate, quality_gate),
+                self.transport.producer_args(),
+                self.request_queue
+            ),
+            name='analysis-worker',
+            daemon=True
+        )
+        self.process.start()
+
+        # Hasil render (view shared memory) per hasil compact, menunggu render_result:
+        # id(compact) -> (compact, hasil render). Compact ikut disimpan agar id tidak
+        # dipakai ulang; task lain (mis. analisis cepat) tidak menghapus entry ini.
+        self._rendered = {}
+
+        try:
+            for _ in self._receive('ready'):
+                pass
+        except Exception:
+            self.close()
+            raise
+
+    def _receive(self, expected):
+        """Tunggu pesan dengan type tertentu (hasil render dikumpulkan)"""
+        while True:
+            message = self.transport.receive(is_alive=self.process.is_alive)
+            if message['type'] == 'error':
+                raise Exception(f"❌ Worker analisis: {message['message'].lstrip('❌ ')}")
+            if message['type'] == 'result':
+                compact = message['compact']
+                self._rendered[id(compact)] = (compact, {
+                    'result_id': message['result_id'],
+                    'image_path': compact['image_path'],
+                    'duplicate_of': compact.get('duplicate_of'),
+                    'yolo_results': compact['yolo_results'],
+                    'posture_results': compact['posture_results'],
+                    **message['frames'],
+                    # Report text di-render lazily lewat get_report_text saat ditampilkan
+                    'report_text': None
+                })
+                yield compact
+            elif message['type'] == expected:
+                return
+
+    def analyze_batch(self, image_paths):
+        """
+        Jalankan inference + render batch image di worker process
+
+        Args:
+            image_paths (list): List path image
+
+        Returns:
+            list: List hasil compact (image_path, yolo_results, posture_results)
+        """
+        self.request_queue.put(('analyze', list(image_paths)))
+        return list(self._receive('done'))
+
+    def render_result(self, compact):
+        """
+        Hasil render untuk hasil compact (dari analyze_batch atau checkpoint)
+
+        Args:
+            compact (dict): Hasil compact
+
+        Returns:
+            dict: Hasil lengkap; image berupa view shared memory
+        """
+        entry = self._rendered.pop(id(compact), None)
+        if entry is None:
+            # Hasil dari checkpoint / duplikat: render di worker juga
+            self.request_queue.put(('render', [compact]))
+            rendered, = self._receive('done')
+            entry = self._rendered.pop(id(rendered))
+        return entry[1]
+
+    def close(self):
+        """Stop worker process dan hapus shared memory"""
+        self._rendered.clear()
+        if self.process.is_alive():
+            self.request_queue.put(None)
+            self.process.join(timeout=WORKER_STOP_TIMEOUT)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.transport.close()
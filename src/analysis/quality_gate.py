@@ -0,0 +1,144 @@
+"""
+Quality Gate - Tolak foto yang tidak layak (blur, gelap, tanpa orang) sebelum inference
+
+Pengecekan memakai decode grayscale yang diperkecil sehingga jauh lebih murah
+dari model call. Foto yang ditolak langsung menjadi hasil gagal dengan alasan
+yang jelas, agar bisa segera difoto ulang.
+"""
+import cv2
+import numpy as np
+from config.config import *
+from src.analysis.dedup import sharpness
+from src.utils.profiling import timed
+
+
+def _load_gray(image_path):
+    """Decode grayscale 1/2 resolusi, dinormalisasi ke sisi terpanjang QUALITY_ANALYSIS_SIZE"""
+    img = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_2)
+    if img is None:
+        return None
+
+    # Ukuran tetap agar threshold ketajaman tidak bergantung resolusi kamera
+    scale = QUALITY_ANALYSIS_SIZE / max(img.shape[:2])
+    if scale < 1.0:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return img
+
+
+def measure_quality(gray):
+    """
+    Ukur ketajaman dan exposure image
+
+    Args:
+        gray (numpy.ndarray): Image grayscale
+
+    Returns:
+        dict: sharpness, brightness, dark_fraction, bright_fraction
+    """
+    hist = np.bincount(gray.ravel(), minlength=256) / gray.size
+    return {
+        'sharpness': sharpness(gray),
+        'brightness': float(hist @ np.arange(256)),
+        'dark_fraction': float(hist[:QUALITY_DARK_LEVEL + 1].sum()),
+        'bright_fraction': float(hist[QUALITY_BRIGHT_LEVEL:].sum())
+    }
+
+
+def quality_issue(metrics):
+    """
+    Alasan penolakan dari metrik kualitas
+
+    Args:
+        metrics (dict): Hasil measure_quality
+
+    Returns:
+        str: Alasan (None jika foto layak)
+    """
+    if metrics['brightness'] < QUALITY_MIN_BRIGHTNESS or metrics['dark_fraction'] > QUALITY_MAX_CLIPPED_FRACTION:
+        return f"Foto terlalu gelap (brightness {metrics['brightness']:.0f})"
+    if metrics['brightness'] > QUALITY_MAX_BRIGHTNESS or metrics['bright_fraction'] > QUALITY_MAX_CLIPPED_FRACTION:
+        return f"Foto overexposed (brightness {metrics['brightness']:.0f})"
+    if metrics['sharpness'] < QUALITY_MIN_SHARPNESS:
+        return f"Foto terlalu blur (ketajaman {metrics['sharpness']:.0f} < {QUALITY_MIN_SHARPNESS})"
+    return None
+
+
+class QualityGate:
+    """
+    Pre-check foto sebelum model call.
+
+    Blur (variance Laplacian) dan exposure (histogram) dicek untuk semua foto;
+    jika person_imgsz diisi, foto yang lolos juga dicek dengan satu model call
+    resolusi rendah dan ditolak jika tidak ada orang terdeteksi.
+    """
+
+    def __init__(self, yolo_analyzer=None, person_imgsz=QUALITY_PERSON_IMGSZ):
+        """
+        Initialize Quality Gate
+
+        Args:
+            yolo_analyzer (YOLOAnalyzer): Analyzer untuk cek orang (None = tidak dicek)
+            person_imgsz (int): Ukuran input cek orang (None = tidak dicek)
+        """
+        self.yolo_analyzer = yolo_analyzer
+        self.person_imgsz = person_imgsz
+
+    @timed('quality_gate')
+    def check(self, image_paths):
+        """
+        Cek kualitas batch image
+
+        Args:
+            image_paths (list): List path image
+
+        Returns:
+            list: List (alasan penolakan atau None, metrik) per image
+        """
+        checks = []
+        for path in image_paths:
+            gray = _load_gray(path)
+            if gray is None:
+                # Error baca file tetap dilaporkan oleh tahap inference seperti biasa
+                checks.append((None, {}))
+                continue
+            metrics = measure_quality(gray)
+            checks.append((quality_issue(metrics), metrics))
+
+        # Cek orang hanya untuk foto yang lolos blur/exposure
+        if self.yolo_analyzer is not None and self.yolo_analyzer.model and self.person_imgsz:
+            passed = [i for i, (issue, _) in enumerate(checks) if issue is None]
+            detections_list = self.yolo_analyzer.predict_batch(
+                [image_paths[i] for i in passed], imgsz=self.person_imgsz
+            )
+            for i, detections in zip(passed, detections_list):
+                if not detections:
+                    checks[i] = ("Tidak ada orang terdeteksi", checks[i][1])
+
+        return checks
+
+
+def rejected_result(image_path, issue, metrics):
+    """
+    Hasil compact untuk foto yang ditolak (format sama dengan hasil pipeline)
+
+    Args:
+        image_path (str): Path image
+        issue (str): Alasan penolakan
+        metrics (dict): Metrik kualitas
+
+    Returns:
+        dict: Hasil compact (posture_results gagal dengan alasan)
+    """
+    return {
+        'image_path': image_path,
+        'yolo_results': {
+            'detections': [],
+            'elapsed_time': 0.0,
+            'image_path': image_path
+        },
+        'posture_results': {
+            'success': False,
+            'message': f"📷 {issue}. Silakan foto ulang.",
+            'quality': metrics
+        }
+    }
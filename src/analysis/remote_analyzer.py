@@ -0,0 +1,115 @@
+"""
+Remote Analyzer - Client untuk inference server (thin-client mode tanpa PyTorch)
+"""
+import json
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from config.config import REMOTE_TIMEOUT, REMOTE_MAX_IN_FLIGHT, REMOTE_MAX_RETRIES
+from src.utils.profiling import span
+
+
+class RemoteAnalyzer:
+    """Kirim image ke inference server dan terima deteksi + posture results (JSON)"""
+
+    def __init__(self, server_url, height_mm, confidence=None, refine_keypoints=False,
+                 timeout=REMOTE_TIMEOUT, max_in_flight=REMOTE_MAX_IN_FLIGHT):
+        """
+        Initialize Remote Analyzer
+
+        Args:
+            server_url (str): Base URL server, mis. http://192.168.1.10:8765
+            height_mm (float): Tinggi badan dalam mm
+            confidence (float): Confidence threshold (None = default server)
+            refine_keypoints (bool): Minta server me-refine keypoints dari person crop
+            timeout (float): Timeout request (detik)
+            max_in_flight (int): Jumlah request paralel (agar server bisa batching)
+        """
+        self.server_url = server_url.rstrip('/')
+        self.height_mm = height_mm
+        self.confidence = confidence
+        self.refine_keypoints = refine_keypoints
+        self.timeout = timeout
+        self.max_in_flight = max(1, int(max_in_flight))
+
+    def check_health(self):
+        """
+        Cek apakah server bisa dihubungi
+
+        Raises:
+            Exception: Jika server tidak merespon
+        """
+        try:
+            with urllib.request.urlopen(f"{self.server_url}/health", timeout=5) as response:
+                json.loads(response.read())
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise Exception(f"❌ Server analisis tidak dapat dihubungi ({self.server_url}): {e}")
+
+    def predict(self, image_path):
+        """
+        Kirim satu image ke server
+
+        Args:
+            image_path (str): Path ke image
+
+        Returns:
+            tuple: (yolo_results, posture_results)
+        """
+        with open(image_path, 'rb') as f:
+            image_bytes = f.read()
+
+        params = {
+            'height_mm': self.height_mm,
+            'filename': os.path.basename(image_path),
+            'refine': int(bool(self.refine_keypoints))
+        }
+        if self.confidence is not None:
+            params['confidence'] = self.confidence
+        query = urllib.parse.urlencode(params)
+        request = urllib.request.Request(
+            f"{self.server_url}/analyze?{query}",
+            data=image_bytes,
+            headers={'Content-Type': 'image/octet-stream'}
+        )
+
+        start_ns = time.perf_counter_ns()
+        for attempt in range(REMOTE_MAX_RETRIES + 1):
+            try:
+                with span('remote_inference'):
+                    with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                        payload = json.loads(response.read())
+                break
+            except urllib.error.HTTPError as e:
+                # 503 = server sibuk (backpressure), coba lagi sesuai Retry-After
+                if e.code == 503 and attempt < REMOTE_MAX_RETRIES:
+                    time.sleep(float(e.headers.get('Retry-After', 1)))
+                    continue
+                raise Exception(f"❌ Server error ({e.code}): {e.read().decode('utf-8', 'replace')}")
+            except (urllib.error.URLError, OSError) as e:
+                raise Exception(f"❌ Server analisis tidak dapat dihubungi: {e}")
+
+        yolo_results = {
+            'detections': payload['detections'],
+            'elapsed_time': (time.perf_counter_ns() - start_ns) / 1e9,
+            'image_path': image_path
+        }
+        return yolo_results, payload['posture_results']
+
+    def predict_many(self, image_paths):
+        """
+        Kirim banyak image secara paralel (server menggabungkannya menjadi batch)
+
+        Args:
+            image_paths (list): List path image
+
+        Returns:
+            list: List of (yolo_results, posture_results), urutan sama
+        """
+        if len(image_paths) <= 1 or self.max_in_flight == 1:
+            return [self.predict(p) for p in image_paths]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(image_paths))) as executor:
+            return list(executor.map(self.predict, image_paths))
@@ -0,0 +1,156 @@
+"""
+Report Templates - Template report text yang di-compile sekali dan di-render lazily
+"""
+from config.config import KEYPOINT_NAMES, KEYPOINT_EMOJIS, get_confidence_level
+from src.utils.profiling import timed
+
+SEPARATOR = "=" * 60
+MIN_KEYPOINT_CONFIDENCE = 0.05
+
+HEADER = "\n".join([SEPARATOR, "📊 DETEKSI DAN KLASIFIKASI POSTURAL", SEPARATOR, ""])
+
+DETECTION_TEMPLATE = "\n".join([
+    "{emoji} Deteksi {index}:",
+    "   🦴 Kelas: {cls}",
+    "   🏷️  Klasifikasi: {classification}",
+    "   📌 Sub-kategori: {subcategory}",
+    "   🎯 Jenis Analisis: {analysis_type}",
+    "   🎯 Confidence: {confidence:.4f} ({confidence_pct:.1f}%)",
+    "   📊 Klasifikasi Confidence: {confidence_level}",
+    "   📍 Bounding Box: [{x1:.1f}, {y1:.1f}, {x2:.1f}, {y2:.1f}]",
+    "   📏 Lebar: {width:.1f}px",
+    "   📐 Tinggi: {height:.1f}px",
+    "   🎯 Center: ({cx:.1f}, {cy:.1f})",
+    "   📊 Area: {area:.1f}px²",
+    "",
+]).format
+
+# Satu formatter per keypoint (emoji dan nama sudah di-bake ke template)
+KEYPOINT_FORMATTERS = [
+    f"     {KEYPOINT_EMOJIS.get(name, '🔸')} {name}: ({{:.1f}}, {{:.1f}}) - Confidence: {{:.2f}} ({{}})".format
+    for name in KEYPOINT_NAMES
+]
+
+CLASSIFICATION_TEMPLATE = "   {emoji} {classification}: {count} deteksi ({percentage:.1f}%)".format
+
+IMBALANCE_TEMPLATES = [
+    ('shoulder', "   👤 Shoulder Imbalance: {:.1f} mm".format),
+    ('hip', "   🏋️  Hip Imbalance: {:.1f} mm".format),
+    ('spine', "   🦴 Spine Deviation: {:.1f} mm".format),
+    ('head_shift', "   📏 Head Shift: {:.1f} mm".format),
+    ('head_tilt', "   📐 Head Tilt: {:.1f}°".format),
+]
+
+SCALE_METHOD_LABELS = {
+    'marker': 'marker kalibrasi',
+    'keypoints_head_ankle': 'kepala-ankle',
+    'keypoints_shoulder_ankle': 'bahu-ankle',
+    'bbox': 'tinggi bbox',
+}
+
+
+def _render_keypoints(keypoints):
+    """Baris keypoint untuk satu deteksi (tanpa reshape, langsung dari list flat)"""
+    if len(keypoints) % 3 != 0:
+        return []
+
+    return [
+        formatter(x, y, conf, get_confidence_level(conf))
+        for formatter, x, y, conf in zip(KEYPOINT_FORMATTERS, keypoints[0::3], keypoints[1::3], keypoints[2::3])
+        if conf > MIN_KEYPOINT_CONFIDENCE
+    ]
+
+
+@timed('generate_report_text')
+def render_report_text(results):
+    """
+    Render report text dari hasil PostureAnalyzer
+
+    Args:
+        results (dict): Hasil analisis (success)
+
+    Returns:
+        str: Report text
+    """
+    report = [HEADER]
+
+    for det in results['detections']:
+        x1, y1, x2, y2 = det['bbox']
+        report.append(DETECTION_TEMPLATE(
+            emoji="🔸" if det['index'] % 2 == 1 else "🔹",
+            index=det['index'],
+            cls=det['class'],
+            classification=det['classification'],
+            subcategory=det['subcategory'],
+            analysis_type=det['analysis_type'],
+            confidence=det['confidence'],
+            confidence_pct=det['confidence'] * 100,
+            confidence_level=det['confidence_level'],
+            x1=x1, y1=y1, x2=x2, y2=y2,
+            width=det['width'],
+            height=det['height'],
+            cx=det['center'][0],
+            cy=det['center'][1],
+            area=det['area']
+        ))
+
+        if det['keypoints']:
+            report.append("  🔹 KEYPOINT DETECTION:")
+            report.extend(_render_keypoints(det['keypoints']))
+            report.append("")
+
+    report.append(f"TOTAL DETEKSI: {results['total_detections']} objek/keypoint")
+    report.append(SEPARATOR)
+    report.append("")
+
+    report.append("📊 STATISTIK KLASIFIKASI:")
+    for classification, count in results['classifications'].items():
+        report.append(CLASSIFICATION_TEMPLATE(
+            emoji="🦴" if classification != 'Normal' else "✅",
+            classification=classification,
+            count=count,
+            percentage=(count / results['total_detections']) * 100
+        ))
+    report.append("")
+
+    imbalance = results['imbalance']
+    if imbalance:
+        report.append("📊 ANALISIS POSTUR BERDASARKAN KEYPOINT")
+        report.append("=" * 50)
+        report.append(f"📋 Jenis Analisis: {results['analysis_type']}")
+        report.append("")
+        report.extend(template(imbalance[key]) for key, template in IMBALANCE_TEMPLATES if key in imbalance)
+        report.append(f"   🏆 Overall Score: {results['score']:.1f}/100")
+
+        scale = results.get('scale')
+        if scale:
+            report.append(f"   📏 Skala: {scale['mm_per_px']:.3f} mm/px ({SCALE_METHOD_LABELS.get(scale['method'], scale['method'])})")
+        if results.get('outliers'):
+            report.append(f"   ⚠️  Di luar batas wajar (cek foto/keypoint): {', '.join(results['outliers'])}")
+        report.append("")
+
+    return "\n".join(report)
+
+
+def get_report_text(result):
+    """
+    Report text untuk satu hasil, di-render saat pertama dibutuhkan lalu di-memoize
+
+    Hasil batch yang tidak pernah ditampilkan/di-export tidak membayar biaya
+    rendering sama sekali.
+
+    Args:
+        result (dict): Hasil analisis (dengan posture_results)
+
+    Returns:
+        str: Report text
+    """
+    report_text = result.get('report_text')
+    if report_text is None:
+        posture_results = result['posture_results']
+        if posture_results.get('success', True):
+            report_text = render_report_text(posture_results)
+        else:
+            report_text = f"⚠️ {posture_results.get('message', 'Tidak ada deteksi')}"
+        result['report_text'] = report_text
+    return report_text
@@ -0,0 +1,161 @@
+"""
+Scale Estimator - Estimasi skala mm per pixel dari keypoints atau marker kalibrasi
+"""
+import cv2
+import numpy as np
+from config.config import SCALE_MIN_KEYPOINT_CONF, CALIBRATION_MARKER_SIZE_MM, CALIBRATION_MARKER_DICT
+
+# Tinggi landmark sebagai fraksi tinggi badan (antropometri Drillis & Contini)
+HEAD_LANDMARKS = {0: 0.915, 3: 0.925, 4: 0.925}  # nose, left_ear, right_ear
+SHOULDER_LANDMARKS = {5: 0.818, 6: 0.818}  # left/right shoulder (acromion)
+ANKLE_LANDMARKS = (15, 16)
+ANKLE_FRACTION = 0.039
+
+# Panjang badan (pixel) minimum relatif terhadap tinggi bbox agar estimasi dipercaya
+MIN_BODY_LENGTH_RATIO = 0.4
+
+METHOD_MARKER = 'marker'
+METHOD_HEAD_ANKLE = 'keypoints_head_ankle'
+METHOD_SHOULDER_ANKLE = 'keypoints_shoulder_ankle'
+METHOD_BBOX = 'bbox'
+
+
+def _landmark_scale(kp, landmarks, ankle_y, ankle_ok, height_mm, min_conf):
+    """
+    Skala dari sekumpulan landmark atas ke ankle (vectorized untuk N deteksi)
+
+    Returns:
+        tuple: (scale (N,), body_length_px (N,), valid (N,))
+    """
+    indices = list(landmarks)
+    fractions = np.array([landmarks[i] for i in indices])
+
+    top_y = kp[:, indices, 1]
+    top_ok = (kp[:, indices, 2] >= min_conf) & ankle_ok[:, None]
+    length_px = ankle_y[:, None] - top_y
+
+    # Estimasi per landmark, lalu dirata-rata landmark yang valid
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_landmark = (fractions - ANKLE_FRACTION) * height_mm / length_px
+    top_ok &= length_px > 0
+
+    count = top_ok.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(top_ok, per_landmark, 0).sum(axis=1) / count
+        length = np.where(top_ok, length_px, 0).sum(axis=1) / count
+
+    return scale, length, count > 0
+
+
+def estimate_scales(keypoints, bboxes, height_mm, min_conf=SCALE_MIN_KEYPOINT_CONF):
+    """
+    Estimasi mm per pixel untuk banyak deteksi sekaligus
+
+    Urutan prioritas: kepala (nose/ears) -> ankle, bahu -> ankle, lalu tinggi
+    bbox sebagai fallback (mis. kaki terpotong di foto).
+
+    Args:
+        keypoints (array-like): Keypoints (N, 17, 3)
+        bboxes (array-like): Bounding box (N, 4) [x1, y1, x2, y2]
+        height_mm (float): Tinggi badan dalam mm (atau array (N,) per deteksi)
+        min_conf (float): Confidence minimum keypoint
+
+    Returns:
+        tuple: (mm_per_px (N,), methods (list of str))
+    """
+    kp = np.asarray(keypoints, dtype=float).reshape(-1, 17, 3)
+    boxes = np.asarray(bboxes, dtype=float).reshape(-1, 4)
+    height_mm = np.broadcast_to(np.asarray(height_mm, dtype=float), (len(kp),))
+    bbox_height = np.maximum(boxes[:, 3] - boxes[:, 1], 1.0)
+
+    ankle_conf = kp[:, ANKLE_LANDMARKS, 2]
+    ankle_mask = ankle_conf >= min_conf
+    ankle_ok = ankle_mask.any(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ankle_y = np.where(ankle_mask, kp[:, ANKLE_LANDMARKS, 1], 0).sum(axis=1) / ankle_mask.sum(axis=1)
+
+    head_scale, head_len, head_ok = _landmark_scale(kp, HEAD_LANDMARKS, ankle_y, ankle_ok, height_mm[:, None], min_conf)
+    shoulder_scale, shoulder_len, shoulder_ok = _landmark_scale(
+        kp, SHOULDER_LANDMARKS, ankle_y, ankle_ok, height_mm[:, None], min_conf
+    )
+
+    # Panjang badan terlalu pendek dibanding bbox = keypoint tidak konsisten
+    head_ok &= head_len >= MIN_BODY_LENGTH_RATIO * bbox_height
+    shoulder_ok &= shoulder_len >= MIN_BODY_LENGTH_RATIO * bbox_height
+
+    bbox_scale = height_mm / bbox_height
+    scales = np.where(head_ok, head_scale, np.where(shoulder_ok, shoulder_scale, bbox_scale))
+    methods = np.where(head_ok, METHOD_HEAD_ANKLE, np.where(shoulder_ok, METHOD_SHOULDER_ANKLE, METHOD_BBOX))
+
+    return scales, methods.tolist()
+
+
+class MarkerScaleDetector:
+    """Deteksi marker ArUco berukuran diketahui untuk kalibrasi skala per frame"""
+
+    def __init__(self, marker_size_mm=CALIBRATION_MARKER_SIZE_MM, dictionary=CALIBRATION_MARKER_DICT):
+        """
+        Initialize Marker Scale Detector
+
+        Args:
+            marker_size_mm (float): Panjang sisi marker (mm)
+            dictionary (str): Nama dictionary ArUco, mis. DICT_4X4_50
+        """
+        if not hasattr(cv2, 'aruco'):
+            raise Exception("❌ OpenCV tanpa modul aruco, kalibrasi marker tidak tersedia")
+
+        self.marker_size_mm = marker_size_mm
+        aruco_dict = cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, dictionary))
+        self.detector = cv2.aruco.ArucoDetector(aruco_dict, cv2.aruco.DetectorParameters())
+
+    def detect(self, image, pixel_scale=1.0):
+        """
+        Hitung mm per pixel dari marker di image
+
+        Args:
+            image (numpy.ndarray): Image (grayscale atau BGR)
+            pixel_scale (float): Faktor pixel image ini terhadap image asli
+                (2.0 jika image di-decode setengah resolusi)
+
+        Returns:
+            float: mm per pixel (image asli) atau None jika marker tidak ditemukan
+        """
+        corners, ids, _ = self.detector.detectMarkers(image)
+        if ids is None or len(corners) == 0:
+            return None
+
+        # Rata-rata panjang sisi semua marker yang terdeteksi
+        quads = np.concatenate([c.reshape(-1, 4, 2) for c in corners])
+        sides = np.linalg.norm(quads - np.roll(quads, 1, axis=1), axis=2)
+        side_px = sides.mean() * pixel_scale
+        if side_px <= 0:
+            return None
+
+        return float(self.marker_size_mm / side_px)
+
+    def detect_file(self, image_path):
+        """
+        Hitung mm per pixel dari file image (decode grayscale setengah resolusi)
+
+        Args:
+            image_path (str): Path ke image
+
+        Returns:
+            float: mm per pixel atau None
+        """
+        image = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_2)
+        if image is None:
+            return None
+        return self.detect(image, pixel_scale=2.0)
+
+
+def get_marker_detector():
+    """
+    Marker detector sesuai config (None jika kalibrasi marker tidak diaktifkan)
+
+    Returns:
+        MarkerScaleDetector: Detector atau None
+    """
+    if not CALIBRATION_MARKER_SIZE_MM:
+        return None
+    return MarkerScaleDetector(CALIBRATION_MARKER_SIZE_MM, CALIBRATION_MARKER_DICT)
@@ -0,0 +1,172 @@
+"""
+Analysis Scheduler - Antrian prioritas untuk pemakaian pipeline (model warm) bersama
+
+Semua pemanggilan pipeline (inference dan render) dijalankan satu per satu
+di satu worker thread. Task interactive (satu foto yang ditunggu klinisi)
+selalu diambil sebelum task batch berikutnya, sehingga batch besar hanya
+menunda foto interactive paling lama satu chunk.
+"""
+import heapq
+import itertools
+import threading
+import time
+from src.utils.profiling import StageStats, profiler
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_BATCH: 'batch',
+}
+
+
+class ScheduledTask:
+    """Satu pemanggilan yang menunggu giliran di scheduler"""
+
+    def __init__(self, func, args, kwargs, priority):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.submitted_ns = time.perf_counter_ns()
+        self.result = None
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Tunggu task selesai
+
+        Args:
+            timeout (float): Maksimum waktu tunggu (None = tanpa batas)
+
+        Returns:
+            object: Hasil pemanggilan (exception dari task di-raise ulang)
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("Task scheduler belum selesai")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class AnalysisScheduler:
+    """
+    Scheduler in-process dengan kelas prioritas.
+
+    Task dengan prioritas lebih kecil dijalankan lebih dulu, FIFO di dalam
+    prioritas yang sama. Task yang sedang berjalan tidak diinterupsi;
+    preemption terjadi di antara task (mis. antar chunk batch). Waktu tunggu
+    di antrian dicatat per prioritas (juga ke profiler sebagai
+    scheduler_wait.<prioritas>).
+    """
+
+    def __init__(self, name='analysis-scheduler'):
+        """
+        Initialize dan start worker thread
+
+        Args:
+            name (str): Nama worker thread
+        """
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.wait_stats = {label: StageStats(f"scheduler_wait.{label}") for label in PRIORITY_NAMES.values()}
+
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, priority=PRIORITY_BATCH, **kwargs):
+        """
+        Masukkan pemanggilan ke antrian
+
+        Args:
+            func (callable): Fungsi yang dipanggil di worker thread
+            *args: Argumen fungsi
+            priority (int): PRIORITY_INTERACTIVE atau PRIORITY_BATCH
+            **kwargs: Keyword argumen fungsi
+
+        Returns:
+            ScheduledTask: Task (panggil wait() untuk hasilnya)
+        """
+        task = ScheduledTask(func, args, kwargs, priority)
+        with self._condition:
+            if self._closed:
+                raise Exception("❌ Scheduler analisis sudah ditutup")
+            heapq.heappush(self._queue, (priority, next(self._sequence), task))
+            self._condition.notify()
+        return task
+
+    def run(self, func, *args, priority=PRIORITY_BATCH, **kwargs):
+        """Submit lalu tunggu hasilnya (blocking)"""
+        return self.submit(func, *args, priority=priority, **kwargs).wait()
+
+    def pending(self):
+        """
+        Jumlah task di antrian per prioritas
+
+        Returns:
+            dict: Nama prioritas -> jumlah task
+        """
+        with self._condition:
+            counts = {label: 0 for label in PRIORITY_NAMES.values()}
+            for priority, _, _ in self._queue:
+                label = PRIORITY_NAMES.get(priority, str(priority))
+                counts[label] = counts.get(label, 0) + 1
+            return counts
+
+    def stats(self):
+        """
+        Statistik waktu tunggu di antrian per prioritas
+
+        Returns:
+            list: List dictionary statistik (count, mean_ms, p50_ms, p95_ms, ...)
+        """
+        with self._condition:
+            return [stats.to_dict() for stats in self.wait_stats.values()]
+
+    def _loop(self):
+        """Worker thread: ambil task prioritas tertinggi, jalankan, ulangi"""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                _, _, task = heapq.heappop(self._queue)
+
+                started_ns = time.perf_counter_ns()
+                wait_ns = started_ns - task.submitted_ns
+                label = PRIORITY_NAMES.get(task.priority, str(task.priority))
+                stats = self.wait_stats.get(label)
+                if stats is None:
+                    stats = self.wait_stats[label] = StageStats(f"scheduler_wait.{label}")
+                stats.add(wait_ns)
+
+            profiler.record(f"scheduler_wait.{label}", task.submitted_ns, wait_ns)
+
+            try:
+                task.result = task.func(*task.args, **task.kwargs)
+            except Exception as e:
+                task.error = e
+            finally:
+                task._done.set()
+
+    def close(self, timeout=None):
+        """
+        Tolak task baru, selesaikan antrian yang tersisa, lalu stop worker
+
+        Args:
+            timeout (float): Maksimum waktu menunggu worker selesai
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
@@ -0,0 +1,243 @@
+"""
+Scoring Rules - Aturan scoring deklaratif (config/scoring_rules.json) yang
+di-compile sekali menjadi lookup table NumPy
+"""
+import json
+import numpy as np
+from config.config import *
+
+COLOR_NAMES = {
+    'primary': PRIMARY_COLOR,
+    'secondary': SECONDARY_COLOR,
+    'success': SUCCESS_COLOR,
+    'warning': WARNING_COLOR,
+    'danger': DANGER_COLOR,
+}
+
+
+class ScoringRules:
+    """
+    Aturan scoring yang sudah di-compile.
+
+    Setiap komponen punya score kontinu (100 - nilai * points_per_unit,
+    minimal 0) untuk overall score, dan level diskrit (Normal/Ringan/...)
+    dari threshold lewat np.digitize. Semua threshold disimpan dalam satu
+    matrix sehingga satu batch hasil bisa di-score dalam satu call.
+    """
+
+    def __init__(self, rules):
+        """
+        Compile aturan scoring
+
+        Args:
+            rules (dict): Aturan (format config/scoring_rules.json)
+        """
+        components = rules['components']
+        self.components = list(components)
+        self.index = {key: i for i, key in enumerate(self.components)}
+        self.labels = [components[key]['label'] for key in self.components]
+        self.parameters = [components[key]['parameter'] for key in self.components]
+        self.units = [components[key]['unit'] for key in self.components]
+
+        self.points_per_unit = np.array([components[key]['points_per_unit'] for key in self.components], dtype=float)
+
+        self.level_labels = list(rules['levels']['labels'])
+        self.level_scores = list(rules['levels']['scores'])
+        self.level_colors = [COLOR_NAMES.get(name, name) for name in rules['levels']['colors']]
+        self.level_thresholds = np.array(
+            [components[key]['level_thresholds'] for key in self.components], dtype=float
+        )
+        if not len(self.level_labels) == len(self.level_scores) == len(self.level_colors) == self.level_thresholds.shape[1] + 1:
+            raise Exception("❌ Jumlah label/score/warna level harus satu lebih dari jumlah level_thresholds")
+        if np.any(np.diff(self.level_thresholds, axis=1) <= 0):
+            raise Exception("❌ level_thresholds harus naik (ascending)")
+
+        overall = rules['overall']
+        self.overall_thresholds = np.array(overall['thresholds'], dtype=float)
+        self.overall_labels = list(overall['labels'])
+        self.overall_colors = [COLOR_NAMES.get(name, name) for name in overall['colors']]
+        self.recommendations = list(overall['recommendations'])
+        if not len(self.overall_labels) == len(self.overall_colors) == len(self.recommendations) == len(self.overall_thresholds) + 1:
+            raise Exception("❌ Jumlah label/warna/rekomendasi overall harus satu lebih dari jumlah threshold")
+
+    @classmethod
+    def from_file(cls, path=SCORING_RULES_PATH):
+        """
+        Load dan compile aturan dari file JSON
+
+        Args:
+            path (str): Path file aturan
+
+        Returns:
+            ScoringRules: Aturan yang sudah di-compile
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def value_matrix(self, imbalances):
+        """
+        Susun imbalance banyak hasil menjadi matrix (N, komponen), NaN = tidak diukur
+
+        Args:
+            imbalances (list): List dict imbalance
+
+        Returns:
+            numpy.ndarray: Matrix nilai
+        """
+        values = np.full((len(imbalances), len(self.components)), np.nan)
+        for row, imbalance in enumerate(imbalances):
+            for key, value in imbalance.items():
+                col = self.index.get(key)
+                if col is not None:
+                    values[row, col] = value
+        return values
+
+    def score_batch(self, imbalances):
+        """
+        Overall score untuk banyak hasil sekaligus
+
+        Args:
+            imbalances (list): List dict imbalance
+
+        Returns:
+            numpy.ndarray: Score 0-100 per hasil (0 jika tidak ada komponen)
+        """
+        # Komponen yang tidak dikenal ikut dihitung sebagai score 0
+        unknown = np.array([
+            sum(1 for key in imbalance if key not in self.index) for imbalance in imbalances
+        ], dtype=int).reshape(-1)
+        return self.score_values(self.value_matrix(imbalances), unknown)
+
+    def score_values(self, values, extra_counts=0):
+        """
+        Overall score dari matrix nilai (N, komponen) langsung
+
+        Args:
+            values (numpy.ndarray): Matrix nilai, NaN = tidak diukur
+            extra_counts (array-like): Komponen tambahan bernilai 0 per baris
+
+        Returns:
+            numpy.ndarray: Score 0-100 per baris (0 jika tidak ada komponen)
+        """
+        values = np.asarray(values, dtype=float)
+        measured = ~np.isnan(values)
+        component_scores = np.maximum(0.0, 100.0 - values * self.points_per_unit)
+        counts = measured.sum(axis=1) + extra_counts
+
+        totals = np.where(measured, component_scores, 0.0).sum(axis=1)
+        return np.divide(totals, counts, out=np.zeros(len(values)), where=counts > 0)
+
+    def score(self, imbalance):
+        """
+        Overall score untuk satu hasil
+
+        Args:
+            imbalance (dict): Dictionary imbalance
+
+        Returns:
+            float: Score 0-100
+        """
+        if not imbalance:
+            return 0
+        return float(self.score_batch([imbalance])[0])
+
+    def levels(self, component, values):
+        """
+        Index level (0 = Normal) untuk nilai satu komponen (vectorized)
+
+        Args:
+            component (str): Nama komponen
+            values (array-like): Nilai pengukuran
+
+        Returns:
+            numpy.ndarray: Index level
+        """
+        return np.digitize(values, self.level_thresholds[self.index[component]])
+
+    def status(self, component, value):
+        """Label level komponen (Unknown jika komponen tidak dikenal)"""
+        if component not in self.index:
+            return 'Unknown'
+        return self.level_labels[int(self.levels(component, value))]
+
+    def component_score(self, component, value):
+        """Score level komponen sebagai string 'xx/100'"""
+        if component not in self.index:
+            return "0/100"
+        return f"{self.level_scores[int(self.levels(component, value))]}/100"
+
+    def overall_levels(self, scores):
+        """
+        Index level overall untuk banyak score (vectorized)
+
+        Args:
+            scores (array-like): Overall score
+
+        Returns:
+            numpy.ndarray: Index level (0 = Critical)
+        """
+        return np.digitize(scores, self.overall_thresholds)
+
+    def overall_status(self, score):
+        """Label overall (Excellent/Good/...)"""
+        return self.overall_labels[int(self.overall_levels(score))]
+
+    def overall_statuses(self, scores):
+        """Label overall untuk banyak score sekaligus"""
+        return [self.overall_labels[i] for i in self.overall_levels(scores).tolist()]
+
+    def overall_color(self, score):
+        """Warna hex untuk overall score"""
+        return self.overall_colors[int(self.overall_levels(score))]
+
+    def recommendation(self, score):
+        """Rekomendasi untuk overall score"""
+        return self.recommendations[int(self.overall_levels(score))]
+
+    def component_rows(self, imbalance):
+        """
+        Baris tabel per komponen (dipakai tabel GUI, CSV dan report)
+
+        Args:
+            imbalance (dict): Dictionary imbalance
+
+        Returns:
+            list: List dict (key, label, parameter, value, unit, status, color, score)
+        """
+        present = [key for key in self.components if key in imbalance]
+        if not present:
+            return []
+
+        cols = [self.index[key] for key in present]
+        values = np.array([imbalance[key] for key in present], dtype=float)
+        levels = (values[:, None] >= self.level_thresholds[cols]).sum(axis=1)
+
+        return [
+            {
+                'key': key,
+                'label': self.labels[col],
+                'parameter': self.parameters[col],
+                'value': imbalance[key],
+                'unit': self.units[col],
+                'status': self.level_labels[level],
+                'color': self.level_colors[level],
+                'score': f"{self.level_scores[level]}/100"
+            }
+            for key, col, level in zip(present, cols, levels.tolist())
+        ]
+
+
+_rules = None
+
+
+def get_scoring_rules():
+    """
+    Aturan scoring bersama (di-load dan di-compile sekali per proses)
+
+    Returns:
+        ScoringRules: Aturan scoring
+    """
+    global _rules
+    if _rules is None:
+        _rules = ScoringRules.from_file(SCORING_RULES_PATH)
+    return _rules
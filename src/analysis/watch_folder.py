@@ -0,0 +1,348 @@
+"""
+Watch Folder - Ingestion otomatis foto baru dari folder kamera
+"""
+import hashlib
+import os
+import threading
+import time
+from config.config import *
+from src.utils.export_utils import export_to_csv
+from src.utils.image_export import encode_params, write_image
+from src.utils.image_utils import load_image
+from src.utils.profiling import span
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+if WATCHDOG_AVAILABLE:
+    class _WatchdogHandler(FileSystemEventHandler):
+        """Teruskan event file (inotify/FSEvents/ReadDirectoryChangesW) ke WatchFolder"""
+
+        def __init__(self, watcher):
+            super().__init__()
+            self.watcher = watcher
+
+        def on_created(self, event):
+            if not event.is_directory:
+                self.watcher.notify(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                self.watcher.notify(event.src_path)
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                self.watcher.notify(event.dest_path)
+
+
+class WatchFolder:
+    """
+    Pantau folder, tunggu file selesai ditulis (debounce), lalu analisis
+    file baru secara batch dengan pipeline yang model-nya sudah warm.
+
+    Foto di subfolder (mis. watch_dir/Budi/foto.jpg) memakai nama subfolder
+    sebagai nama pasien; foto di root folder memakai `patient` default.
+    """
+
+    def __init__(self, watch_dir, pipeline, patient, height_mm, output_dir=EXPORTS_DIR, db=None,
+                 settle_seconds=WATCH_SETTLE_SECONDS, poll_interval=WATCH_POLL_INTERVAL,
+                 batch_size=WATCH_BATCH_SIZE, process_existing=False, save_annotated=True,
+                 model_path=None, confidence=None, on_processed=None):
+        """
+        Initialize Watch Folder
+
+        Args:
+            watch_dir (str): Folder yang dipantau (rekursif)
+            pipeline (AnalysisPipeline): Pipeline dengan model yang sudah di-load
+            patient (str): Nama pasien default
+            height_mm (float): Tinggi badan dalam mm
+            output_dir (str): Folder output CSV dan image annotasi
+            db (ResultsDatabase): Database riwayat (None = tidak disimpan)
+            settle_seconds (float): Lama ukuran/mtime harus stabil sebelum diproses
+            poll_interval (float): Interval scan / cek debounce (detik)
+            batch_size (int): Maksimum image per batch
+            process_existing (bool): Proses juga file yang sudah ada saat start
+            save_annotated (bool): Simpan image annotasi ke output_dir
+            model_path (str): Path model (dicatat di database)
+            confidence (float): Confidence threshold (dicatat di database)
+            on_processed (callable): Callback(patient, session_id, results) per pasien per burst
+        """
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.pipeline = pipeline
+        self.patient = patient
+        self.height_mm = height_mm
+        self.output_dir = output_dir
+        self.db = db
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.batch_size = max(1, int(batch_size))
+        self.save_annotated = save_annotated
+        self.model_path = model_path
+        self.confidence = confidence
+        self.on_processed = on_processed
+
+        # path -> ((size, mtime_ns), waktu sejak signature stabil) atau None
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._observer = None
+
+        # Ledger file yang sudah diproses, agar restart tidak menganalisis ulang
+        dir_hash = hashlib.sha1(self.watch_dir.encode('utf-8')).hexdigest()[:12]
+        self.ledger_path = os.path.join(DATA_DIR, f"watch_{dir_hash}.log")
+        self._processed = self._load_ledger()
+
+        if not process_existing:
+            for path in self._scan():
+                self._processed.add(self._file_key(path))
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def _load_ledger(self):
+        """Load key file yang sudah diproses"""
+        if not os.path.exists(self.ledger_path):
+            return set()
+        with open(self.ledger_path, 'r', encoding='utf-8') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+
+    def _append_ledger(self, keys):
+        """Catat key file yang selesai diproses"""
+        with open(self.ledger_path, 'a', encoding='utf-8') as f:
+            for key in keys:
+                f.write(key + '\n')
+        self._processed.update(keys)
+
+    @staticmethod
+    def _file_key(path):
+        """Key unik file: path + ukuran + mtime (file ditimpa = file baru)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return path
+        return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    @staticmethod
+    def _is_image(path):
+        """Cek ekstensi image (file temporary kamera diabaikan)"""
+        name = os.path.basename(path)
+        return not name.startswith('.') and name.lower().endswith(WATCH_IMAGE_EXTENSIONS)
+
+    def _scan(self):
+        """Scan rekursif semua image di watch_dir"""
+        paths = []
+        stack = [self.watch_dir]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif self._is_image(entry.path):
+                    paths.append(entry.path)
+        return paths
+
+    def notify(self, path):
+        """
+        Tandai file sebagai kandidat (dipanggil oleh event watcher atau scan)
+
+        Args:
+            path (str): Path file
+        """
+        if not self._is_image(path):
+            return
+        with self._pending_lock:
+            # Reset debounce setiap ada event baru
+            self._pending[os.path.abspath(path)] = None
+
+    def _collect_ready(self):
+        """
+        Ambil file yang sudah stabil (selesai ditulis)
+
+        Returns:
+            list: Path file yang siap dianalisis
+        """
+        now = time.monotonic()
+        ready = []
+
+        with self._pending_lock:
+            for path, state in list(self._pending.items()):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # File dihapus/di-rename sebelum selesai
+                    del self._pending[path]
+                    continue
+
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if state is None or state[0] != signature or stat.st_size == 0:
+                    self._pending[path] = (signature, now)
+                    continue
+
+                if now - state[1] >= self.settle_seconds and self._is_complete(path):
+                    del self._pending[path]
+                    if self._file_key(path) not in self._processed:
+                        ready.append(path)
+
+        return sorted(ready)
+
+    @staticmethod
+    def _is_complete(path):
+        """JPEG dianggap lengkap jika diakhiri marker EOI (FF D9)"""
+        if not path.lower().endswith(('.jpg', '.jpeg')):
+            return True
+        try:
+            with open(path, 'rb') as f:
+                f.seek(-2, os.SEEK_END)
+                return f.read(2) == b'\xff\xd9'
+        except OSError:
+            return False
+
+    def _patient_for(self, path):
+        """Nama pasien dari subfolder pertama, atau default"""
+        relative = os.path.relpath(path, self.watch_dir)
+        parts = relative.split(os.sep)
+        return parts[0] if len(parts) > 1 else self.patient
+
+    def process_burst(self, paths):
+        """
+        Analisis satu burst file (semua file yang siap pada satu scan) dan tulis hasil
+
+        Inference berjalan per batch_size; CSV dan image annotasi ditulis per
+        batch, lalu satu sesi database per pasien disimpan setelah semua batch
+        selesai. Batch yang gagal diulang per file tanpa menyimpan sesi ganda.
+
+        Args:
+            paths (list): List path image
+
+        Returns:
+            list: Hasil compact (file yang gagal tidak termasuk)
+        """
+        keys = [self._file_key(p) for p in paths]
+
+        results = []
+        for i in range(0, len(paths), self.batch_size):
+            batch = paths[i:i + self.batch_size]
+            try:
+                results.extend(self.process_batch(batch))
+            except Exception as e:
+                print(f"❌ Error saat analisis batch: {e}")
+                results.extend(self._process_individually(batch))
+
+        by_patient = {}
+        for result in results:
+            by_patient.setdefault(self._patient_for(result['image_path']), []).append(result)
+
+        for patient, patient_results in by_patient.items():
+            session_id = None
+            if self.db is not None:
+                session_id = self.db.save_session(
+                    patient,
+                    self.height_mm,
+                    patient_results,
+                    model_path=self.model_path,
+                    confidence=self.confidence
+                )
+
+            if self.on_processed:
+                self.on_processed(patient, session_id, patient_results)
+
+        # File yang gagal juga dicatat agar file rusak tidak diulang terus-menerus
+        self._append_ledger(keys)
+        return results
+
+    def process_batch(self, paths):
+        """
+        Analisis satu batch file dan tulis CSV / image annotasi (tanpa database)
+
+        Args:
+            paths (list): List path image
+
+        Returns:
+            list: Hasil compact
+        """
+        with span('watch_batch', batch_size=len(paths)):
+            results = self.pipeline.analyze_batch(paths)
+
+        for result in results:
+            self._export_result(self._patient_for(result['image_path']), result)
+        return results
+
+    def _export_result(self, patient, result):
+        """Tulis CSV dan image annotasi untuk satu hasil"""
+        stem = os.path.splitext(os.path.basename(result['image_path']))[0]
+        posture_results = result['posture_results']
+
+        if posture_results.get('success', True):
+            export_to_csv(posture_results, f"{patient}_{stem}", self.output_dir)
+
+        if self.save_annotated:
+            original_img = load_image(result['image_path'])
+            annotated_img = self.pipeline.yolo_analyzer.annotate_image(
+                original_img, result['yolo_results']['detections']
+            )
+            extension, params = encode_params(IMAGE_EXPORT_FORMAT, IMAGE_EXPORT_QUALITY)
+            write_image(os.path.join(self.output_dir, f"{patient}_{stem}_annotated{extension}"), annotated_img, params)
+
+    def _process_individually(self, paths):
+        """Fallback per file agar satu file rusak tidak menggagalkan satu batch"""
+        results = []
+        for path in paths:
+            if len(paths) > 1:
+                try:
+                    results.extend(self.process_batch([path]))
+                except Exception as e:
+                    print(f"❌ {os.path.basename(path)}: {e}")
+        return results
+
+    def start_observer(self):
+        """
+        Start event watcher (watchdog) jika tersedia
+
+        Returns:
+            bool: True jika memakai event watcher, False jika polling
+        """
+        if not WATCHDOG_AVAILABLE:
+            return False
+
+        self._observer = Observer()
+        self._observer.schedule(_WatchdogHandler(self), self.watch_dir, recursive=True)
+        self._observer.start()
+        return True
+
+    def run(self):
+        """Loop utama sampai stop() dipanggil (blocking)"""
+        use_events = self.start_observer()
+        mode = "event watcher" if use_events else f"polling setiap {self.poll_interval}s"
+        print(f"👀 Memantau folder {self.watch_dir} ({mode})")
+
+        try:
+            while not self._stopped.is_set():
+                if not use_events:
+                    for path in self._scan():
+                        if path not in self._pending and self._file_key(path) not in self._processed:
+                            self.notify(path)
+
+                ready = self._collect_ready()
+                if ready:
+                    try:
+                        results = self.process_burst(ready)
+                        print(f"✅ {len(results)}/{len(ready)} gambar dianalisis")
+                    except Exception as e:
+                        print(f"❌ Error saat menyimpan hasil: {e}")
+
+                self._stopped.wait(self.poll_interval)
+        finally:
+            if self._observer:
+                self._observer.stop()
+                self._observer.join()
+
+    def stop(self):
+        """Hentikan loop utama"""
+        self._stopped.set()
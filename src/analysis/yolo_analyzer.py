@@ -3,8 +3,9 @@ YOLO Analyzer - Wrapper untuk YOLO model inference
 """
 import cv2
 import numpy as np
-from ultralytics import YOLO
 import time
+from src.utils.profiling import span, timed
+from src.utils.runtime_tuning import apply_torch_threads
 
 
 class YOLOAnalyzer:
@@ -32,9 +33,14 @@ class YOLOAnalyzer:
         Args:
             model_path (str): Path ke model .pt
         """
+        # Import lazy: thin-client mode (annotasi saja) tidak membutuhkan PyTorch
+        from ultralytics import YOLO
+
         try:
             self.model = YOLO(model_path)
             self.model_path = model_path
+            # torch baru ter-import di sini: terapkan thread dari configure_runtime
+            apply_torch_threads()
             print(f"✅ Model loaded: {model_path}")
         except Exception as e:
             raise Exception(f"❌ Error loading model: {str(e)}")
@@ -52,17 +58,18 @@ class YOLOAnalyzer:
         if not self.model:
             raise Exception("❌ Model belum di-load!")
 
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         # Run inference
-        results = self.model.predict(
-            source=image_path,
-            conf=self.confidence,
-            save=False,
-            verbose=False
-        )
+        with span('yolo_inference'):
+            results = self.model.predict(
+                source=image_path,
+                conf=self.confidence,
+                save=False,
+                verbose=False
+            )
 
-        elapsed_time = time.time() - start_time
+        elapsed_time = (time.perf_counter_ns() - start_ns) / 1e9
 
         # Parse results
         detections = self._parse_results(results)
@@ -73,6 +80,41 @@ class YOLOAnalyzer:
             'image_path': image_path
         }
 
+    def predict_batch(self, sources, imgsz=None, conf=None):
+        """
+        Run prediction pada batch image dalam satu model call
+
+        Args:
+            sources (list): List path image atau numpy array (BGR)
+            imgsz (int): Ukuran input model (None = default model)
+            conf (float): Override confidence threshold (None = self.confidence)
+
+        Returns:
+            list: List of detections untuk setiap source (urutan sama)
+        """
+        if not self.model:
+            raise Exception("❌ Model belum di-load!")
+
+        if not sources:
+            return []
+
+        kwargs = {}
+        if imgsz:
+            kwargs['imgsz'] = imgsz
+
+        with span('yolo_inference_batch', batch_size=len(sources)):
+            results = self.model.predict(
+                source=list(sources),
+                conf=self.confidence if conf is None else conf,
+                save=False,
+                verbose=False,
+                **kwargs
+            )
+
+        # Satu result per source
+        return [self._parse_results([result]) for result in results]
+
+    @timed('parse_results')
     def _parse_results(self, results):
         """
         Parse YOLO results
@@ -100,16 +142,15 @@ class YOLOAnalyzer:
 
                 # Extract keypoints if available
                 if keypoints is not None and len(keypoints) > i:
+                    # Flatten ke [x, y, conf, x, y, conf, ...] (17 * 3 nilai)
                     kp_data = keypoints[i].data.cpu().numpy()
-                    if len(kp_data.shape) == 2:
-                        detection['keypoints'] = kp_data[0].tolist()
-                    else:
-                        detection['keypoints'] = kp_data.tolist()
+                    detection['keypoints'] = kp_data.reshape(-1).tolist()
 
                 detections.append(detection)
 
         return detections
 
+    @timed('annotate_image')
     def annotate_image(self, image, detections):
         """
         Annotate image dengan deteksi dan keypoints
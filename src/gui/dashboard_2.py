@@ -6,6 +6,7 @@ from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
 import os
 from config.config import *
+from src.analysis.multi_view import VIEWS, MIN_VIEWS
 
 
 class Dashboard2(tk.Frame):
@@ -20,6 +21,9 @@ class Dashboard2(tk.Frame):
         self.model_path = None
         self.confidence = tk.DoubleVar(value=DEFAULT_CONFIDENCE)
         self.analysis_mode = tk.StringVar(value="single")
+        self.refine_keypoints = tk.BooleanVar(value=KEYPOINT_REFINEMENT)
+        self.deduplicate = tk.BooleanVar(value=DEDUP_ENABLED)
+        self.server_url = tk.StringVar(value=ANALYSIS_SERVER_URL)
 
         self.setup_ui()
 
@@ -111,6 +115,17 @@ class Dashboard2(tk.Frame):
         )
         batch_radio.pack(anchor='w', pady=5)
 
+        multi_view_radio = tk.Radiobutton(
+            parent,
+            text="🧍 Multi-View (Depan/Belakang/Kanan/Kiri)",
+            variable=self.analysis_mode,
+            value="multiview",
+            font=('Arial', 11),
+            bg='white',
+            activebackground='white'
+        )
+        multi_view_radio.pack(anchor='w', pady=5)
+
         # Separator
         ttk.Separator(parent, orient='horizontal').pack(fill='x', pady=20)
 
@@ -184,6 +199,24 @@ class Dashboard2(tk.Frame):
         )
         model_btn.pack()
 
+        # Thin-client: analisis di server, model lokal tidak diperlukan
+        server_frame = tk.Frame(model_section, bg='white')
+        server_frame.pack(pady=(10, 0))
+
+        tk.Label(
+            server_frame,
+            text="🌐 atau Server URL:",
+            font=('Arial', 10),
+            bg='white'
+        ).pack(side='left', padx=(0, 5))
+
+        tk.Entry(
+            server_frame,
+            textvariable=self.server_url,
+            font=('Arial', 10),
+            width=30
+        ).pack(side='left')
+
         # Image upload
         image_section = tk.LabelFrame(
             upload_frame,
@@ -253,6 +286,26 @@ class Dashboard2(tk.Frame):
         )
         conf_scale.pack()
 
+        refine_check = tk.Checkbutton(
+            conf_section,
+            text="🎯 Refine keypoints (person crop, lebih lambat)",
+            variable=self.refine_keypoints,
+            font=('Arial', 10),
+            bg='white',
+            activebackground='white'
+        )
+        refine_check.pack(pady=(10, 0))
+
+        dedup_check = tk.Checkbutton(
+            conf_section,
+            text="🔁 Lewati foto burst yang hampir identik (analisis foto paling tajam)",
+            variable=self.deduplicate,
+            font=('Arial', 10),
+            bg='white',
+            activebackground='white'
+        )
+        dedup_check.pack(pady=(5, 0))
+
         # Analyze button
         analyze_btn = tk.Button(
             upload_frame,
@@ -293,6 +346,18 @@ class Dashboard2(tk.Frame):
                 self.selected_images = [file_path]
                 filename = os.path.basename(file_path)
                 self.image_label.config(text=f"✅ Gambar: {filename}", fg=SUCCESS_COLOR)
+        elif mode == "multiview":
+            file_paths = filedialog.askopenfilenames(
+                title=f"Pilih {MIN_VIEWS}-{len(VIEWS)} Foto View ({'/'.join(VIEWS)})",
+                filetypes=[("Image Files", "*.jpg *.jpeg *.png *.bmp"), ("All Files", "*.*")]
+            )
+            if file_paths:
+                if not MIN_VIEWS <= len(file_paths) <= len(VIEWS):
+                    messagebox.showerror("Error", f"Multi-view membutuhkan {MIN_VIEWS}-{len(VIEWS)} foto satu pasien!")
+                    return
+                self.selected_images = list(file_paths)
+                count = len(file_paths)
+                self.image_label.config(text=f"✅ {count} view dipilih", fg=SUCCESS_COLOR)
         else:
             file_paths = filedialog.askopenfilenames(
                 title="Pilih Gambar (Multiple)",
@@ -306,19 +371,29 @@ class Dashboard2(tk.Frame):
     def analyze_images(self):
         """Start image analysis"""
         # Validation
-        if not self.model_path:
-            messagebox.showerror("Error", "Silakan upload model YOLO terlebih dahulu!")
+        server_url = self.server_url.get().strip()
+        if not self.model_path and not server_url:
+            messagebox.showerror("Error", "Silakan upload model YOLO atau isi Server URL terlebih dahulu!")
             return
 
         if not self.selected_images:
             messagebox.showerror("Error", "Silakan pilih gambar terlebih dahulu!")
             return
 
+        multi_view = self.analysis_mode.get() == "multiview"
+        if multi_view and not MIN_VIEWS <= len(self.selected_images) <= len(VIEWS):
+            messagebox.showerror("Error", f"Multi-view membutuhkan {MIN_VIEWS}-{len(VIEWS)} foto satu pasien!")
+            return
+
         # Set analysis data
         self.app_controller.set_analysis_data(
             model_path=self.model_path,
             image_paths=self.selected_images,
-            confidence=self.confidence.get()
+            confidence=self.confidence.get(),
+            refine_keypoints=self.refine_keypoints.get(),
+            server_url=server_url,
+            multi_view=multi_view,
+            deduplicate=self.deduplicate.get()
         )
 
         # Pindah ke dashboard 3
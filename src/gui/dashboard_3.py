@@ -2,15 +2,33 @@
 Dashboard 3 - Visualization Before/After dengan Analisis
 """
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 from PIL import Image, ImageTk
 import cv2
 import numpy as np
+import os
 import threading
 from config.config import *
-from src.analysis.yolo_analyzer import YOLOAnalyzer
-from src.analysis.posture_analyzer import PostureAnalyzer
-from src.utils.image_utils import load_image, resize_image_for_display, numpy_to_photoimage, create_side_by_side_image
+from src.analysis.pipeline import AnalysisPipeline
+from src.analysis.process_pipeline import ProcessAnalysisPipeline
+from src.analysis.analysis_job import AnalysisJob, make_job_key
+from src.analysis.report_templates import get_report_text
+from src.analysis.multi_view import fuse_views
+from src.analysis.dedup import DuplicateGroups
+from src.analysis.scheduler import AnalysisScheduler, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from src.utils.profiling import span
+from src.utils.shared_memory_transport import detach_frames
+from src.gui.ui_bridge import UIBridge
+
+
+def completed_line(result, from_checkpoint=False):
+    """Satu baris log untuk image yang selesai dianalisis"""
+    name = os.path.basename(result['image_path'])
+    posture_results = result['posture_results']
+    if not posture_results.get('success', True):
+        return f"❌ {name}: {posture_results.get('message', 'Analisis gagal')}"
+    source = " (checkpoint)" if from_checkpoint else ""
+    return f"✅ {name}: score {posture_results.get('score', 0):.0f}{source}"
 
 
 class Dashboard3(tk.Frame):
@@ -23,10 +41,19 @@ class Dashboard3(tk.Frame):
 
         self.yolo_analyzer = None
         self.posture_analyzer = None
+        self.pipeline = None
+        self.scheduler = None
+        self.job = None
+        self.analysis_thread = None
         self.analysis_results = []
+        self.multi_view_result = None
         self.current_image_index = 0
 
         self.setup_ui()
+        # Semua update UI dari worker thread lewat bridge (di-pump di Tk thread)
+        self.ui = UIBridge(self)
+        # Baris log image yang selesai, di-insert per frame sekaligus
+        self.ui.register('completed', self.append_completed)
         self.start_analysis()
 
     def setup_ui(self):
@@ -91,8 +118,11 @@ class Dashboard3(tk.Frame):
         button_panel = tk.Frame(main_container, bg=BG_COLOR)
         button_panel.pack(fill='x')
 
+        button_frame = tk.Frame(button_panel, bg=BG_COLOR)
+        button_frame.pack()
+
         self.results_btn = tk.Button(
-            button_panel,
+            button_frame,
             text="📊 VIEW RESULTS",
             font=('Arial', 14, 'bold'),
             bg=SUCCESS_COLOR,
@@ -104,15 +134,60 @@ class Dashboard3(tk.Frame):
             command=self.show_results,
             state='disabled'
         )
-        self.results_btn.pack()
+        self.results_btn.pack(side='left', padx=10)
+
+        self.pause_btn = tk.Button(
+            button_frame,
+            text="⏸️ PAUSE",
+            font=('Arial', 14, 'bold'),
+            bg=WARNING_COLOR,
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=30,
+            pady=15,
+            command=self.toggle_pause,
+            state='disabled'
+        )
+        self.pause_btn.pack(side='left', padx=10)
+
+        self.cancel_btn = tk.Button(
+            button_frame,
+            text="⏹️ CANCEL",
+            font=('Arial', 14, 'bold'),
+            bg=DANGER_COLOR,
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=30,
+            pady=15,
+            command=self.cancel_analysis,
+            state='disabled'
+        )
+        self.cancel_btn.pack(side='left', padx=10)
+
+        self.quick_btn = tk.Button(
+            button_frame,
+            text="⚡ ANALISIS CEPAT",
+            font=('Arial', 14, 'bold'),
+            bg=PRIMARY_COLOR,
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=30,
+            pady=15,
+            command=self.quick_analysis,
+            state='disabled'
+        )
+        self.quick_btn.pack(side='left', padx=10)
 
     def start_analysis(self):
         """Start analysis dalam thread terpisah"""
-        thread = threading.Thread(target=self.run_analysis, daemon=True)
-        thread.start()
+        self.analysis_thread = threading.Thread(target=self.run_analysis, daemon=True)
+        self.analysis_thread.start()
 
     def run_analysis(self):
-        """Run YOLO analysis"""
+        """Run YOLO analysis sebagai job yang bisa di-pause, di-cancel dan di-resume"""
         try:
             # Get data
             analysis_data = self.app_controller.get_analysis_data()
@@ -121,63 +196,217 @@ class Dashboard3(tk.Frame):
             model_path = analysis_data['model_path']
             image_paths = analysis_data['image_paths']
             confidence = analysis_data['confidence']
+            refine_keypoints = analysis_data.get('refine_keypoints', False)
+            server_url = analysis_data.get('server_url')
+            multi_view = analysis_data.get('multi_view', False)
+            deduplicate = analysis_data.get('deduplicate', False)
             height_mm = user_data['height']
 
-            # Initialize analyzers
-            self.yolo_analyzer = YOLOAnalyzer(model_path, confidence)
-            self.posture_analyzer = PostureAnalyzer(height_mm)
-
-            # Analyze images
-            for img_path in image_paths:
-                self.update_loading(f"Menganalisis: {img_path}")
+            # Foto burst hampir identik: hanya foto paling tajam yang dianalisis
+            # (tidak untuk multi-view, setiap foto adalah view berbeda)
+            groups = None
+            job_paths = image_paths
+            if deduplicate and not multi_view and len(image_paths) > 1:
+                self.update_loading("Mencari foto duplikat...")
+                groups = DuplicateGroups(image_paths)
+                job_paths = groups.representative_paths
+
+            # Initialize pipeline (model tetap warm selama job)
+            self.update_loading("Menghubungi server analisis..." if server_url else "Memuat model...")
+            # Worker process: inference + render di luar proses GUI, image lewat shared memory
+            pipeline_class = ProcessAnalysisPipeline if ANALYSIS_WORKER_PROCESS else AnalysisPipeline
+            self.pipeline = pipeline_class(model_path, confidence, height_mm, refine_keypoints, server_url)
+            self.yolo_analyzer = self.pipeline.yolo_analyzer
+            self.posture_analyzer = self.pipeline.posture_analyzer
+            # Semua pemakaian pipeline lewat scheduler: analisis cepat menyela batch antar chunk
+            self.scheduler = AnalysisScheduler()
+
+            job_key = make_job_key(
+                job_paths,
+                model_path=model_path,
+                confidence=confidence,
+                height_mm=height_mm,
+                refine_keypoints=refine_keypoints,
+                server_url=server_url
+            )
+            # Multi-view: semua view dalam satu batch inference; refinement di-batch
+            # per chunk, remote dikirim paralel per chunk; selain itu cancel bisa per image
+            if multi_view:
+                chunk_size = len(job_paths)
+            elif server_url:
+                chunk_size = REMOTE_MAX_IN_FLIGHT
+            elif refine_keypoints:
+                chunk_size = REFINEMENT_BATCH_SIZE
+            else:
+                chunk_size = 1
+            self.job = AnalysisJob(
+                job_paths,
+                lambda paths: self.scheduler.run(self.pipeline.analyze_batch, paths, priority=PRIORITY_BATCH),
+                job_key,
+                chunk_size
+            )
+            self.ui.call(self.set_job_controls, 'normal')
+
+            results_by_index = {}
+
+            thumbnail_cache = self.app_controller.thumbnail_cache
+
+            def on_result(index, compact, from_checkpoint):
+                # Hasil representative di-link ke semua foto duplikatnya
+                linked = groups.expand(groups.representatives[index], compact) if groups else [(index, compact)]
+                for image_index, image_compact in linked:
+                    result = self.scheduler.run(self.pipeline.render_result, image_compact, priority=PRIORITY_BATCH)
+                    # Pre-render thumbnail off-thread agar display instan
+                    thumbnail_cache.prerender(result, 'combined_img', *DISPLAY_COMBINED_SIZE)
+                    thumbnail_cache.prerender(result, 'annotated_img', *DISPLAY_ANNOTATED_SIZE)
+                    # Thumbnail sudah dibaca langsung dari shared memory; image full-res disalin sekali
+                    results_by_index[image_index] = detach_frames(result)
+                    self.ui.extend('completed', [completed_line(result, from_checkpoint)])
+
+            def on_progress(done, total, message):
+                self.update_loading(f"[{done}/{total}] {message}")
+
+            try:
+                completed = self.job.run(on_result=on_result, on_progress=on_progress)
+            finally:
+                # Analisis cepat yang masih antri diselesaikan dulu
+                self.ui.call(self.quick_btn.config, state='disabled')
+                self.scheduler.close()
+                if isinstance(self.pipeline, ProcessAnalysisPipeline):
+                    self.pipeline.close()
+
+            self.analysis_results = [results_by_index[i] for i in sorted(results_by_index)]
+
+            # Gabungkan semua view menjadi satu hasil
+            if multi_view and self.analysis_results:
+                self.multi_view_result = fuse_views(self.analysis_results)
+
+            # Simpan sesi ke database riwayat (hanya job yang selesai: job yang
+            # di-cancel akan disimpan lengkap saat di-resume)
+            if AUTO_SAVE_RESULTS and completed and self.analysis_results:
+                self.app_controller.get_results_db().save_session(
+                    user_data['name'],
+                    height_mm,
+                    self.analysis_results,
+                    model_path=model_path or server_url,
+                    confidence=confidence
+                )
+            self.ui.call(self.set_job_controls, 'disabled')
 
-                # Run YOLO prediction
-                yolo_results = self.yolo_analyzer.predict(img_path)
+            if not completed:
+                cancel_msg = (
+                    f"Analisis dibatalkan ({len(self.analysis_results)}/{len(image_paths)} selesai).\n"
+                    "Progress tersimpan dan akan dilanjutkan jika gambar yang sama dianalisis lagi."
+                )
+                self.update_loading(cancel_msg)
+                self.ui.dialog(messagebox.showinfo, "Info", cancel_msg)
 
-                # Analyze posture
-                posture_results = self.posture_analyzer.analyze(yolo_results['detections'])
+            # Display first result
+            if self.analysis_results:
+                self.ui.call(self.display_result, 0)
+                self.ui.call(self.results_btn.config, state='normal')
 
-                # Load images
-                original_img = load_image(img_path)
-                annotated_img = self.yolo_analyzer.annotate_image(original_img, yolo_results['detections'])
+        except Exception as e:
+            error_msg = f"Error during analysis: {str(e)}"
+            print(error_msg)
+            self.ui.dialog(messagebox.showerror, "Error", error_msg)
+
+    def set_job_controls(self, state):
+        """Enable/disable tombol pause, cancel dan analisis cepat"""
+        self.pause_btn.config(state=state)
+        self.cancel_btn.config(state=state)
+        self.quick_btn.config(state=state)
+
+    def quick_analysis(self):
+        """Analisis satu foto baru tanpa menunggu batch yang sedang berjalan"""
+        file_path = filedialog.askopenfilename(
+            title="Pilih Gambar (Analisis Cepat)",
+            filetypes=[("Image Files", "*.jpg *.jpeg *.png *.bmp"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
 
-                # Create side-by-side
-                combined_img = create_side_by_side_image(
-                    original_img,
-                    annotated_img,
-                    label1="BEFORE",
-                    label2="AFTER ANALYSIS"
+        def run():
+            try:
+                # Prioritas interactive: dijalankan setelah chunk batch yang sedang berjalan
+                compact = self.scheduler.run(self.pipeline.analyze_batch, [file_path], priority=PRIORITY_INTERACTIVE)[0]
+                result = detach_frames(
+                    self.scheduler.run(self.pipeline.render_result, compact, priority=PRIORITY_INTERACTIVE)
                 )
+                self.ui.call(self.show_quick_result, result)
+            except Exception as e:
+                error_msg = f"Error analisis cepat: {str(e)}"
+                print(error_msg)
+                self.ui.dialog(messagebox.showerror, "Error", error_msg)
 
-                # Generate report
-                report_text = self.posture_analyzer.generate_report_text(posture_results)
+        threading.Thread(target=run, daemon=True).start()
 
-                # Store results
-                result = {
-                    'image_path': img_path,
-                    'yolo_results': yolo_results,
-                    'posture_results': posture_results,
-                    'original_img': original_img,
-                    'annotated_img': annotated_img,
-                    'combined_img': combined_img,
-                    'report_text': report_text
-                }
+    def show_quick_result(self, result):
+        """Tampilkan hasil analisis cepat di window terpisah (batch tetap berjalan)"""
+        window = tk.Toplevel(self)
+        window.title(f"⚡ Analisis Cepat - {os.path.basename(result['image_path'])}")
+        window.configure(bg='white')
 
-                self.analysis_results.append(result)
+        image_label = tk.Label(window, bg='white')
+        image_label.pack(padx=10, pady=10)
 
-            # Display first result
-            if self.analysis_results:
-                self.display_result(0)
-                self.parent.after(0, lambda: self.results_btn.config(state='normal'))
+        def show_photo(photo):
+            image_label.config(image=photo)
+            image_label.image = photo
 
-        except Exception as e:
-            error_msg = f"Error during analysis: {str(e)}"
-            print(error_msg)
-            self.parent.after(0, lambda: messagebox.showerror("Error", error_msg))
+        self.app_controller.thumbnail_cache.request_photo(
+            image_label, result, 'annotated_img', *DISPLAY_ANNOTATED_SIZE, callback=show_photo
+        )
+
+        report = scrolledtext.ScrolledText(
+            window,
+            font=('Courier', 10),
+            bg='white',
+            fg=PRIMARY_COLOR,
+            height=12,
+            wrap='word'
+        )
+        report.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        report.insert('1.0', get_report_text(result))
+        report.config(state='disabled')
+
+    def toggle_pause(self):
+        """Pause atau resume job analisis"""
+        if not self.job:
+            return
+
+        if self.job.is_paused:
+            self.job.resume()
+            self.pause_btn.config(text="⏸️ PAUSE")
+        else:
+            self.job.pause()
+            self.pause_btn.config(text="▶️ RESUME")
+            self.loading_label.config(text="⏸️ Analisis di-pause")
+
+    def cancel_analysis(self):
+        """Cancel job analisis (hasil yang sudah selesai tetap tersimpan)"""
+        if self.job and messagebox.askyesno(
+            "Konfirmasi",
+            "Batalkan analisis? Gambar yang sudah selesai tersimpan dan bisa dilanjutkan nanti."
+        ):
+            self.job.cancel()
+            self.set_job_controls('disabled')
+
+    def on_close(self):
+        """Dipanggil saat aplikasi ditutup: cancel job agar checkpoint konsisten"""
+        if self.job:
+            self.job.cancel()
+        if self.analysis_thread and self.analysis_thread.is_alive():
+            self.analysis_thread.join(timeout=5)
+
+    def append_completed(self, lines):
+        """Tambahkan baris log image yang selesai (satu insert per frame)"""
+        self.info_text.insert('end', ''.join(line + '\n' for line in lines))
+        self.info_text.see('end')
 
     def update_loading(self, message):
-        """Update loading message"""
-        self.parent.after(0, lambda: self.loading_label.config(text=f"⏳ {message}"))
+        """Update loading message (boleh dari worker thread; hanya pesan terakhir yang ditampilkan)"""
+        self.ui.latest('loading', self.loading_label.config, text=f"⏳ {message}")
 
     def display_result(self, index):
         """Display analysis result"""
@@ -190,28 +419,35 @@ class Dashboard3(tk.Frame):
         # Hide loading
         self.loading_label.pack_forget()
 
-        # Display combined image
-        combined_img = result['combined_img']
-        display_img = resize_image_for_display(combined_img, max_width=1000, max_height=500)
-        photo = numpy_to_photoimage(display_img)
-
-        self.image_label.config(image=photo)
-        self.image_label.image = photo
-
-        # Pack canvas components
-        self.image_canvas.pack(fill='both', expand=True, padx=10, pady=10)
-        self.image_canvas.create_window(0, 0, window=self.image_label, anchor='nw')
-        self.image_canvas.config(scrollregion=self.image_canvas.bbox('all'))
+        # Display combined image (thumbnail dari cache, resize tidak di Tk thread)
+        self.app_controller.thumbnail_cache.request_photo(
+            self, result, 'combined_img', *DISPLAY_COMBINED_SIZE,
+            callback=lambda photo, index=index: self.show_photo(index, photo)
+        )
 
         # Display report
         self.info_text.delete('1.0', 'end')
-        self.info_text.insert('1.0', result['report_text'])
+        self.info_text.insert('1.0', get_report_text(result))
+
+    def show_photo(self, index, photo):
+        """Tampilkan PhotoImage jika index masih yang sedang dipilih"""
+        if index != self.current_image_index:
+            return
+
+        with span('tk_render'):
+            self.image_label.config(image=photo)
+            self.image_label.image = photo
+
+            # Pack canvas components
+            self.image_canvas.pack(fill='both', expand=True, padx=10, pady=10)
+            self.image_canvas.create_window(0, 0, window=self.image_label, anchor='nw')
+            self.image_canvas.config(scrollregion=self.image_canvas.bbox('all'))
 
     def show_results(self):
         """Show results dashboard"""
         if self.analysis_results:
             # Save results to app controller
-            self.app_controller.set_results_data(self.analysis_results)
+            self.app_controller.set_results_data(self.analysis_results, self.multi_view_result)
 
             # Navigate to dashboard 4
             self.app_controller.show_dashboard(4)
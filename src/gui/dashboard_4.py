@@ -5,10 +5,21 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 from PIL import Image, ImageTk
 import os
+import threading
 from config.config import *
-from src.utils.image_utils import resize_image_for_display, numpy_to_photoimage
-from src.utils.export_utils import export_to_csv
+from src.utils.export_utils import export_to_csv, detection_table, keypoint_table, DETAIL_TABLE_FORMATS
+from src.utils.image_export import export_session_images, session_export_dir
+from src.utils.report_export import export_session_report
 from src.analysis.posture_analyzer import PostureAnalyzer
+from src.analysis.report_templates import get_report_text
+from src.analysis.scoring_rules import get_scoring_rules
+from src.analysis.multi_view import render_multi_view_report
+from src.utils.profiling import span
+from src.gui.diagnostics_panel import DiagnosticsPanel
+from src.gui.thumbnail_gallery import ThumbnailGallery
+from src.gui.trend_view import TrendView
+from src.gui.ui_bridge import UIBridge
+from src.gui.virtual_table import TableModel, VirtualTable
 
 
 class Dashboard4(tk.Frame):
@@ -23,6 +34,8 @@ class Dashboard4(tk.Frame):
         self.current_result_index = 0
 
         self.setup_ui()
+        # Update UI dari export thread lewat bridge (di-pump di Tk thread)
+        self.ui = UIBridge(self)
         self.display_result(0)
 
     def setup_ui(self):
@@ -55,18 +68,30 @@ class Dashboard4(tk.Frame):
 
         self.create_visualization_tab(viz_tab)
 
-        # Tab 2: Analysis Table
+        # Tab 2: Gallery
+        gallery_tab = tk.Frame(self.notebook, bg='white')
+        self.notebook.add(gallery_tab, text="🖼️ Gallery")
+
+        self.create_gallery_tab(gallery_tab)
+
+        # Tab 3: Analysis Table
         table_tab = tk.Frame(self.notebook, bg='white')
         self.notebook.add(table_tab, text="📋 Analysis Table")
 
         self.create_table_tab(table_tab)
 
-        # Tab 3: Summary Report
+        # Tab 4: Summary Report
         summary_tab = tk.Frame(self.notebook, bg='white')
         self.notebook.add(summary_tab, text="📝 Summary")
 
         self.create_summary_tab(summary_tab)
 
+        # Tab 5: History
+        history_tab = tk.Frame(self.notebook, bg='white')
+        self.notebook.add(history_tab, text="📈 History")
+
+        self.create_history_tab(history_tab)
+
         # Button panel
         button_panel = tk.Frame(main_container, bg=BG_COLOR)
         button_panel.pack(fill='x', pady=(20, 0))
@@ -89,6 +114,36 @@ class Dashboard4(tk.Frame):
         )
         export_btn.pack(side='left', padx=10)
 
+        # Export images button
+        self.export_images_btn = tk.Button(
+            button_frame,
+            text="🖼️ Export Images",
+            font=('Arial', 12, 'bold'),
+            bg=SECONDARY_COLOR,
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=30,
+            pady=12,
+            command=self.export_images
+        )
+        self.export_images_btn.pack(side='left', padx=10)
+
+        # Export report button
+        self.export_report_btn = tk.Button(
+            button_frame,
+            text="📄 Export Report",
+            font=('Arial', 12, 'bold'),
+            bg=SECONDARY_COLOR,
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=30,
+            pady=12,
+            command=self.export_report
+        )
+        self.export_report_btn.pack(side='left', padx=10)
+
         # Back button
         back_btn = tk.Button(
             button_frame,
@@ -119,6 +174,22 @@ class Dashboard4(tk.Frame):
         )
         new_btn.pack(side='left', padx=10)
 
+        # Diagnostics button (opsional)
+        if SHOW_DIAGNOSTICS_PANEL:
+            diag_btn = tk.Button(
+                button_frame,
+                text="⏱️ Diagnostics",
+                font=('Arial', 12, 'bold'),
+                bg=PRIMARY_COLOR,
+                fg='white',
+                cursor='hand2',
+                relief='flat',
+                padx=30,
+                pady=12,
+                command=self.show_diagnostics
+            )
+            diag_btn.pack(side='left', padx=10)
+
     def create_visualization_tab(self, parent):
         """Create visualization tab"""
         # Image selector
@@ -170,6 +241,27 @@ class Dashboard4(tk.Frame):
         )
         self.viz_info_text.pack(fill='both', expand=True)
 
+    def create_gallery_tab(self, parent):
+        """Create gallery tab (thumbnail grid dengan score badge)"""
+        items = [
+            {
+                'image_path': r['image_path'],
+                # Foto gagal / ditolak quality gate: badge netral, bukan score 0
+                'score': r['posture_results'].get('score', 0) if r['posture_results'].get('success', True) else None,
+                'label': f"{i+1}. {os.path.basename(r['image_path'])}"
+            }
+            for i, r in enumerate(self.results_data)
+        ]
+
+        self.gallery = ThumbnailGallery(parent, items, on_select=self.on_gallery_selected)
+        self.gallery.pack(fill='both', expand=True, padx=20, pady=20)
+
+    def on_gallery_selected(self, index):
+        """Handle klik thumbnail di gallery: tampilkan di tab visualization"""
+        self.image_selector.current(index)
+        self.display_result(index)
+        self.notebook.select(0)
+
     def create_table_tab(self, parent):
         """Create analysis table tab"""
         # Table frame
@@ -186,9 +278,34 @@ class Dashboard4(tk.Frame):
         )
         title_label.pack(pady=(0, 10))
 
+        # Mode tabel: komponen image terpilih, atau detail seluruh sesi
+        self.table_mode = tk.StringVar(value="components")
+        mode_frame = tk.Frame(table_frame, bg='white')
+        mode_frame.pack(pady=(0, 10))
+
+        for text, value in (
+            ("📋 Komponen (image terpilih)", "components"),
+            ("👤 Semua Deteksi", "detections"),
+            ("📍 Semua Keypoint", "keypoints"),
+        ):
+            tk.Radiobutton(
+                mode_frame,
+                text=text,
+                variable=self.table_mode,
+                value=value,
+                font=('Arial', 10),
+                bg='white',
+                activebackground='white',
+                command=self.switch_table_mode
+            ).pack(side='left', padx=10)
+
+        self.table_container = tk.Frame(table_frame, bg='white')
+        self.table_container.pack(fill='both', expand=True)
+
         # Create treeview
+        self.component_table = tk.Frame(self.table_container, bg='white')
         columns = ('Komponen', 'Parameter', 'Nilai', 'Satuan', 'Status', 'Score')
-        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+        self.tree = ttk.Treeview(self.component_table, columns=columns, show='headings', height=15)
 
         # Define headings
         for col in columns:
@@ -196,15 +313,37 @@ class Dashboard4(tk.Frame):
             self.tree.column(col, anchor='center', width=120)
 
         # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
+        scrollbar = ttk.Scrollbar(self.component_table, orient='vertical', command=self.tree.yview)
         self.tree.configure(yscrollcommand=scrollbar.set)
 
         self.tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
+        self.component_table.pack(fill='both', expand=True)
+
+        # Tabel detail dibuat saat pertama dipilih
+        self.detail_tables = {}
 
         # Populate table
         self.populate_table()
 
+    def switch_table_mode(self):
+        """Tampilkan tabel sesuai mode yang dipilih"""
+        mode = self.table_mode.get()
+        for widget in self.table_container.winfo_children():
+            widget.pack_forget()
+
+        if mode == "components":
+            self.component_table.pack(fill='both', expand=True)
+            return
+
+        table = self.detail_tables.get(mode)
+        if table is None:
+            build = detection_table if mode == "detections" else keypoint_table
+            with span('detail_table_build', mode=mode):
+                model = TableModel(build(self.results_data), DETAIL_TABLE_FORMATS)
+            table = self.detail_tables[mode] = VirtualTable(self.table_container, model)
+        table.pack(fill='both', expand=True)
+
     def create_summary_tab(self, parent):
         """Create summary tab"""
         summary_frame = tk.Frame(parent, bg='white')
@@ -233,6 +372,121 @@ class Dashboard4(tk.Frame):
         # Populate summary
         self.populate_summary()
 
+    def create_history_tab(self, parent):
+        """Create history tab (riwayat sesi pasien dari database)"""
+        history_frame = tk.Frame(parent, bg='white')
+        history_frame.pack(fill='both', expand=True, padx=20, pady=20)
+
+        user_data = self.app_controller.get_user_data()
+        title_label = tk.Label(
+            history_frame,
+            text=f"RIWAYAT ANALISIS: {user_data['name']}",
+            font=('Arial', 14, 'bold'),
+            bg='white',
+            fg=PRIMARY_COLOR
+        )
+        title_label.pack(pady=(0, 10))
+
+        # Session table
+        table_frame = tk.Frame(history_frame, bg='white')
+        table_frame.pack(fill='both', expand=True)
+
+        columns = ('ID', 'Tanggal', 'Jumlah Gambar', 'Rata-rata Score')
+        self.history_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=8)
+        for col in columns:
+            self.history_tree.heading(col, text=col)
+            self.history_tree.column(col, anchor='center', width=150)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.history_tree.yview)
+        self.history_tree.configure(yscrollcommand=scrollbar.set)
+
+        self.history_tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        history_buttons = tk.Frame(history_frame, bg='white')
+        history_buttons.pack(pady=10)
+
+        compare_btn = tk.Button(
+            history_buttons,
+            text="⚖️ Bandingkan 2 Sesi Terpilih",
+            font=('Arial', 11, 'bold'),
+            bg=SECONDARY_COLOR,
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=20,
+            pady=8,
+            command=self.compare_history_sessions
+        )
+        compare_btn.pack(side='left', padx=(0, 10))
+
+        trend_btn = tk.Button(
+            history_buttons,
+            text="📊 Lihat Trend",
+            font=('Arial', 11, 'bold'),
+            bg=SUCCESS_COLOR,
+            fg='white',
+            cursor='hand2',
+            relief='flat',
+            padx=20,
+            pady=8,
+            command=self.show_trend
+        )
+        trend_btn.pack(side='left')
+
+        self.history_text = scrolledtext.ScrolledText(
+            history_frame,
+            font=('Courier', 10),
+            bg='#f8f9fa',
+            fg=PRIMARY_COLOR,
+            height=9,
+            wrap='word'
+        )
+        self.history_text.pack(fill='x')
+
+        self.populate_history()
+
+    def populate_history(self):
+        """Populate tabel riwayat sesi pasien"""
+        self.history_tree.delete(*self.history_tree.get_children())
+
+        user_data = self.app_controller.get_user_data()
+        sessions = self.app_controller.get_results_db().get_patient_sessions(user_data['name'])
+
+        for session in sessions:
+            mean_score = session['mean_score']
+            self.history_tree.insert('', 'end', iid=str(session['id']), values=(
+                session['id'],
+                session['created_at'].replace('T', ' '),
+                session['image_count'],
+                f"{mean_score:.1f}" if mean_score is not None else '-'
+            ))
+
+    def compare_history_sessions(self):
+        """Bandingkan dua sesi yang dipilih di tabel riwayat"""
+        selected = self.history_tree.selection()
+        if len(selected) != 2:
+            messagebox.showwarning("Warning", "Pilih tepat 2 sesi untuk dibandingkan (Ctrl+klik).")
+            return
+
+        # Sesi lama sebagai pembanding (ID lebih kecil)
+        session_a, session_b = sorted(int(iid) for iid in selected)
+        comparison = self.app_controller.get_results_db().compare_sessions(session_a, session_b)
+
+        self.history_text.delete('1.0', 'end')
+        self.history_text.insert('end', f"{'Komponen':<14}{'Sesi ' + str(session_a):>12}{'Sesi ' + str(session_b):>12}{'Delta':>10}\n")
+        self.history_text.insert('end', "-" * 48 + "\n")
+        for component, values in comparison.items():
+            a = f"{values['a']:.1f}" if values['a'] is not None else '-'
+            b = f"{values['b']:.1f}" if values['b'] is not None else '-'
+            delta = f"{values['delta']:+.1f}" if values['delta'] is not None else '-'
+            self.history_text.insert('end', f"{component:<14}{a:>12}{b:>12}{delta:>10}\n")
+
+    def show_trend(self):
+        """Tampilkan window trend longitudinal pasien"""
+        user_data = self.app_controller.get_user_data()
+        TrendView(self, self.app_controller.get_results_db(), user_data['name'])
+
     def display_result(self, index):
         """Display result untuk index tertentu"""
         if index >= len(self.results_data):
@@ -241,17 +495,24 @@ class Dashboard4(tk.Frame):
         result = self.results_data[index]
         self.current_result_index = index
 
-        # Display annotated image
-        annotated_img = result['annotated_img']
-        display_img = resize_image_for_display(annotated_img, max_width=800, max_height=500)
-        photo = numpy_to_photoimage(display_img)
-
-        self.viz_image_label.config(image=photo)
-        self.viz_image_label.image = photo
+        # Display annotated image (thumbnail dari cache, resize tidak di Tk thread)
+        self.app_controller.thumbnail_cache.request_photo(
+            self, result, 'annotated_img', *DISPLAY_ANNOTATED_SIZE,
+            callback=lambda photo, index=index: self.show_photo(index, photo)
+        )
 
         # Display info
         self.viz_info_text.delete('1.0', 'end')
-        self.viz_info_text.insert('1.0', result['report_text'])
+        self.viz_info_text.insert('1.0', get_report_text(result))
+
+    def show_photo(self, index, photo):
+        """Tampilkan PhotoImage jika index masih yang sedang dipilih"""
+        if index != self.current_result_index:
+            return
+
+        with span('tk_render'):
+            self.viz_image_label.config(image=photo)
+            self.viz_image_label.image = photo
 
     def on_image_selected(self, event):
         """Handle image selection"""
@@ -260,9 +521,8 @@ class Dashboard4(tk.Frame):
 
     def populate_table(self):
         """Populate analysis table"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Clear existing items (satu call)
+        self.tree.delete(*self.tree.get_children())
 
         # Aggregate all results
         if not self.results_data:
@@ -272,68 +532,26 @@ class Dashboard4(tk.Frame):
         result = self.results_data[self.current_result_index]
         imbalance = result['posture_results'].get('imbalance', {})
 
-        # Add rows
-        from src.utils.export_utils import get_status, get_component_score
-
-        if 'shoulder' in imbalance:
+        # Add rows (status dan score dari aturan scoring bersama)
+        rules = get_scoring_rules()
+        for row in rules.component_rows(imbalance):
             self.tree.insert('', 'end', values=(
-                'Shoulder Imbalance',
-                'Perbedaan Tinggi Bahu',
-                f"{imbalance['shoulder']:.1f}",
-                'mm',
-                get_status('shoulder', imbalance['shoulder']),
-                get_component_score('shoulder', imbalance['shoulder'])
-            ))
-
-        if 'hip' in imbalance:
-            self.tree.insert('', 'end', values=(
-                'Hip Imbalance',
-                'Perbedaan Tinggi Pinggul',
-                f"{imbalance['hip']:.1f}",
-                'mm',
-                get_status('hip', imbalance['hip']),
-                get_component_score('hip', imbalance['hip'])
-            ))
-
-        if 'spine' in imbalance:
-            self.tree.insert('', 'end', values=(
-                'Spine Imbalance',
-                'Deviasi Tulang Belakang',
-                f"{imbalance['spine']:.1f}",
-                'mm',
-                get_status('spine', imbalance['spine']),
-                get_component_score('spine', imbalance['spine'])
-            ))
-
-        if 'head_shift' in imbalance:
-            self.tree.insert('', 'end', values=(
-                'Head Shift',
-                'Pergeseran Kepala',
-                f"{imbalance['head_shift']:.1f}",
-                'mm',
-                get_status('head_shift', imbalance['head_shift']),
-                get_component_score('head_shift', imbalance['head_shift'])
-            ))
-
-        if 'head_tilt' in imbalance:
-            self.tree.insert('', 'end', values=(
-                'Head Tilt',
-                'Kemiringan Kepala',
-                f"{imbalance['head_tilt']:.1f}",
-                '°',
-                get_status('head_tilt', imbalance['head_tilt']),
-                get_component_score('head_tilt', imbalance['head_tilt'])
+                row['label'],
+                row['parameter'],
+                f"{row['value']:.1f}",
+                row['unit'],
+                row['status'],
+                row['score']
             ))
 
         # Overall score
         overall_score = result['posture_results'].get('score', 0)
-        from src.utils.export_utils import get_overall_status
         self.tree.insert('', 'end', values=(
             'OVERALL',
             'Total Score',
             f"{overall_score:.1f}",
             '/100',
-            get_overall_status(overall_score),
+            rules.overall_status(overall_score),
             f"{overall_score:.1f}"
         ), tags=('overall',))
 
@@ -354,6 +572,12 @@ class Dashboard4(tk.Frame):
         self.summary_text.insert('end', f"Tinggi Badan: {user_data['height']} mm ({user_data['height']/10} cm)\n")
         self.summary_text.insert('end', f"Jumlah Gambar Dianalisis: {len(self.results_data)}\n\n")
 
+        # Hasil gabungan multi-view di atas hasil per gambar
+        multi_view_result = self.app_controller.get_multi_view_result()
+        if multi_view_result:
+            self.summary_text.insert('end', render_multi_view_report(multi_view_result))
+            self.summary_text.insert('end', "\n")
+
         # For each result, add summary
         for i, result in enumerate(self.results_data):
             self.summary_text.insert('end', f"\n{'='*60}\n")
@@ -392,6 +616,76 @@ class Dashboard4(tk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Error saat export: {str(e)}")
 
+    def export_images(self):
+        """Export annotated dan side-by-side image semua hasil (background thread)"""
+        if not self.results_data:
+            return
+
+        user_data = self.app_controller.get_user_data()
+        session_dir = session_export_dir(user_data['name'], EXPORTS_DIR)
+        self.export_images_btn.config(state='disabled')
+
+        def on_progress(done, total):
+            self.ui.latest('export_images', self.export_images_btn.config, text=f"🖼️ {done}/{total}")
+
+        def worker():
+            try:
+                paths = export_session_images(
+                    self.results_data,
+                    session_dir,
+                    kinds=('annotated', 'combined'),
+                    on_progress=on_progress
+                )
+                self.ui.dialog(
+                    messagebox.showinfo,
+                    "Success",
+                    f"{len(paths)} image berhasil di-export ke:\n{session_dir}"
+                )
+            except Exception as e:
+                error_msg = str(e)
+                self.ui.dialog(messagebox.showerror, "Error", f"Error saat export image: {error_msg}")
+            finally:
+                self.ui.latest('export_images', self.export_images_btn.config, text="🖼️ Export Images", state='normal')
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def export_report(self):
+        """Export session report HTML/PDF (background thread)"""
+        if not self.results_data:
+            return
+
+        user_data = self.app_controller.get_user_data()
+        filepath = filedialog.asksaveasfilename(
+            title="Simpan Report",
+            initialdir=EXPORTS_DIR,
+            initialfile=f"{user_data['name']}_laporan_postur.html",
+            defaultextension=".html",
+            filetypes=[("HTML Report", "*.html"), ("PDF Report", "*.pdf")]
+        )
+        if not filepath:
+            return
+
+        self.export_report_btn.config(state='disabled')
+
+        def on_progress(done, total):
+            self.ui.latest('export_report', self.export_report_btn.config, text=f"📄 {done}/{total}")
+
+        def worker():
+            try:
+                export_session_report(self.results_data, user_data, filepath, on_progress=on_progress)
+                self.ui.dialog(messagebox.showinfo, "Success", f"Report berhasil dibuat:\n{filepath}")
+            except Exception as e:
+                error_msg = str(e)
+                self.ui.dialog(messagebox.showerror, "Error", f"Error saat membuat report: {error_msg}")
+            finally:
+                self.ui.latest('export_report', self.export_report_btn.config, text="📄 Export Report", state='normal')
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def show_diagnostics(self):
+        """Tampilkan diagnostics panel"""
+        DiagnosticsPanel(self)
+
     def back_to_dashboard2(self):
         """Kembali ke dashboard 2"""
         self.app_controller.show_dashboard(2)
@@ -0,0 +1,121 @@
+"""
+Diagnostics Panel - Tampilan timing per stage dari profiler
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+from config.config import *
+from src.utils.profiling import profiler
+
+
+class DiagnosticsPanel(tk.Toplevel):
+    """Window diagnostics untuk melihat dan export timing per stage"""
+
+    def __init__(self, parent):
+        super().__init__(parent, bg=BG_COLOR)
+        self.title("Diagnostics - Timing per Stage")
+        self.geometry("900x450")
+
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        """Setup UI components"""
+        header_label = tk.Label(
+            self,
+            text="⏱️ DIAGNOSTICS PIPELINE",
+            font=('Arial', 16, 'bold'),
+            bg=PRIMARY_COLOR,
+            fg='white',
+            pady=10
+        )
+        header_label.pack(fill='x')
+
+        table_frame = tk.Frame(self, bg='white')
+        table_frame.pack(fill='both', expand=True, padx=20, pady=10)
+
+        columns = ('Stage', 'Count', 'Total (ms)', 'Mean (ms)', 'P50 (ms)', 'P95 (ms)', 'Max (ms)')
+        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=12)
+
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor='center', width=110)
+        self.tree.column('Stage', anchor='w', width=200)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        button_frame = tk.Frame(self, bg=BG_COLOR)
+        button_frame.pack(pady=(0, 10))
+
+        buttons = [
+            ("🔄 Refresh", SECONDARY_COLOR, self.refresh),
+            ("💾 Export JSON", SUCCESS_COLOR, self.export_json),
+            ("🧭 Export Chrome Trace", SUCCESS_COLOR, self.export_trace),
+            ("🗑️ Reset", DANGER_COLOR, self.reset),
+        ]
+        for text, color, command in buttons:
+            tk.Button(
+                button_frame,
+                text=text,
+                font=('Arial', 10, 'bold'),
+                bg=color,
+                fg='white',
+                cursor='hand2',
+                relief='flat',
+                padx=15,
+                pady=6,
+                command=command
+            ).pack(side='left', padx=5)
+
+    def refresh(self):
+        """Refresh tabel statistik dari profiler"""
+        self.tree.delete(*self.tree.get_children())
+
+        for stats in profiler.summary():
+            self.tree.insert('', 'end', values=(
+                stats['stage'],
+                stats['count'],
+                f"{stats['total_ms']:.1f}",
+                f"{stats['mean_ms']:.2f}",
+                f"{stats['p50_ms']:.2f}",
+                f"{stats['p95_ms']:.2f}",
+                f"{stats['max_ms']:.2f}"
+            ))
+
+    def _ask_path(self, suffix):
+        """Tanya lokasi file export"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return filedialog.asksaveasfilename(
+            parent=self,
+            initialdir=EXPORTS_DIR,
+            initialfile=f"profiling_{timestamp}{suffix}",
+            defaultextension='.json',
+            filetypes=[("JSON", "*.json"), ("All Files", "*.*")]
+        )
+
+    def export_json(self):
+        """Export statistik ke JSON"""
+        filepath = self._ask_path('.json')
+        if filepath:
+            profiler.export_json(filepath)
+            messagebox.showinfo("Success", f"Statistik di-export ke:\n{filepath}", parent=self)
+
+    def export_trace(self):
+        """Export event ke Chrome trace format"""
+        filepath = self._ask_path('_trace.json')
+        if filepath:
+            profiler.export_chrome_trace(filepath)
+            messagebox.showinfo(
+                "Success",
+                f"Trace di-export ke:\n{filepath}\n\nBuka dengan chrome://tracing atau ui.perfetto.dev",
+                parent=self
+            )
+
+    def reset(self):
+        """Reset semua statistik"""
+        profiler.reset()
+        self.refresh()
@@ -0,0 +1,273 @@
+"""
+Thumbnail Gallery - Grid thumbnail dengan virtualized scrolling untuk sesi besar
+"""
+import os
+import queue
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config.config import *
+from src.analysis.scoring_rules import get_scoring_rules
+from src.utils.image_utils import numpy_to_photoimage
+from src.utils.thumbnail_cache import DiskThumbnailCache
+
+TILE_PADDING = 10
+TILE_CAPTION_HEIGHT = 22
+LOAD_POLL_MS = 30
+FAILED_BADGE_COLOR = '#95a5a6'
+
+
+def score_color(score):
+    """
+    Get warna badge berdasarkan overall score
+
+    Args:
+        score (float): Overall score 0-100
+
+    Returns:
+        str: Warna hex
+    """
+    return get_scoring_rules().overall_color(score)
+
+
+class ThumbnailGallery(tk.Frame):
+    """
+    Grid thumbnail yang hanya me-render tile yang terlihat.
+
+    Thumbnail di-load secara async dari DiskThumbnailCache; PhotoImage
+    dibuat di Tk thread dan disimpan dengan LRU terbatas.
+    """
+
+    def __init__(self, parent, items, on_select=None, tile_size=GALLERY_TILE_SIZE):
+        """
+        Initialize Thumbnail Gallery
+
+        Args:
+            parent (tk.Widget): Parent widget
+            items (list): List dict dengan key 'image_path', 'score' (None = analisis gagal), 'label'
+            on_select (callable): Dipanggil dengan index item yang diklik
+            tile_size (int): Ukuran thumbnail (px)
+        """
+        super().__init__(parent, bg='white')
+        self.items = items
+        self.on_select = on_select
+        self.tile_size = tile_size
+        self.cell_width = tile_size + TILE_PADDING * 2
+        self.cell_height = tile_size + TILE_CAPTION_HEIGHT + TILE_PADDING * 2
+        self.columns = 1
+
+        self.disk_cache = DiskThumbnailCache(tile_size=tile_size)
+        self._executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix='gallery')
+        self._loaded = queue.Queue()
+        self._requested = set()
+        self._failed = set()
+        self._photos = OrderedDict()
+        self._tiles = {}
+        self._visible = (0, 0)
+        self._poll_job = None
+
+        self.canvas = tk.Canvas(self, bg='white', highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient='vertical', command=self._on_scroll)
+        self.canvas.configure(yscrollcommand=self._on_canvas_scroll)
+
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.canvas.bind('<Configure>', self._on_resize)
+        self.canvas.bind('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind('<Button-4>', lambda e: self._scroll_units(-1))
+        self.canvas.bind('<Button-5>', lambda e: self._scroll_units(1))
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.bind('<Destroy>', self._on_destroy)
+
+    def _on_resize(self, event):
+        """Hitung ulang jumlah kolom dan scrollregion virtual"""
+        columns = max(1, event.width // self.cell_width)
+        if columns != self.columns:
+            self.columns = columns
+            self._clear_tiles()
+
+        rows = (len(self.items) + self.columns - 1) // self.columns
+        self.canvas.configure(scrollregion=(0, 0, self.columns * self.cell_width, rows * self.cell_height))
+        self.refresh()
+
+    def _on_scroll(self, *args):
+        """Handler scrollbar"""
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _on_canvas_scroll(self, first, last):
+        """Sinkronkan scrollbar dengan posisi canvas"""
+        self.scrollbar.set(first, last)
+
+    def _on_mousewheel(self, event):
+        """Handler mouse wheel (Windows/macOS)"""
+        self._scroll_units(-1 if event.delta > 0 else 1)
+
+    def _scroll_units(self, units):
+        """Scroll sejumlah unit lalu refresh tile"""
+        self.canvas.yview_scroll(units, 'units')
+        self.refresh()
+
+    def visible_range(self):
+        """
+        Hitung range index item yang terlihat
+
+        Returns:
+            tuple: (start, end) index (end exclusive)
+        """
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+
+        first_row = max(0, int(top // self.cell_height))
+        last_row = int(bottom // self.cell_height) + 1
+
+        start = first_row * self.columns
+        end = min(len(self.items), (last_row + 1) * self.columns)
+        return start, end
+
+    def refresh(self):
+        """Render hanya tile yang terlihat, hapus tile yang keluar viewport"""
+        start, end = self._visible = self.visible_range()
+
+        for index in [i for i in self._tiles if i < start or i >= end]:
+            for item_id in self._tiles.pop(index):
+                self.canvas.delete(item_id)
+
+        for index in range(start, end):
+            if index not in self._tiles:
+                self._create_tile(index)
+
+        self._schedule_poll()
+
+    def _clear_tiles(self):
+        """Hapus semua tile dari canvas"""
+        self.canvas.delete('tile')
+        self._tiles.clear()
+
+    def _create_tile(self, index):
+        """Buat item canvas untuk satu tile"""
+        item = self.items[index]
+        row, col = divmod(index, self.columns)
+        x = col * self.cell_width + TILE_PADDING
+        y = row * self.cell_height + TILE_PADDING
+        size = self.tile_size
+        tag = ('tile', f"tile_{index}")
+
+        ids = [
+            self.canvas.create_rectangle(x, y, x + size, y + size, fill='#ecf0f1', outline='#bdc3c7', tags=tag)
+        ]
+
+        photo = self._photos.get(item['image_path'])
+        if photo is not None:
+            self._photos.move_to_end(item['image_path'])
+            ids.append(self.canvas.create_image(x + size // 2, y + size // 2, image=photo, tags=tag))
+        elif item['image_path'] in self._failed:
+            # Thumbnail tidak bisa di-load: tile netral, tidak di-request ulang
+            ids.append(self.canvas.create_text(
+                x + size // 2, y + size // 2, text="🖼️\nTidak dapat dimuat",
+                justify='center', fill=FAILED_BADGE_COLOR, font=('Arial', 8), tags=tag
+            ))
+        else:
+            ids.append(self.canvas.create_text(x + size // 2, y + size // 2, text="⏳", tags=tag))
+            self._request(index)
+
+        # Score badge (abu-abu "–" untuk analisis gagal)
+        score = item.get('score')
+        ids.append(self.canvas.create_rectangle(
+            x + size - 46, y + 4, x + size - 4, y + 24,
+            fill=score_color(score) if score is not None else FAILED_BADGE_COLOR, outline='', tags=tag
+        ))
+        ids.append(self.canvas.create_text(
+            x + size - 25, y + 14, text=f"{score:.0f}" if score is not None else "–",
+            fill='white', font=('Arial', 9, 'bold'), tags=tag
+        ))
+
+        ids.append(self.canvas.create_text(
+            x + size // 2, y + size + TILE_CAPTION_HEIGHT // 2 + 2,
+            text=item.get('label', os.path.basename(item['image_path']))[:24],
+            font=('Arial', 8), fill=PRIMARY_COLOR, tags=tag
+        ))
+
+        self._tiles[index] = ids
+
+    def _request(self, index):
+        """Load thumbnail di background (sekali per image)"""
+        image_path = self.items[index]['image_path']
+        if image_path in self._requested:
+            return
+
+        self._requested.add(image_path)
+        self._executor.submit(self._load, index, image_path)
+
+    def _load(self, index, image_path):
+        """Load thumbnail dari disk cache (worker thread)"""
+        start, end = self._visible
+        if not start <= index < end:
+            # Sudah di-scroll lewat sebelum sempat di-load
+            self._loaded.put((index, image_path, None, False))
+            return
+
+        try:
+            thumbnail = self.disk_cache.load(image_path)
+        except Exception as e:
+            print(f"Error loading thumbnail {image_path}: {e}")
+            thumbnail = None
+        self._loaded.put((index, image_path, thumbnail, thumbnail is None))
+
+    def _schedule_poll(self):
+        """Jadwalkan polling hasil load jika ada request pending"""
+        if self._poll_job is None and self._requested:
+            self._poll_job = self.after(LOAD_POLL_MS, self._poll_loaded)
+
+    def _poll_loaded(self):
+        """Convert thumbnail yang sudah di-load menjadi PhotoImage (Tk thread)"""
+        self._poll_job = None
+        start, end = self.visible_range()
+
+        while True:
+            try:
+                index, image_path, thumbnail, failed = self._loaded.get_nowait()
+            except queue.Empty:
+                break
+
+            self._requested.discard(image_path)
+            if failed:
+                self._failed.add(image_path)
+            elif thumbnail is None:
+                continue
+
+            # Tile yang sudah tidak terlihat tidak perlu PhotoImage sekarang
+            if not start <= index < end:
+                continue
+
+            if not failed:
+                self._photos[image_path] = numpy_to_photoimage(thumbnail)
+                while len(self._photos) > GALLERY_PHOTO_CACHE_SIZE:
+                    self._photos.popitem(last=False)
+
+            if index in self._tiles:
+                for item_id in self._tiles.pop(index):
+                    self.canvas.delete(item_id)
+                self._create_tile(index)
+
+        self._schedule_poll()
+
+    def _on_click(self, event):
+        """Handle klik tile"""
+        x = self.canvas.canvasx(event.x)
+        y = self.canvas.canvasy(event.y)
+        col = int(x // self.cell_width)
+        row = int(y // self.cell_height)
+
+        if col >= self.columns:
+            return
+
+        index = row * self.columns + col
+        if index < len(self.items) and self.on_select:
+            self.on_select(index)
+
+    def _on_destroy(self, event):
+        """Hentikan worker saat widget dihapus"""
+        if event.widget is self:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,86 @@
+"""
+Trend View - Window grafik trend longitudinal pasien
+"""
+import threading
+import tkinter as tk
+from tkinter import ttk
+from config.config import *
+from src.utils.image_utils import numpy_to_photoimage
+from src.utils.trend_plot import TREND_PANELS, get_trend_image
+from src.gui.ui_bridge import UIBridge
+
+
+class TrendView(tk.Toplevel):
+    """Window trend komponen postur dari riwayat database"""
+
+    def __init__(self, parent, db, patient):
+        super().__init__(parent, bg='white')
+        self.title(f"Trend Postur - {patient}")
+        self.geometry("1040x900")
+
+        self.db = db
+        self.patient = patient
+
+        self.setup_ui()
+        self.ui = UIBridge(self)
+        self.load()
+
+    def setup_ui(self):
+        """Setup UI components"""
+        self.plot_label = tk.Label(
+            self,
+            text="⏳ Menyiapkan grafik trend...",
+            font=('Arial', 14),
+            bg='white',
+            fg=PRIMARY_COLOR
+        )
+        self.plot_label.pack(fill='both', expand=True, padx=10, pady=10)
+
+        # Statistik aggregate (running mean / std per komponen)
+        columns = ('Komponen', 'Jumlah Data', 'Rata-rata', 'Std Dev', 'Min', 'Max')
+        self.stats_tree = ttk.Treeview(self, columns=columns, show='headings', height=6)
+        for col in columns:
+            self.stats_tree.heading(col, text=col)
+            self.stats_tree.column(col, anchor='center', width=150)
+        self.stats_tree.pack(fill='x', padx=10, pady=(0, 10))
+
+    def load(self):
+        """Load aggregate (cepat) lalu render grafik di background thread"""
+        aggregates = self.db.get_patient_aggregates(self.patient)
+
+        for component, title, unit in TREND_PANELS:
+            stats = aggregates.get(component)
+            if stats:
+                self.stats_tree.insert('', 'end', values=(
+                    title,
+                    stats['n'],
+                    f"{stats['mean']:.1f} {unit}",
+                    f"{stats['std']:.1f}",
+                    f"{stats['min']:.1f}",
+                    f"{stats['max']:.1f}"
+                ))
+
+        threading.Thread(target=self._render, daemon=True).start()
+
+    def _render(self):
+        """Render grafik (worker thread), tampilkan lewat UI bridge"""
+        try:
+            image = get_trend_image(self.db, self.patient)
+        except ImportError:
+            self.ui.call(self.plot_label.config, text="❌ matplotlib tidak terinstall")
+            return
+        except Exception as e:
+            error_msg = f"❌ Error membuat grafik: {str(e)}"
+            self.ui.call(self.plot_label.config, text=error_msg)
+            return
+
+        self.ui.call(self._show, image)
+
+    def _show(self, image):
+        """Tampilkan image grafik (Tk thread)"""
+        if not self.winfo_exists():
+            return
+
+        photo = numpy_to_photoimage(image)
+        self.plot_label.config(image=photo, text='')
+        self.plot_label.image = photo
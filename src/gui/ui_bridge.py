@@ -0,0 +1,151 @@
+"""
+UI Bridge - Update Tk dari worker thread lewat satu pump di Tk thread
+
+Worker thread tidak menyentuh widget (juga tidak memanggil after()) secara
+langsung; event dimasukkan ke queue dan di-pump oleh Tk thread setiap
+UI_BRIDGE_INTERVAL_MS. Dalam satu frame event di-coalesce: progress hanya
+yang terakhir per key, dan item batch (mis. baris tabel) digabung menjadi
+satu pemanggilan handler.
+"""
+import queue
+import time
+import tkinter as tk
+from config.config import UI_BRIDGE_INTERVAL_MS, UI_BRIDGE_FRAME_BUDGET_MS
+
+EVENT_CALL = 'call'
+EVENT_LATEST = 'latest'
+EVENT_ITEMS = 'items'
+
+
+class UIBridge:
+    """
+    Jembatan worker thread -> Tk thread untuk satu widget.
+
+    Jenis event:
+        call(func, ...): dijalankan berurutan, tidak di-coalesce
+        dialog(func, ...): seperti call(), tetapi func (dialog modal) dijalankan
+            lewat after_idle di luar pump agar event lain tidak tertahan
+        latest(key, func, ...): hanya pemanggilan terakhir per key yang dijalankan,
+            pada posisi pemanggilan terakhir itu (tetap setelah call() yang
+            dikirim sebelumnya)
+        extend(key, items): item digabung per frame lalu diberikan ke handler
+            yang didaftarkan dengan register(key, handler), pada posisi
+            extend() pertama dalam frame (item berikutnya ikut lebih awal)
+
+    Pump berhenti otomatis saat widget di-destroy.
+    """
+
+    def __init__(self, widget, interval_ms=UI_BRIDGE_INTERVAL_MS, frame_budget_ms=UI_BRIDGE_FRAME_BUDGET_MS):
+        """
+        Initialize UI Bridge (dipanggil dari Tk thread)
+
+        Args:
+            widget (tk.Widget): Widget pemilik pump
+            interval_ms (int): Interval pump (ms)
+            frame_budget_ms (float): Maksimum waktu eksekusi event per pump (ms)
+        """
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.frame_budget_ns = int(frame_budget_ms * 1e6)
+        self._events = queue.SimpleQueue()
+        self._handlers = {}
+        # Event yang belum sempat dijalankan karena melewati frame budget
+        self._backlog = []
+        self._job = None
+
+        widget.bind('<Destroy>', self._on_destroy, add='+')
+        self._job = widget.after(self.interval_ms, self._pump)
+
+    def call(self, func, *args, **kwargs):
+        """Jalankan func di Tk thread (urutan dipertahankan)"""
+        self._events.put((EVENT_CALL, None, (func, args, kwargs)))
+
+    def dialog(self, func, *args, **kwargs):
+        """Tampilkan dialog modal di Tk thread tanpa memblokir pump"""
+        self.call(self.widget.after_idle, lambda: func(*args, **kwargs))
+
+    def latest(self, key, func, *args, **kwargs):
+        """Jalankan func di Tk thread; pemanggilan lama dengan key sama dibuang"""
+        self._events.put((EVENT_LATEST, key, (func, args, kwargs)))
+
+    def register(self, key, handler):
+        """
+        Daftarkan handler item batch
+
+        Args:
+            key (str): Key event
+            handler (callable): Dipanggil di Tk thread dengan list item
+        """
+        self._handlers[key] = handler
+
+    def extend(self, key, items):
+        """Kirim item ke handler key (digabung dengan item lain dalam frame yang sama)"""
+        self._events.put((EVENT_ITEMS, key, list(items)))
+
+    def _collect(self):
+        """Ambil semua event dari queue dan coalesce ke backlog"""
+        pending = self._backlog
+        positions = {}
+        for i, (kind, key, _) in enumerate(pending):
+            if kind != EVENT_CALL:
+                positions[(kind, key)] = i
+
+        while True:
+            try:
+                kind, key, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == EVENT_CALL:
+                pending.append((kind, key, payload))
+                continue
+
+            i = positions.get((kind, key))
+            if i is not None and kind == EVENT_ITEMS:
+                pending[i][2].extend(payload)
+                continue
+            if i is not None:
+                # Event latest lama dibuang; yang baru dijalankan di posisinya sendiri
+                pending[i] = None
+            positions[(kind, key)] = len(pending)
+            pending.append((kind, key, payload))
+
+        return [event for event in pending if event is not None]
+
+    def _dispatch(self, kind, key, payload):
+        """Jalankan satu event (error dicetak, pump tetap berjalan)"""
+        try:
+            if kind == EVENT_ITEMS:
+                handler = self._handlers.get(key)
+                if handler is not None:
+                    handler(payload)
+            else:
+                func, args, kwargs = payload
+                func(*args, **kwargs)
+        except tk.TclError:
+            # Widget tujuan sudah di-destroy
+            pass
+        except Exception as e:
+            print(f"Error UI update: {e}")
+
+    def _pump(self):
+        """Jalankan event dalam batas frame budget, lalu jadwalkan pump berikutnya"""
+        self._job = None
+        pending = self._collect()
+
+        deadline = time.perf_counter_ns() + self.frame_budget_ns
+        done = 0
+        for kind, key, payload in pending:
+            self._dispatch(kind, key, payload)
+            done += 1
+            if time.perf_counter_ns() > deadline:
+                break
+        self._backlog = pending[done:]
+
+        if self.widget.winfo_exists():
+            self._job = self.widget.after(self.interval_ms, self._pump)
+
+    def _on_destroy(self, event):
+        if event.widget is self.widget and self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
@@ -0,0 +1,198 @@
+"""
+Virtual Table - Treeview tervirtualisasi untuk tabel besar (puluhan ribu baris)
+"""
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+HEADER_HEIGHT = 26
+SCROLL_ROWS = 3
+
+
+class TableModel:
+    """
+    Data tabel sebagai kolom NumPy.
+
+    Urutan sort setiap kolom (argsort stabil) dihitung sekali saat model
+    dibuat, sehingga sort di GUI hanya mengganti index array.
+    """
+
+    def __init__(self, columns, formats=None):
+        """
+        Initialize Table Model
+
+        Args:
+            columns (dict): Nama kolom -> array nilai (panjang sama)
+            formats (dict): Nama kolom -> format string (mis. '{:.2f}')
+        """
+        self.names = list(columns)
+        self.columns = {name: np.asarray(values) for name, values in columns.items()}
+        self.formats = formats or {}
+
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Panjang kolom tidak sama: {sorted(lengths)}")
+        self.num_rows = lengths.pop() if lengths else 0
+
+        self.orders = {name: np.argsort(values, kind='stable') for name, values in self.columns.items()}
+
+    def __len__(self):
+        return self.num_rows
+
+    def order(self, column=None, descending=False):
+        """
+        Index baris sesuai urutan sort
+
+        Args:
+            column (str): Nama kolom (None = urutan asli)
+            descending (bool): Urutan turun
+
+        Returns:
+            numpy.ndarray: Index baris
+        """
+        order = np.arange(self.num_rows) if column is None else self.orders[column]
+        return order[::-1] if descending else order
+
+    def _format(self, name, value):
+        if isinstance(value, (float, np.floating)) and np.isnan(value):
+            return '-'
+        fmt = self.formats.get(name)
+        return fmt.format(value) if fmt else str(value)
+
+    def rows(self, indices):
+        """
+        Nilai baris yang sudah diformat (hanya baris yang diminta)
+
+        Args:
+            indices (array-like): Index baris
+
+        Returns:
+            list: List tuple nilai per baris
+        """
+        values = [self.columns[name][indices].tolist() for name in self.names]
+        return [
+            tuple(self._format(name, column[i]) for name, column in zip(self.names, values))
+            for i in range(len(indices))
+        ]
+
+
+class VirtualTable(tk.Frame):
+    """
+    Treeview yang hanya membuat item untuk baris yang terlihat.
+
+    Jumlah item Treeview sama dengan jumlah baris yang muat di layar; scroll
+    dan sort hanya mengganti nilai item tersebut. Klik heading untuk sort
+    (klik lagi untuk membalik urutan).
+    """
+
+    def __init__(self, parent, model, on_select=None, column_width=110):
+        """
+        Initialize Virtual Table
+
+        Args:
+            parent (tk.Widget): Parent widget
+            model (TableModel): Data tabel
+            on_select (callable): Dipanggil dengan index baris model yang dipilih
+            column_width (int): Lebar kolom default (px)
+        """
+        super().__init__(parent, bg='white')
+        self.model = model
+        self.on_select = on_select
+        self.offset = 0
+        self.page_size = 0  # Dihitung saat <Configure> pertama
+        self.sort_column = None
+        self.descending = False
+        self._order = model.order()
+
+        row_height = ttk.Style().lookup('Treeview', 'rowheight')
+        self.row_height = int(row_height) if row_height else 20
+
+        self.tree = ttk.Treeview(self, columns=model.names, show='headings', selectmode='browse')
+        for name in model.names:
+            self.tree.heading(name, text=name, command=lambda name=name: self.sort_by(name))
+            self.tree.column(name, anchor='center', width=column_width)
+
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self._on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-SCROLL_ROWS if e.delta > 0 else SCROLL_ROWS))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-SCROLL_ROWS))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(SCROLL_ROWS))
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+
+    def _on_resize(self, event):
+        """Hitung ulang jumlah baris yang muat"""
+        page_size = max(1, (event.height - HEADER_HEIGHT) // self.row_height)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self.offset = max(0, min(self.offset, len(self.model) - page_size))
+            self.refresh()
+
+    def _on_scroll(self, action, amount, unit=None):
+        """Handler scrollbar (moveto / scroll)"""
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.model)))
+        elif unit == 'pages':
+            self.scroll(int(amount) * self.page_size)
+        else:
+            self.scroll(int(amount))
+
+    def scroll(self, rows):
+        """Scroll sejumlah baris"""
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        """Scroll sehingga baris ke-offset (urutan tampilan) berada di atas"""
+        offset = max(0, min(offset, len(self.model) - self.page_size))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def sort_by(self, column):
+        """Sort berdasarkan kolom (klik kolom yang sama membalik urutan)"""
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+
+        self._order = self.model.order(column, self.descending)
+        arrow = ' ▼' if self.descending else ' ▲'
+        for name in self.model.names:
+            self.tree.heading(name, text=name + (arrow if name == column else ''))
+
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self):
+        """Isi ulang item yang terlihat dari model"""
+        indices = self._order[self.offset:self.offset + self.page_size]
+        rows = self.model.rows(indices)
+
+        # Item dipakai ulang untuk baris lain: selection lama tidak berlaku lagi
+        if self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        items = self.tree.get_children()
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+            items = items[:len(rows)]
+        for _ in range(len(rows) - len(items)):
+            self.tree.insert('', 'end')
+        items = self.tree.get_children()
+
+        for iid, row in zip(items, rows):
+            self.tree.item(iid, values=row)
+
+        total = max(1, len(self.model))
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(rows)) / total))
+
+    def _on_tree_select(self, event):
+        """Convert item Treeview yang dipilih ke index baris model"""
+        selection = self.tree.selection()
+        if not selection or not self.on_select:
+            return
+        position = self.tree.index(selection[0])
+        self.on_select(int(self._order[self.offset + position]))
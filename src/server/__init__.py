@@ -0,0 +1,3 @@
+"""
+Server Module - Local HTTP inference service
+"""
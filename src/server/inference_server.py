@@ -0,0 +1,273 @@
+"""
+Inference Server - HTTP JSON API untuk YOLOAnalyzer + PostureAnalyzer dengan micro-batching
+"""
+import base64
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import cv2
+import numpy as np
+from config.config import *
+from src.analysis.keypoint_refiner import KeypointRefiner
+from src.analysis.posture_analyzer import PostureAnalyzer
+from src.analysis.scale_estimator import get_marker_detector
+from src.server.micro_batcher import MicroBatcher, QueueFullError
+from src.utils.profiling import span
+
+
+class InferenceService:
+    """Service analisis dengan model warm dan micro-batching request"""
+
+    def __init__(self, yolo_analyzer, max_batch_size=SERVER_MAX_BATCH_SIZE,
+                 max_wait_ms=SERVER_MAX_WAIT_MS, max_queue=SERVER_MAX_QUEUE):
+        """
+        Initialize Inference Service
+
+        Args:
+            yolo_analyzer (YOLOAnalyzer): Analyzer dengan model yang sudah di-load
+            max_batch_size (int): Jumlah maksimum image per batch
+            max_wait_ms (float): Waktu tunggu maksimum untuk mengisi batch
+            max_queue (int): Kapasitas queue request
+        """
+        self.yolo_analyzer = yolo_analyzer
+        self.marker_detector = get_marker_detector()
+        self.refiner = KeypointRefiner(yolo_analyzer)
+        self.batcher = MicroBatcher(self.process_batch, max_batch_size, max_wait_ms, max_queue)
+        self.started_at = time.time()
+
+    def start(self):
+        """Start worker batching"""
+        self.batcher.start()
+
+    def stop(self):
+        """Stop worker batching"""
+        self.batcher.stop()
+
+    def process_batch(self, items):
+        """
+        Proses satu batch request dalam satu model call
+
+        Model dijalankan dengan confidence terendah dalam batch, lalu deteksi
+        setiap request difilter dengan confidence request itu sendiri (hasil
+        sama dengan model call per request).
+
+        Args:
+            items (list): List dict (image BGR, height_mm, filename, confidence, refine)
+
+        Returns:
+            list: Hasil per item (dict atau Exception)
+        """
+        with span('server_batch', batch_size=len(items)):
+            batch_detections = self.yolo_analyzer.predict_batch(
+                [item['image'] for item in items],
+                conf=min(item['confidence'] for item in items)
+            )
+
+        batch_detections = [
+            [det for det in detections if det['confidence'] >= item['confidence']]
+            for item, detections in zip(items, batch_detections)
+        ]
+
+        # Refinement hanya untuk request yang memintanya (semua crop di-batch bersama)
+        refine_items = [(item['image'], dets) for item, dets in zip(items, batch_detections) if item['refine']]
+        if refine_items:
+            self.refiner.refine(refine_items)
+
+        results = []
+        for item, detections in zip(items, batch_detections):
+            try:
+                mm_per_px = self.marker_detector.detect(item['image']) if self.marker_detector else None
+                posture_results = PostureAnalyzer(item['height_mm']).analyze(detections, mm_per_px)
+                results.append({
+                    'filename': item['filename'],
+                    'image_size': list(item['image'].shape[1::-1]),
+                    'detections': detections,
+                    'posture_results': posture_results
+                })
+            except Exception as e:
+                results.append(e)
+
+        return results
+
+    def submit(self, image_bytes, height_mm, filename=None, confidence=None, refine=False):
+        """
+        Decode image dan submit ke batcher
+
+        Args:
+            image_bytes (bytes): Isi file image
+            height_mm (float): Tinggi badan dalam mm
+            filename (str): Nama file (opsional, untuk referensi)
+            confidence (float): Confidence threshold (None = default server)
+            refine (bool): Refine keypoints dari person crop
+
+        Returns:
+            Future: Future hasil analisis
+
+        Raises:
+            ValueError: Jika image tidak bisa di-decode
+            QueueFullError: Jika queue penuh
+        """
+        confidence = self.yolo_analyzer.confidence if confidence is None else float(confidence)
+        if not 0.0 < confidence <= 1.0:
+            raise ValueError(f"confidence harus di antara 0 dan 1: {confidence}")
+
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Tidak dapat membaca gambar")
+
+        return self.batcher.submit({
+            'image': image,
+            'height_mm': float(height_mm),
+            'filename': filename,
+            'confidence': confidence,
+            'refine': bool(refine)
+        })
+
+    def metrics(self):
+        """
+        Get metrics service
+
+        Returns:
+            dict: Metrics
+        """
+        metrics = self.batcher.metrics()
+        metrics['uptime_s'] = time.time() - self.started_at
+        metrics['model_path'] = self.yolo_analyzer.model_path
+        return metrics
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler: POST /analyze, GET /health, GET /metrics"""
+
+    server_version = "PostureInference/1.0"
+
+    def log_message(self, format, *args):
+        """Log ringkas ke stdout"""
+        print(f"[server] {self.address_string()} {format % args}")
+
+    def _send_json(self, status, payload, headers=None):
+        """Kirim response JSON"""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Handle GET /health dan /metrics"""
+        path = urlparse(self.path).path
+        service = self.server.service
+
+        if path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif path == '/metrics':
+            self._send_json(200, service.metrics())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        """
+        Handle POST /analyze
+
+        Body berupa image mentah (Content-Type image/*, parameter lewat query
+        ?height_mm=1700&confidence=0.25&refine=1) atau JSON {"image": base64,
+        "height_mm": ..., "filename": ..., "confidence": ..., "refine": ...}.
+        """
+        parsed = urlparse(self.path)
+        if parsed.path != '/analyze':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        if length <= 0:
+            self._send_json(400, {'error': 'Body kosong'})
+            return
+        if length > SERVER_MAX_UPLOAD_MB * 1024 * 1024:
+            self._send_json(413, {'error': f'Ukuran maksimum {SERVER_MAX_UPLOAD_MB} MB'})
+            return
+
+        body = self.rfile.read(length)
+        query = parse_qs(parsed.query)
+
+        try:
+            if self.headers.get('Content-Type', '').startswith('application/json'):
+                payload = json.loads(body)
+                image_bytes = base64.b64decode(payload['image'])
+                height_mm = payload.get('height_mm', 1700)
+                filename = payload.get('filename')
+                confidence = payload.get('confidence')
+                refine = bool(payload.get('refine', False))
+            else:
+                image_bytes = body
+                height_mm = query.get('height_mm', [1700])[0]
+                filename = query.get('filename', [None])[0]
+                confidence = query.get('confidence', [None])[0]
+                refine = query.get('refine', ['0'])[0].lower() in ('1', 'true', 'yes')
+
+            future = self.server.service.submit(image_bytes, height_mm, filename, confidence, refine)
+        except QueueFullError as e:
+            self._send_json(503, {'error': str(e)}, headers={'Retry-After': '1'})
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f'Request tidak valid: {e}'})
+            return
+
+        try:
+            outcome = future.result(timeout=SERVER_REQUEST_TIMEOUT)
+        except Exception as e:
+            self._send_json(500, {'error': f'Error saat analisis: {e}'})
+            return
+
+        response = outcome['result']
+        response['timing'] = {
+            'queue_ms': outcome['queue_ms'],
+            'batch_ms': outcome['batch_ms'],
+            'batch_size': outcome['batch_size']
+        }
+        self._send_json(200, response)
+
+
+def create_server(service, host=SERVER_HOST, port=SERVER_PORT):
+    """
+    Buat HTTP server untuk service (belum serve_forever)
+
+    Args:
+        service (InferenceService): Service analisis
+        host (str): Host bind
+        port (int): Port (0 = pilih port bebas)
+
+    Returns:
+        ThreadingHTTPServer: Server
+    """
+    server = ThreadingHTTPServer((host, port), InferenceRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def run_server(yolo_analyzer, host=SERVER_HOST, port=SERVER_PORT, **batch_options):
+    """
+    Jalankan inference server sampai dihentikan (Ctrl+C)
+
+    Args:
+        yolo_analyzer (YOLOAnalyzer): Analyzer dengan model yang sudah di-load
+        host (str): Host bind
+        port (int): Port
+        **batch_options: Opsi MicroBatcher (max_batch_size, max_wait_ms, max_queue)
+    """
+    service = InferenceService(yolo_analyzer, **batch_options)
+    service.start()
+    server = create_server(service, host, port)
+
+    print(f"✅ Inference server berjalan di http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
@@ -0,0 +1,192 @@
+"""
+Micro Batcher - Kumpulkan request menjadi batch dinamis dengan bounded queue
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class QueueFullError(Exception):
+    """Raised ketika queue penuh (backpressure)"""
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching: request dikumpulkan sampai max_batch_size item
+    atau max_wait_ms sejak item pertama, lalu diproses sebagai satu batch.
+    """
+
+    def __init__(self, process_batch, max_batch_size=8, max_wait_ms=20, max_queue=64):
+        """
+        Initialize Micro Batcher
+
+        Args:
+            process_batch (callable): Fungsi list item -> list hasil (urutan sama)
+            max_batch_size (int): Jumlah maksimum item per batch
+            max_wait_ms (float): Waktu tunggu maksimum untuk mengisi batch
+            max_queue (int): Kapasitas queue (request ditolak jika penuh)
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max_wait_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopped = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self._metrics_lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+        self.batches = 0
+        self.items_processed = 0
+        self.batch_sizes = deque(maxlen=1000)
+        self.queue_wait_ms = deque(maxlen=1000)
+        self.batch_ms = deque(maxlen=1000)
+
+    def start(self):
+        """Start worker thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """Stop worker thread"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def submit(self, item):
+        """
+        Submit satu item ke queue
+
+        Args:
+            item: Item yang akan diproses
+
+        Returns:
+            Future: Future hasil item
+
+        Raises:
+            QueueFullError: Jika queue penuh
+        """
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            with self._metrics_lock:
+                self.rejected += 1
+            raise QueueFullError("Queue penuh, coba lagi nanti")
+
+        with self._metrics_lock:
+            self.submitted += 1
+        return future
+
+    def queue_depth(self):
+        """Jumlah item yang menunggu di queue"""
+        return self._queue.qsize()
+
+    def _collect_batch(self):
+        """Ambil item pertama (blocking) lalu isi batch sampai penuh atau timeout"""
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """Worker loop"""
+        while not self._stopped.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            items = [item for item, _, _ in batch]
+
+            try:
+                results = list(self.process_batch(items))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                with self._metrics_lock:
+                    self.failed += len(batch)
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with self._metrics_lock:
+                self.batches += 1
+                self.items_processed += len(batch)
+                self.batch_sizes.append(len(batch))
+                self.batch_ms.append(elapsed_ms)
+                for _, _, enqueued in batch:
+                    self.queue_wait_ms.append((start - enqueued) * 1000)
+
+            for (_, future, enqueued), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result({
+                        'result': result,
+                        'queue_ms': (start - enqueued) * 1000,
+                        'batch_ms': elapsed_ms,
+                        'batch_size': len(batch)
+                    })
+
+            # Hasil kurang dari jumlah request: future sisanya jangan dibiarkan menggantung
+            if len(results) < len(batch):
+                error = Exception(f"❌ process_batch mengembalikan {len(results)} hasil untuk {len(batch)} request")
+                for _, future, _ in batch[len(results):]:
+                    future.set_exception(error)
+                with self._metrics_lock:
+                    self.failed += len(batch) - len(results)
+
+    def metrics(self):
+        """
+        Get snapshot metrics
+
+        Returns:
+            dict: Metrics batcher
+        """
+        def pct(values, q):
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+        with self._metrics_lock:
+            batch_sizes = list(self.batch_sizes)
+            queue_wait = list(self.queue_wait_ms)
+            batch_ms = list(self.batch_ms)
+
+            return {
+                'submitted_total': self.submitted,
+                'rejected_total': self.rejected,
+                'failed_total': self.failed,
+                'batches_total': self.batches,
+                'items_processed_total': self.items_processed,
+                'queue_depth': self.queue_depth(),
+                'queue_capacity': self._queue.maxsize,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_s * 1000,
+                'batch_size_mean': sum(batch_sizes) / len(batch_sizes) if batch_sizes else 0.0,
+                'queue_wait_ms_p50': pct(queue_wait, 50),
+                'queue_wait_ms_p95': pct(queue_wait, 95),
+                'batch_ms_p50': pct(batch_ms, 50),
+                'batch_ms_p95': pct(batch_ms, 95)
+            }
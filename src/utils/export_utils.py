@@ -2,10 +2,15 @@
 Export Utilities - Export hasil analisis ke CSV
 """
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
+from config.config import KEYPOINT_NAMES
+from src.analysis.scoring_rules import get_scoring_rules
+from src.utils.profiling import timed
 
 
+@timed('export_to_csv')
 def export_to_csv(analysis_results, user_name, output_dir='exports'):
     """
     Export hasil analisis ke CSV
@@ -24,62 +29,17 @@ def export_to_csv(analysis_results, user_name, output_dir='exports'):
     # Prepare data for table
     table_data = []
 
-    # Get imbalance data
-    imbalance = analysis_results.get('imbalance', {})
+    rules = get_scoring_rules()
 
-    # Shoulder
-    if 'shoulder' in imbalance:
+    # Satu baris per komponen (status dan score dari aturan scoring bersama)
+    for row in rules.component_rows(analysis_results.get('imbalance', {})):
         table_data.append({
-            'Komponen': 'Shoulder Imbalance',
-            'Parameter': 'Perbedaan Tinggi Bahu',
-            'Nilai': f"{imbalance['shoulder']:.1f}",
-            'Satuan': 'mm',
-            'Status': get_status('shoulder', imbalance['shoulder']),
-            'Score': get_component_score('shoulder', imbalance['shoulder'])
-        })
-
-    # Hip
-    if 'hip' in imbalance:
-        table_data.append({
-            'Komponen': 'Hip Imbalance',
-            'Parameter': 'Perbedaan Tinggi Pinggul',
-            'Nilai': f"{imbalance['hip']:.1f}",
-            'Satuan': 'mm',
-            'Status': get_status('hip', imbalance['hip']),
-            'Score': get_component_score('hip', imbalance['hip'])
-        })
-
-    # Spine
-    if 'spine' in imbalance:
-        table_data.append({
-            'Komponen': 'Spine Imbalance',
-            'Parameter': 'Deviasi Tulang Belakang',
-            'Nilai': f"{imbalance['spine']:.1f}",
-            'Satuan': 'mm',
-            'Status': get_status('spine', imbalance['spine']),
-            'Score': get_component_score('spine', imbalance['spine'])
-        })
-
-    # Head shift
-    if 'head_shift' in imbalance:
-        table_data.append({
-            'Komponen': 'Head Shift',
-            'Parameter': 'Pergeseran Kepala',
-            'Nilai': f"{imbalance['head_shift']:.1f}",
-            'Satuan': 'mm',
-            'Status': get_status('head_shift', imbalance['head_shift']),
-            'Score': get_component_score('head_shift', imbalance['head_shift'])
-        })
-
-    # Head tilt
-    if 'head_tilt' in imbalance:
-        table_data.append({
-            'Komponen': 'Head Tilt',
-            'Parameter': 'Kemiringan Kepala',
-            'Nilai': f"{imbalance['head_tilt']:.1f}",
-            'Satuan': '°',
-            'Status': get_status('head_tilt', imbalance['head_tilt']),
-            'Score': get_component_score('head_tilt', imbalance['head_tilt'])
+            'Komponen': row['label'],
+            'Parameter': row['parameter'],
+            'Nilai': f"{row['value']:.1f}",
+            'Satuan': row['unit'],
+            'Status': row['status'],
+            'Score': row['score']
         })
 
     # Overall score
@@ -89,7 +49,7 @@ def export_to_csv(analysis_results, user_name, output_dir='exports'):
         'Parameter': 'Total Score',
         'Nilai': f"{overall_score:.1f}",
         'Satuan': '/100',
-        'Status': get_overall_status(overall_score),
+        'Status': rules.overall_status(overall_score),
         'Score': f"{overall_score:.1f}"
     })
 
@@ -118,26 +78,7 @@ def get_status(component, value):
     Returns:
         str: Status label
     """
-    if component in ['shoulder', 'hip', 'spine', 'head_shift']:
-        if value < 10:
-            return 'Normal'
-        elif value < 20:
-            return 'Ringan'
-        elif value < 30:
-            return 'Sedang'
-        else:
-            return 'Berat'
-    elif component == 'head_tilt':
-        if value < 5:
-            return 'Normal'
-        elif value < 10:
-            return 'Ringan'
-        elif value < 15:
-            return 'Sedang'
-        else:
-            return 'Berat'
-
-    return 'Unknown'
+    return get_scoring_rules().status(component, value)
 
 
 def get_component_score(component, value):
@@ -151,28 +92,7 @@ def get_component_score(component, value):
     Returns:
         str: Score string
     """
-    if component in ['shoulder', 'hip', 'spine', 'head_shift']:
-        if value < 10:
-            score = 100
-        elif value < 20:
-            score = 75
-        elif value < 30:
-            score = 50
-        else:
-            score = 25
-    elif component == 'head_tilt':
-        if value < 5:
-            score = 100
-        elif value < 10:
-            score = 75
-        elif value < 15:
-            score = 50
-        else:
-            score = 25
-    else:
-        score = 0
-
-    return f"{score}/100"
+    return get_scoring_rules().component_score(component, value)
 
 
 def get_overall_status(score):
@@ -185,13 +105,82 @@ def get_overall_status(score):
     Returns:
         str: Status label
     """
-    if score >= 80:
-        return 'Excellent'
-    elif score >= 60:
-        return 'Good'
-    elif score >= 40:
-        return 'Fair'
-    elif score >= 20:
-        return 'Poor'
-    else:
-        return 'Critical'
+    return get_scoring_rules().overall_status(score)
+
+
+# Format tampilan kolom tabel detail (lihat detection_table / keypoint_table)
+DETAIL_TABLE_FORMATS = {
+    'Confidence': '{:.2f}',
+    'mm/px': '{:.3f}',
+    'Score': '{:.1f}',
+    'X': '{:.1f}',
+    'Y': '{:.1f}',
+    'Conf': '{:.2f}',
+}
+
+
+def _session_detections(analysis_results):
+    """Semua deteksi sesi: list (nomor image, nama file, score, deteksi)"""
+    return [
+        (i + 1, os.path.basename(r['image_path']), r['posture_results'].get('score', np.nan), det)
+        for i, r in enumerate(analysis_results)
+        for det in r['posture_results'].get('detections', [])
+    ]
+
+
+@timed('detection_table')
+def detection_table(analysis_results):
+    """
+    Kolom tabel detail: satu baris per deteksi di seluruh sesi
+
+    Args:
+        analysis_results (list): List hasil analisis
+
+    Returns:
+        dict: Nama kolom -> array NumPy
+    """
+    rows = _session_detections(analysis_results)
+    return {
+        'Image': np.array([image for image, _, _, _ in rows], dtype=np.int32),
+        'File': np.array([name for _, name, _, _ in rows], dtype=str),
+        'Deteksi': np.array([det['index'] for _, _, _, det in rows], dtype=np.int32),
+        'Kelas': np.array([det['class'] for _, _, _, det in rows], dtype=str),
+        'Klasifikasi': np.array([det['classification'] for _, _, _, det in rows], dtype=str),
+        'Confidence': np.array([det['confidence'] for _, _, _, det in rows], dtype=float),
+        'mm/px': np.array([det.get('mm_per_px') or np.nan for _, _, _, det in rows], dtype=float),
+        'Skala': np.array([det.get('scale_method') or '-' for _, _, _, det in rows], dtype=str),
+        'Score': np.array([score for _, _, score, _ in rows], dtype=float),
+    }
+
+
+@timed('keypoint_table')
+def keypoint_table(analysis_results):
+    """
+    Kolom tabel detail: satu baris per keypoint setiap deteksi di seluruh sesi
+
+    Args:
+        analysis_results (list): List hasil analisis
+
+    Returns:
+        dict: Nama kolom -> array NumPy
+    """
+    num_keypoints = len(KEYPOINT_NAMES)
+    rows = [
+        row for row in _session_detections(analysis_results)
+        if row[3].get('keypoints') and len(row[3]['keypoints']) == num_keypoints * 3
+    ]
+    keypoints = np.array([det['keypoints'] for _, _, _, det in rows], dtype=float).reshape(-1, 3)
+
+    def per_keypoint(values, dtype):
+        return np.repeat(np.array(values, dtype=dtype), num_keypoints)
+
+    return {
+        'Image': per_keypoint([image for image, _, _, _ in rows], np.int32),
+        'File': per_keypoint([name for _, name, _, _ in rows], str),
+        'Deteksi': per_keypoint([det['index'] for _, _, _, det in rows], np.int32),
+        'Kelas': per_keypoint([det['class'] for _, _, _, det in rows], str),
+        'Keypoint': np.tile(np.array(KEYPOINT_NAMES), len(rows)),
+        'X': keypoints[:, 0],
+        'Y': keypoints[:, 1],
+        'Conf': keypoints[:, 2],
+    }
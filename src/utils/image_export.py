@@ -0,0 +1,214 @@
+"""
+Image Export - Simpan annotated / side-by-side image dengan encoding async
+"""
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import cv2
+import numpy as np
+from config.config import *
+from src.utils.profiling import span
+
+EXPORT_FORMATS = {
+    'jpg': '.jpg',
+    'jpeg': '.jpg',
+    'png': '.png',
+    'webp': '.webp',
+}
+
+# Kind -> key image di result dict
+EXPORT_KINDS = {
+    'annotated': 'annotated_img',
+    'combined': 'combined_img',
+    'original': 'original_img',
+}
+
+# Buffer BGR per thread, dipakai ulang selama ukuran image sama
+_local = threading.local()
+
+
+def encode_params(fmt, quality=IMAGE_EXPORT_QUALITY):
+    """
+    Parameter cv2.imwrite untuk format dan quality
+
+    Args:
+        fmt (str): Format (jpg, png, webp)
+        quality (int): Quality 0-100 (JPEG/WebP)
+
+    Returns:
+        tuple: (ekstensi, list parameter imwrite)
+    """
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format tidak didukung: {fmt}")
+
+    if fmt == 'png':
+        params = [cv2.IMWRITE_PNG_COMPRESSION, int(IMAGE_EXPORT_PNG_COMPRESSION)]
+    elif fmt == 'webp':
+        params = [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+    else:
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(quality), cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+
+    return EXPORT_FORMATS[fmt], params
+
+
+def _bgr_view(img_rgb):
+    """Konversi RGB -> BGR ke buffer per thread (tanpa alokasi baru per image)"""
+    if img_rgb.ndim == 2:
+        return img_rgb
+
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is None or buffer.shape != img_rgb.shape or buffer.dtype != img_rgb.dtype:
+        buffer = np.empty_like(img_rgb)
+        _local.buffer = buffer
+
+    cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR, dst=buffer)
+    return buffer
+
+
+def write_image(filepath, img_rgb, params=None):
+    """
+    Encode dan tulis image langsung dari buffer NumPy (tanpa PIL)
+
+    Args:
+        filepath (str): Path output (format dari ekstensi)
+        img_rgb (numpy.ndarray): Image RGB
+        params (list): Parameter cv2.imwrite
+
+    Returns:
+        str: Path file
+    """
+    with span('image_encode'):
+        ok = cv2.imwrite(filepath, _bgr_view(img_rgb), params or [])
+    if not ok:
+        raise Exception(f"❌ Gagal menyimpan image: {filepath}")
+    return filepath
+
+
+class ImageExporter:
+    """
+    Thread pool encoding dengan jumlah image in-flight terbatas
+
+    submit() akan menunggu jika sudah ada max_in_flight image yang sedang
+    di-encode, sehingga memori tidak bertambah untuk session besar.
+    """
+
+    def __init__(self, fmt=IMAGE_EXPORT_FORMAT, quality=IMAGE_EXPORT_QUALITY,
+                 workers=IMAGE_EXPORT_WORKERS, max_in_flight=IMAGE_EXPORT_MAX_IN_FLIGHT):
+        """
+        Initialize Image Exporter
+
+        Args:
+            fmt (str): Format (jpg, png, webp)
+            quality (int): Quality 0-100 (JPEG/WebP)
+            workers (int): Jumlah thread encoding
+            max_in_flight (int): Maksimum image yang sedang di-encode
+        """
+        self.extension, self.params = encode_params(fmt, quality)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='image-export')
+        self._slots = threading.BoundedSemaphore(max(1, int(max_in_flight)))
+
+    def submit(self, img_rgb, filepath):
+        """
+        Jadwalkan encode + write satu image
+
+        Args:
+            img_rgb (numpy.ndarray): Image RGB (tidak di-copy, jangan dimodifikasi sampai selesai)
+            filepath (str): Path output tanpa/dengan ekstensi
+
+        Returns:
+            Future: Future path file
+        """
+        if not filepath.lower().endswith(self.extension):
+            filepath = os.path.splitext(filepath)[0] + self.extension
+
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(write_image, filepath, img_rgb, self.params)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def close(self, wait=True):
+        """Shutdown thread pool"""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def session_export_dir(user_name, output_dir=EXPORTS_DIR):
+    """
+    Buat folder export untuk satu sesi
+
+    Args:
+        user_name (str): Nama user
+        output_dir (str): Directory output
+
+    Returns:
+        str: Path folder sesi
+    """
+    safe_name = re.sub(r'[^\w\-]+', '_', user_name).strip('_') or 'pasien'
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    session_dir = os.path.join(output_dir, f"{safe_name}_{timestamp}_images")
+    os.makedirs(session_dir, exist_ok=True)
+    return session_dir
+
+
+def export_session_images(results, session_dir, kinds=('annotated',), fmt=IMAGE_EXPORT_FORMAT,
+                          quality=IMAGE_EXPORT_QUALITY, on_progress=None, cancel_event=None):
+    """
+    Export image semua hasil dalam satu sesi
+
+    Args:
+        results (list): List hasil render (dict dengan annotated_img, combined_img, ...)
+        session_dir (str): Folder output sesi
+        kinds (tuple): Jenis image (annotated, combined, original)
+        fmt (str): Format (jpg, png, webp)
+        quality (int): Quality 0-100 (JPEG/WebP)
+        on_progress (callable): Callback(done, total) dari thread encoding
+        cancel_event (threading.Event): Hentikan export jika di-set
+
+    Returns:
+        list: Path file yang ditulis
+    """
+    for kind in kinds:
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"Jenis image tidak dikenal: {kind}")
+
+    total = len(results) * len(kinds)
+    done = [0]
+    done_lock = threading.Lock()
+    futures = []
+
+    def mark_done(_):
+        with done_lock:
+            done[0] += 1
+            count = done[0]
+        if on_progress:
+            on_progress(count, total)
+
+    with span('export_session_images', images=total), ImageExporter(fmt, quality) as exporter:
+        for i, result in enumerate(results):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+
+            stem = os.path.splitext(os.path.basename(result['image_path']))[0]
+            for kind in kinds:
+                img = result.get(EXPORT_KINDS[kind])
+                if img is None:
+                    mark_done(None)
+                    continue
+                filepath = os.path.join(session_dir, f"{i + 1:04d}_{stem}_{kind}")
+                future = exporter.submit(img, filepath)
+                future.add_done_callback(mark_done)
+                futures.append(future)
+
+    return [future.result() for future in futures]
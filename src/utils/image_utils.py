@@ -5,8 +5,10 @@ import cv2
 import numpy as np
 from PIL import Image, ImageTk
 import tkinter as tk
+from src.utils.profiling import timed
 
 
+@timed('load_image')
 def load_image(image_path):
     """
     Load image dari path
@@ -134,6 +136,7 @@ def draw_keypoints(img, keypoints, keypoint_names, color=(255, 0, 0)):
     return img_copy
 
 
+@timed('create_side_by_side_image')
 def create_side_by_side_image(img1, img2, label1="Before", label2="After"):
     """
     Create side by side image comparison
@@ -0,0 +1,369 @@
+"""
+Keypoint Archive - Arsip binary append-only (memory-mapped) untuk studi retrospektif
+"""
+import json
+import os
+import numpy as np
+from config.config import KEYPOINT_ARCHIVE_CHUNK_IMAGES
+from src.analysis.posture_analyzer import PostureAnalyzer
+from src.analysis.scale_estimator import estimate_scales, METHOD_MARKER
+from src.analysis.scoring_rules import get_scoring_rules
+
+NUM_KEYPOINTS = 17
+
+# Kolom per deteksi: nama file -> (dtype, shape per baris)
+COLUMNS = {
+    'keypoints': ('<f4', (NUM_KEYPOINTS, 3)),
+    'bboxes': ('<f4', (4,)),
+    'class_ids': ('<i2', ()),
+    'confidences': ('<f4', ()),
+}
+
+# Index per image: range deteksi + parameter skala
+INDEX_DTYPE = np.dtype([
+    ('start', '<i8'),
+    ('count', '<i4'),
+    ('height_mm', '<f4'),
+    ('marker_mm_per_px', '<f4'),
+])
+
+INDEX_FILE = 'index.bin'
+IMAGES_FILE = 'images.jsonl'
+META_FILE = 'meta.json'
+
+
+def marker_scale(detections):
+    """
+    Skala marker kalibrasi dari deteksi (None jika skala diestimasi dari keypoints)
+
+    Args:
+        detections (list): List deteksi dengan mm_per_px dan scale_method
+
+    Returns:
+        float: mm per pixel dari marker, atau None
+    """
+    return next(
+        (det['mm_per_px'] for det in detections if det.get('scale_method') == METHOD_MARKER and det.get('mm_per_px')),
+        None
+    )
+
+
+def _row_bytes(column):
+    """Ukuran satu baris kolom (byte)"""
+    dtype, shape = COLUMNS[column]
+    return np.dtype(dtype).itemsize * int(np.prod(shape, dtype=int))
+
+
+class KeypointArchive:
+    """
+    Arsip keypoints dalam kolom float32/int16 yang di-memory-map.
+
+    Setiap kolom adalah file binary mentah (keypoints.bin, bboxes.bin, ...)
+    dengan satu baris per deteksi; index.bin menyimpan range deteksi per
+    image dan images.jsonl menyimpan path/pasien (dan image_id database
+    sumber, agar build ulang tidak menduplikasi image). Index ditulis terakhir
+    sehingga data yang setengah tertulis (crash) diabaikan saat dibuka lagi.
+    """
+
+    def __init__(self, archive_dir, mode='r'):
+        """
+        Buka (atau buat) arsip
+
+        Args:
+            archive_dir (str): Folder arsip
+            mode (str): 'r' (baca saja) atau 'a' (append)
+        """
+        if mode not in ('r', 'a'):
+            raise ValueError(f"Mode tidak dikenal: {mode}")
+
+        self.archive_dir = archive_dir
+        self.mode = mode
+        self._files = {}
+        self._maps = {}
+
+        if mode == 'a':
+            os.makedirs(archive_dir, exist_ok=True)
+        elif not os.path.exists(self._path(INDEX_FILE)):
+            raise Exception(f"❌ Arsip keypoint tidak ditemukan: {archive_dir}")
+
+        self.class_names = []
+        if os.path.exists(self._path(META_FILE)):
+            with open(self._path(META_FILE), 'r', encoding='utf-8') as f:
+                self.class_names = json.load(f)['class_names']
+        self._class_index = {name: i for i, name in enumerate(self.class_names)}
+
+        index_size = os.path.getsize(self._path(INDEX_FILE)) if os.path.exists(self._path(INDEX_FILE)) else 0
+        self.num_images = index_size // INDEX_DTYPE.itemsize
+        last = self._read_index(self.num_images - 1) if self.num_images else None
+        self.num_detections = int(last['start'] + last['count']) if last is not None else 0
+
+        if mode == 'a':
+            self._recover(index_size)
+            for column in COLUMNS:
+                self._files[column] = open(self._path(f"{column}.bin"), 'ab')
+            self._files['images'] = open(self._path(IMAGES_FILE), 'a', encoding='utf-8')
+            self._files['index'] = open(self._path(INDEX_FILE), 'ab')
+
+    def _path(self, name):
+        return os.path.join(self.archive_dir, name)
+
+    def _read_index(self, i):
+        """Baca satu record index tanpa memory-map"""
+        with open(self._path(INDEX_FILE), 'rb') as f:
+            f.seek(i * INDEX_DTYPE.itemsize)
+            return np.frombuffer(f.read(INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)[0]
+
+    def _recover(self, index_size):
+        """Potong data sisa append yang tidak sampai ke index (mis. crash)"""
+        index_path = self._path(INDEX_FILE)
+        if os.path.exists(index_path) and index_size % INDEX_DTYPE.itemsize:
+            os.truncate(index_path, self.num_images * INDEX_DTYPE.itemsize)
+
+        for column in COLUMNS:
+            path = self._path(f"{column}.bin")
+            expected = self.num_detections * _row_bytes(column)
+            if os.path.exists(path) and os.path.getsize(path) > expected:
+                os.truncate(path, expected)
+
+        images_path = self._path(IMAGES_FILE)
+        if os.path.exists(images_path):
+            with open(images_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            if len(lines) != self.num_images:
+                with open(images_path, 'w', encoding='utf-8') as f:
+                    f.writelines(lines[:self.num_images])
+
+    def _class_id(self, class_name):
+        """ID kelas (kelas baru ditambahkan ke meta.json)"""
+        class_id = self._class_index.get(class_name)
+        if class_id is None:
+            class_id = len(self.class_names)
+            self.class_names.append(class_name)
+            self._class_index[class_name] = class_id
+            with open(self._path(META_FILE), 'w', encoding='utf-8') as f:
+                json.dump({'class_names': self.class_names}, f, ensure_ascii=False)
+        return class_id
+
+    def append(self, image_path, detections, height_mm, patient=None, marker_mm_per_px=None, image_id=None):
+        """
+        Tambahkan deteksi satu image
+
+        Args:
+            image_path (str): Path image
+            detections (list): List deteksi (class_name, confidence, bbox, keypoints)
+            height_mm (float): Tinggi badan dalam mm
+            patient (str): Nama pasien
+            marker_mm_per_px (float): Skala dari marker kalibrasi (jika ada)
+            image_id (int): ID image di database hasil (jika berasal dari database)
+        """
+        if self.mode != 'a':
+            raise Exception("❌ Arsip dibuka read-only")
+
+        count = len(detections)
+        keypoints = np.zeros((count, NUM_KEYPOINTS, 3), dtype='<f4')
+        for i, det in enumerate(detections):
+            # Deteksi tanpa keypoints disimpan sebagai nol (confidence 0 = tidak terlihat)
+            if det.get('keypoints') and len(det['keypoints']) == NUM_KEYPOINTS * 3:
+                keypoints[i] = np.asarray(det['keypoints'], dtype='<f4').reshape(NUM_KEYPOINTS, 3)
+
+        self._files['keypoints'].write(keypoints.tobytes())
+        self._files['bboxes'].write(np.asarray([det['bbox'] for det in detections], dtype='<f4').reshape(count, 4).tobytes())
+        self._files['class_ids'].write(np.asarray(
+            [self._class_id(det['class_name']) for det in detections], dtype='<i2'
+        ).tobytes())
+        self._files['confidences'].write(np.asarray([det['confidence'] for det in detections], dtype='<f4').tobytes())
+        self._files['images'].write(
+            json.dumps({'image_path': image_path, 'patient': patient, 'image_id': image_id}, ensure_ascii=False) + '\n'
+        )
+
+        record = np.array(
+            [(self.num_detections, count, height_mm, np.nan if not marker_mm_per_px else marker_mm_per_px)],
+            dtype=INDEX_DTYPE
+        )
+        self._files['index'].write(record.tobytes())
+
+        self.num_images += 1
+        self.num_detections += count
+        self._maps.clear()
+
+    def append_results(self, results, height_mm, patient=None):
+        """
+        Tambahkan hasil compact (dari pipeline / checkpoint)
+
+        Args:
+            results (list): List hasil (image_path, yolo_results, posture_results)
+            height_mm (float): Tinggi badan dalam mm
+            patient (str): Nama pasien
+        """
+        for result in results:
+            marker = marker_scale(result['posture_results'].get('detections', []))
+            self.append(result['image_path'], result['yolo_results']['detections'], height_mm, patient, marker)
+
+    def flush(self):
+        """Flush kolom dulu, index terakhir (index = commit record)"""
+        for name in list(COLUMNS) + ['images', 'index']:
+            f = self._files.get(name)
+            if f:
+                f.flush()
+
+    def close(self):
+        """Flush dan tutup semua file"""
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+        self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.num_images
+
+    def _map(self, name, dtype, shape):
+        """Memory-map kolom (read-only), dibuat ulang setelah append"""
+        if name not in self._maps:
+            if self._files:
+                self.flush()
+            if shape[0] == 0:
+                self._maps[name] = np.zeros(shape, dtype=dtype)
+            else:
+                filename = INDEX_FILE if name == 'index' else f"{name}.bin"
+                self._maps[name] = np.memmap(self._path(filename), dtype=dtype, mode='r', shape=shape)
+        return self._maps[name]
+
+    def column(self, name):
+        """
+        Kolom deteksi sebagai memmap
+
+        Args:
+            name (str): keypoints, bboxes, class_ids atau confidences
+
+        Returns:
+            numpy.memmap: Array (num_detections, ...)
+        """
+        dtype, shape = COLUMNS[name]
+        return self._map(name, dtype, (self.num_detections,) + shape)
+
+    @property
+    def index(self):
+        """Index per image (structured memmap: start, count, height_mm, marker_mm_per_px)"""
+        return self._map('index', INDEX_DTYPE, (self.num_images,))
+
+    def images(self):
+        """
+        Metadata image (path, pasien) sesuai urutan index
+
+        Returns:
+            list: List dict (image_path, patient)
+        """
+        if self._files:
+            self.flush()
+        if not os.path.exists(self._path(IMAGES_FILE)):
+            return []
+        with open(self._path(IMAGES_FILE), 'r', encoding='utf-8') as f:
+            return [json.loads(line) for _, line in zip(range(self.num_images), f)]
+
+    def image_ids(self):
+        """
+        ID image database yang sudah ada di arsip
+
+        Returns:
+            set: Set image_id (image tanpa ID tidak termasuk)
+        """
+        return {image['image_id'] for image in self.images() if image.get('image_id') is not None}
+
+
+def _first_valid(values, starts, counts):
+    """
+    Nilai deteksi pertama yang valid per image (aturan merge PostureAnalyzer)
+
+    Args:
+        values (numpy.ndarray): Nilai per deteksi (NaN = tidak terukur)
+        starts (numpy.ndarray): Index deteksi pertama per image (relatif)
+        counts (numpy.ndarray): Jumlah deteksi per image
+
+    Returns:
+        numpy.ndarray: Nilai per image (NaN jika tidak ada)
+    """
+    result = np.full(len(starts), np.nan)
+    nonempty = counts > 0
+    if not values.size or not nonempty.any():
+        return result
+
+    sentinel = len(values)
+    positions = np.where(np.isnan(values), sentinel, np.arange(len(values)))
+    first = np.minimum.reduceat(positions, starts[nonempty])
+
+    # Sentinel = semua deteksi image ini tidak terukur
+    found = first < sentinel
+    picked = np.full(len(first), np.nan)
+    picked[found] = values[first[found]]
+    result[nonempty] = picked
+    return result
+
+
+def recompute_metrics(archive, chunk_images=KEYPOINT_ARCHIVE_CHUNK_IMAGES, height_mm=None):
+    """
+    Hitung ulang imbalance dan score seluruh arsip secara vectorized per chunk
+
+    Hanya satu chunk image yang dibaca dari memmap pada satu waktu, sehingga
+    studi besar tidak perlu dimuat ke RAM.
+
+    Args:
+        archive (KeypointArchive): Arsip
+        chunk_images (int): Jumlah image per chunk
+        height_mm (float): Override tinggi badan (None = dari index)
+
+    Returns:
+        dict: components (list), imbalance (num_images, C), score (num_images,)
+    """
+    rules = get_scoring_rules()
+    components = rules.components
+    imbalance = np.full((archive.num_images, len(components)), np.nan, dtype=np.float32)
+    scores = np.full(archive.num_images, np.nan, dtype=np.float32)
+
+    side_by_class = np.array(
+        [PostureAnalyzer.get_analysis_type(name) == 'side_analysis' for name in archive.class_names] or [False]
+    )
+    index = archive.index
+
+    for i0 in range(0, archive.num_images, max(1, int(chunk_images))):
+        chunk = np.array(index[i0:i0 + chunk_images])
+        if not len(chunk):
+            continue
+
+        d0 = int(chunk['start'][0])
+        d1 = int(chunk['start'][-1] + chunk['count'][-1])
+        counts = chunk['count'].astype(np.int64)
+        starts = chunk['start'] - d0
+
+        keypoints = np.asarray(archive.column('keypoints')[d0:d1], dtype=np.float64)
+        bboxes = np.asarray(archive.column('bboxes')[d0:d1], dtype=np.float64)
+        class_ids = np.asarray(archive.column('class_ids')[d0:d1])
+
+        heights = np.repeat(
+            chunk['height_mm'].astype(np.float64) if height_mm is None else np.full(len(chunk), float(height_mm)),
+            counts
+        )
+        mm_per_px, _ = estimate_scales(keypoints, bboxes, heights)
+        markers = np.repeat(chunk['marker_mm_per_px'].astype(np.float64), counts)
+        mm_per_px = np.where(np.isnan(markers), mm_per_px, markers)
+
+        per_detection = PostureAnalyzer.batch_imbalance(keypoints, side_by_class[class_ids], mm_per_px)
+
+        values = np.column_stack([_first_valid(per_detection[key], starts, counts) for key in components])
+        imbalance[i0:i0 + len(chunk)] = values
+
+        chunk_scores = rules.score_values(values)
+        # Image tanpa deteksi = analisis gagal (tidak ada score)
+        scores[i0:i0 + len(chunk)] = np.where(counts > 0, chunk_scores, np.nan)
+
+    return {
+        'components': list(components),
+        'imbalance': imbalance,
+        'score': scores
+    }
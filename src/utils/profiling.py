@@ -0,0 +1,261 @@
+"""
+Profiling Utilities - Span-based timing instrumentation per stage
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from config.config import PROFILING_ENABLED, PROFILING_MAX_EVENTS
+
+# Histogram bucket edges (ns): 1µs, 2µs, 4µs, ... ~137 detik
+HISTOGRAM_EDGES_NS = [1000 * (2 ** i) for i in range(28)]
+
+
+class StageStats:
+    """Statistik durasi untuk satu stage dengan histogram log2"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * (len(HISTOGRAM_EDGES_NS) + 1)
+
+    def add(self, duration_ns):
+        """
+        Tambahkan satu sample durasi
+
+        Args:
+            duration_ns (int): Durasi dalam nanodetik
+        """
+        self.count += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.min_ns = duration_ns if self.min_ns is None else min(self.min_ns, duration_ns)
+
+        bucket = 0
+        while bucket < len(HISTOGRAM_EDGES_NS) and duration_ns > HISTOGRAM_EDGES_NS[bucket]:
+            bucket += 1
+        self.buckets[bucket] += 1
+
+    def percentile(self, q):
+        """
+        Estimasi percentile dari histogram (batas atas bucket)
+
+        Args:
+            q (float): Percentile 0-100
+
+        Returns:
+            int: Estimasi durasi dalam nanodetik
+        """
+        if not self.count:
+            return 0
+
+        target = self.count * q / 100.0
+        cumulative = 0
+        for i, n in enumerate(self.buckets):
+            cumulative += n
+            if cumulative >= target and n:
+                upper = HISTOGRAM_EDGES_NS[i] if i < len(HISTOGRAM_EDGES_NS) else self.max_ns
+                return min(upper, self.max_ns)
+
+        return self.max_ns
+
+    def to_dict(self):
+        """
+        Convert statistik ke dictionary (satuan ms)
+
+        Returns:
+            dict: Ringkasan statistik stage
+        """
+        return {
+            'stage': self.name,
+            'count': self.count,
+            'total_ms': self.total_ns / 1e6,
+            'mean_ms': (self.total_ns / self.count) / 1e6 if self.count else 0.0,
+            'min_ms': (self.min_ns or 0) / 1e6,
+            'max_ms': self.max_ns / 1e6,
+            'p50_ms': self.percentile(50) / 1e6,
+            'p95_ms': self.percentile(95) / 1e6,
+            'histogram': {
+                'edges_ns': HISTOGRAM_EDGES_NS,
+                'counts': list(self.buckets)
+            }
+        }
+
+
+class Profiler:
+    """Span-based profiler dengan histogram per stage dan event log untuk trace"""
+
+    def __init__(self, enabled=PROFILING_ENABLED, max_events=PROFILING_MAX_EVENTS):
+        """
+        Initialize Profiler
+
+        Args:
+            enabled (bool): Aktifkan pencatatan span
+            max_events (int): Jumlah maksimum event yang disimpan untuk trace
+        """
+        self.enabled = enabled
+        self.stages = {}
+        self.events = deque(maxlen=max_events)
+        self.origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, **args):
+        """
+        Context manager untuk mengukur satu span
+
+        Args:
+            name (str): Nama stage
+            **args: Metadata tambahan untuk trace event
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start_ns, time.perf_counter_ns() - start_ns, args)
+
+    def record(self, name, start_ns, duration_ns, args=None):
+        """
+        Catat span yang sudah selesai
+
+        Args:
+            name (str): Nama stage
+            start_ns (int): Waktu mulai (perf_counter_ns)
+            duration_ns (int): Durasi dalam nanodetik
+            args (dict): Metadata tambahan
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(name)
+            stats.add(duration_ns)
+
+            self.events.append((name, start_ns, duration_ns, threading.get_ident(), args or None))
+
+    def reset(self):
+        """Reset semua statistik dan event"""
+        with self._lock:
+            self.stages = {}
+            self.events.clear()
+            self.origin_ns = time.perf_counter_ns()
+
+    def summary(self):
+        """
+        Get ringkasan statistik semua stage
+
+        Returns:
+            list: List dictionary statistik, diurutkan berdasarkan total waktu
+        """
+        with self._lock:
+            stats = [s.to_dict() for s in self.stages.values()]
+
+        return sorted(stats, key=lambda s: s['total_ms'], reverse=True)
+
+    def export_json(self, filepath):
+        """
+        Export ringkasan statistik ke JSON
+
+        Args:
+            filepath (str): Path file output
+
+        Returns:
+            str: Path file yang dibuat
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'stages': self.summary()}, f, indent=2)
+
+        return filepath
+
+    def export_chrome_trace(self, filepath):
+        """
+        Export event ke Chrome trace format (chrome://tracing / Perfetto)
+
+        Args:
+            filepath (str): Path file output
+
+        Returns:
+            str: Path file yang dibuat
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+
+        with self._lock:
+            events = list(self.events)
+            origin_ns = self.origin_ns
+
+        pid = os.getpid()
+        trace_events = []
+        for name, start_ns, duration_ns, tid, args in events:
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': (start_ns - origin_ns) / 1000.0,
+                'dur': duration_ns / 1000.0,
+                'pid': pid,
+                'tid': tid
+            }
+            if args:
+                event['args'] = {k: str(v) for k, v in args.items()}
+            trace_events.append(event)
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+
+        return filepath
+
+
+# Profiler global yang dipakai oleh seluruh pipeline
+profiler = Profiler()
+
+
+def span(name, **args):
+    """
+    Shortcut untuk profiler.span pada profiler global
+
+    Args:
+        name (str): Nama stage
+        **args: Metadata tambahan
+
+    Returns:
+        contextmanager: Span context
+    """
+    return profiler.span(name, **args)
+
+
+def timed(name):
+    """
+    Decorator untuk mengukur setiap pemanggilan fungsi sebagai span
+
+    Args:
+        name (str): Nama stage
+
+    Returns:
+        function: Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+
+            start_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, start_ns, time.perf_counter_ns() - start_ns)
+        return wrapper
+    return decorator
@@ -0,0 +1,332 @@
+"""
+Report Export - Session report lengkap (HTML self-contained / PDF) secara streaming
+"""
+import base64
+import html
+import os
+import textwrap
+from datetime import datetime
+import cv2
+from config.config import *
+from src.analysis.scoring_rules import get_scoring_rules
+from src.utils.image_utils import resize_image_for_display
+from src.utils.profiling import span
+from src.utils.thumbnail_cache import DiskThumbnailCache
+
+PDF_DPI = 72
+PDF_PAGE_SIZE = (8.27, 11.69)  # A4 (inch)
+PDF_TEXT_WIDTH = 48  # Karakter per baris kolom teks
+
+HTML_STYLE = """
+body { font-family: Arial, sans-serif; color: #2c3e50; margin: 30px; }
+h1 { background: #2c3e50; color: white; padding: 16px; }
+h2 { border-bottom: 2px solid #3498db; padding-bottom: 4px; page-break-before: always; }
+table { border-collapse: collapse; margin: 8px 0; }
+th, td { border: 1px solid #ccc; padding: 4px 10px; font-size: 13px; }
+th { background: #ecf0f1; }
+.thumbs img { margin-right: 10px; border: 1px solid #ccc; }
+.meta td { border: none; padding: 2px 10px 2px 0; }
+.rec { background: #ecf0f1; padding: 8px; }
+"""
+
+
+def component_rows(posture_results):
+    """
+    Baris tabel komponen untuk satu hasil
+
+    Args:
+        posture_results (dict): Hasil PostureAnalyzer
+
+    Returns:
+        list: List dict baris komponen (lihat ScoringRules.component_rows)
+    """
+    return get_scoring_rules().component_rows(posture_results.get('imbalance', {}))
+
+
+def session_summary(results):
+    """
+    Ringkasan sesi (hanya dari posture results, tanpa image)
+
+    Args:
+        results (list): List hasil analisis
+
+    Returns:
+        dict: image_count, analyzed_count, mean_score
+    """
+    scores = [
+        r['posture_results'].get('score', 0)
+        for r in results if r['posture_results'].get('success', True)
+    ]
+    return {
+        'image_count': len(results),
+        'analyzed_count': len(scores),
+        'mean_score': sum(scores) / len(scores) if scores else None
+    }
+
+
+class ReportThumbnails:
+    """Thumbnail report: before dari DiskThumbnailCache, after dari annotated image"""
+
+    def __init__(self, size=REPORT_THUMBNAIL_SIZE):
+        """
+        Initialize Report Thumbnails
+
+        Args:
+            size (int): Sisi maksimum thumbnail (px)
+        """
+        self.size = size
+        self.disk_cache = DiskThumbnailCache(tile_size=size)
+
+    def before_jpeg(self, result):
+        """JPEG bytes thumbnail original (di-cache di disk, dipakai ulang antar report)"""
+        return self.disk_cache.load_bytes(result['image_path'])
+
+    def after_rgb(self, result):
+        """Thumbnail RGB annotated image (None jika hasil belum di-render)"""
+        annotated_img = result.get('annotated_img')
+        if annotated_img is None:
+            return None
+        return resize_image_for_display(annotated_img, self.size, self.size)
+
+    def after_jpeg(self, result):
+        """JPEG bytes thumbnail annotated image"""
+        thumbnail = self.after_rgb(result)
+        if thumbnail is None:
+            return None
+        ok, buffer = cv2.imencode('.jpg', cv2.cvtColor(thumbnail, cv2.COLOR_RGB2BGR), [cv2.IMWRITE_JPEG_QUALITY, 80])
+        return buffer.tobytes() if ok else None
+
+    def before_rgb(self, result):
+        """Thumbnail RGB original"""
+        return self.disk_cache.load(result['image_path'])
+
+
+def _img_tag(jpeg_bytes, alt):
+    """Tag <img> dengan data URI base64"""
+    if not jpeg_bytes:
+        return ''
+    data = base64.b64encode(jpeg_bytes).decode('ascii')
+    return f'<img src="data:image/jpeg;base64,{data}" alt="{alt}">'
+
+
+def _html_header(user_data, summary):
+    """Bagian awal dokumen HTML"""
+    name = html.escape(str(user_data.get('name', '-')))
+    mean_score = summary['mean_score']
+    score_text = f"{mean_score:.1f}/100 ({get_scoring_rules().overall_status(mean_score)})" if mean_score is not None else '-'
+
+    return (
+        "<!DOCTYPE html>\n<html lang=\"id\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>Laporan Analisis Postur - {name}</title>\n<style>{HTML_STYLE}</style>\n</head>\n<body>\n"
+        "<h1>📊 Laporan Analisis Postur</h1>\n"
+        "<table class=\"meta\">\n"
+        f"<tr><td><b>Nama</b></td><td>{name}</td></tr>\n"
+        f"<tr><td><b>Tinggi</b></td><td>{user_data.get('height', '-')} mm</td></tr>\n"
+        f"<tr><td><b>Tanggal</b></td><td>{datetime.now().strftime('%Y-%m-%d %H:%M')}</td></tr>\n"
+        f"<tr><td><b>Jumlah Gambar</b></td><td>{summary['image_count']} "
+        f"({summary['analyzed_count']} berhasil dianalisis)</td></tr>\n"
+        f"<tr><td><b>Rata-rata Score</b></td><td>{score_text}</td></tr>\n"
+        "</table>\n"
+    )
+
+
+def _html_overview(results):
+    """Tabel ringkasan semua gambar"""
+    rows = ["<h3>Ringkasan</h3>\n<table>\n<tr><th>#</th><th>Gambar</th><th>Jenis Analisis</th><th>Score</th><th>Status</th></tr>\n"]
+    scores = [result['posture_results'].get('score', 0) for result in results]
+    statuses = get_scoring_rules().overall_statuses(scores)
+
+    for i, (result, score, status) in enumerate(zip(results, scores, statuses)):
+        posture_results = result['posture_results']
+        filename = html.escape(os.path.basename(result['image_path']))
+        if posture_results.get('success', True):
+            rows.append(
+                f"<tr><td>{i + 1}</td><td><a href=\"#img{i + 1}\">{filename}</a></td>"
+                f"<td>{posture_results.get('analysis_type') or '-'}</td>"
+                f"<td>{score:.1f}</td><td>{status}</td></tr>\n"
+            )
+        else:
+            message = html.escape(posture_results.get('message', 'Tidak ada deteksi'))
+            rows.append(f"<tr><td>{i + 1}</td><td>{filename}</td><td colspan=\"3\">{message}</td></tr>\n")
+    rows.append("</table>\n")
+    return ''.join(rows)
+
+
+def _html_section(index, result, thumbnails):
+    """Section satu gambar: thumbnail, tabel komponen, klasifikasi, rekomendasi"""
+    posture_results = result['posture_results']
+    filename = html.escape(os.path.basename(result['image_path']))
+
+    parts = [
+        f"<h2 id=\"img{index}\">Gambar {index}: {filename}</h2>\n<div class=\"thumbs\">",
+        _img_tag(thumbnails.before_jpeg(result), 'before'),
+        _img_tag(thumbnails.after_jpeg(result), 'after'),
+        "</div>\n"
+    ]
+
+    if not posture_results.get('success', True):
+        parts.append(f"<p>⚠️ {html.escape(posture_results.get('message', 'Tidak ada deteksi'))}</p>\n")
+        return ''.join(parts)
+
+    parts.append("<table>\n<tr><th>Komponen</th><th>Nilai</th><th>Status</th><th>Score</th></tr>\n")
+    rules = get_scoring_rules()
+    for row in component_rows(posture_results):
+        parts.append(
+            f"<tr><td>{row['label']}</td><td>{row['value']:.1f} {row['unit']}</td>"
+            f"<td style=\"color:{row['color']}\"><b>{row['status']}</b></td><td>{row['score']}</td></tr>\n"
+        )
+    score = posture_results.get('score', 0)
+    parts.append(f"<tr><th>OVERALL</th><th>{score:.1f}/100</th><th>{rules.overall_status(score)}</th><th></th></tr>\n</table>\n")
+
+    classifications = ', '.join(
+        f"{html.escape(name)} ({count})" for name, count in posture_results.get('classifications', {}).items()
+    )
+    parts.append(f"<p><b>Klasifikasi:</b> {classifications or '-'}</p>\n")
+    parts.append(f"<p class=\"rec\">💡 {rules.recommendation(score)}</p>\n")
+    return ''.join(parts)
+
+
+def export_html_report(results, user_data, filepath, on_progress=None):
+    """
+    Tulis session report HTML self-contained (thumbnail di-embed base64)
+
+    Report ditulis per gambar langsung ke file, sehingga memori tidak
+    bertambah dengan jumlah gambar.
+
+    Args:
+        results (list): List hasil analisis
+        user_data (dict): Data user (name, height)
+        filepath (str): Path file output (.html)
+        on_progress (callable): Callback(done, total)
+
+    Returns:
+        str: Path file report
+    """
+    thumbnails = ReportThumbnails()
+    total = len(results)
+
+    with span('export_html_report', images=total), open(filepath, 'w', encoding='utf-8') as f:
+        f.write(_html_header(user_data, session_summary(results)))
+        f.write(_html_overview(results))
+
+        for i, result in enumerate(results):
+            f.write(_html_section(i + 1, result, thumbnails))
+            if on_progress:
+                on_progress(i + 1, total)
+
+        f.write("<hr><p>© 2024 Aplikasi Analisis Postur - Powered by YOLO</p>\n</body>\n</html>\n")
+
+    return filepath
+
+
+def _pdf_text_block(result):
+    """Teks ringkas satu gambar untuk halaman PDF"""
+    posture_results = result['posture_results']
+    lines = [textwrap.shorten(os.path.basename(result['image_path']), PDF_TEXT_WIDTH - 6), ""]
+
+    if not posture_results.get('success', True):
+        lines.append(posture_results.get('message', 'Tidak ada deteksi'))
+        return "\n".join(lines)
+
+    rules = get_scoring_rules()
+    for row in component_rows(posture_results):
+        lines.append(f"{row['label']:<20}{row['value']:>7.1f} {row['unit']:<3}{row['status']:<8}{row['score']}")
+    score = posture_results.get('score', 0)
+    lines.append("")
+    lines.append(f"{'OVERALL':<20}{score:>7.1f}/100 {rules.overall_status(score)}")
+    lines.append("")
+    lines.append(textwrap.fill(rules.recommendation(score), PDF_TEXT_WIDTH))
+    return "\n".join(lines)
+
+
+def export_pdf_report(results, user_data, filepath, on_progress=None, per_page=REPORT_PDF_IMAGES_PER_PAGE):
+    """
+    Tulis session report PDF, satu halaman per beberapa gambar (streaming)
+
+    Args:
+        results (list): List hasil analisis
+        user_data (dict): Data user (name, height)
+        filepath (str): Path file output (.pdf)
+        on_progress (callable): Callback(done, total)
+        per_page (int): Jumlah gambar per halaman
+
+    Returns:
+        str: Path file report
+    """
+    from matplotlib import rc_context
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    thumbnails = ReportThumbnails()
+    summary = session_summary(results)
+    total = len(results)
+
+    # Font standar PDF (Courier/Helvetica) tidak perlu di-embed: jauh lebih cepat per halaman
+    pdf_rc = {'pdf.use14corefonts': True, 'font.family': 'monospace', 'font.weight': 'medium'}
+
+    with span('export_pdf_report', images=total), rc_context(pdf_rc), PdfPages(filepath) as pdf:
+        # Halaman ringkasan
+        fig = Figure(figsize=PDF_PAGE_SIZE)
+        mean_score = summary['mean_score']
+        lines = [
+            "LAPORAN ANALISIS POSTUR",
+            "",
+            f"Nama           : {user_data.get('name', '-')}",
+            f"Tinggi         : {user_data.get('height', '-')} mm",
+            f"Tanggal        : {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            f"Jumlah Gambar  : {summary['image_count']} ({summary['analyzed_count']} berhasil dianalisis)",
+            f"Rata-rata Score: {mean_score:.1f}/100 ({get_scoring_rules().overall_status(mean_score)})" if mean_score is not None
+            else "Rata-rata Score: -",
+        ]
+        fig.text(0.08, 0.92, "\n".join(lines), va='top', fontsize=11)
+        pdf.savefig(fig)
+
+        page_w, page_h = PDF_PAGE_SIZE
+        row_h = (page_h - 0.6) / per_page
+        for start in range(0, total, per_page):
+            chunk = results[start:start + per_page]
+            fig = Figure(figsize=PDF_PAGE_SIZE, dpi=PDF_DPI)
+
+            for row, result in enumerate(chunk):
+                top = page_h - 0.3 - row * row_h
+
+                # figimage menaruh pixel langsung tanpa axes (jauh lebih cepat dari imshow)
+                for col, image in enumerate((thumbnails.before_rgb(result), thumbnails.after_rgb(result))):
+                    x_in = 0.3 + col * (REPORT_THUMBNAIL_SIZE / PDF_DPI + 0.15)
+                    fig.text(x_in / page_w, top / page_h, "BEFORE" if col == 0 else "AFTER", va='top', fontsize=7)
+                    if image is not None:
+                        fig.figimage(image, xo=x_in * PDF_DPI, yo=(top - 0.2) * PDF_DPI - image.shape[0], origin='upper')
+
+                fig.text(
+                    (0.6 + 2 * (REPORT_THUMBNAIL_SIZE / PDF_DPI + 0.15)) / page_w,
+                    top / page_h,
+                    f"#{start + row + 1}  {_pdf_text_block(result)}",
+                    va='top', fontsize=7
+                )
+
+            # Halaman langsung ditulis; figure dilepas sebelum halaman berikutnya
+            pdf.savefig(fig)
+            del fig
+
+            if on_progress:
+                on_progress(min(start + per_page, total), total)
+
+    return filepath
+
+
+def export_session_report(results, user_data, filepath, on_progress=None):
+    """
+    Export session report, format dari ekstensi file (.html atau .pdf)
+
+    Args:
+        results (list): List hasil analisis
+        user_data (dict): Data user (name, height)
+        filepath (str): Path file output
+        on_progress (callable): Callback(done, total)
+
+    Returns:
+        str: Path file report
+    """
+    if filepath.lower().endswith('.pdf'):
+        return export_pdf_report(results, user_data, filepath, on_progress)
+    return export_html_report(results, user_data, filepath, on_progress)
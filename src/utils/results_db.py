@@ -0,0 +1,579 @@
+"""
+Results Database - Penyimpanan lokal hasil analisis (SQLite) untuk riwayat pasien
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from config.config import RESULTS_DB_PATH
+
+IMBALANCE_COMPONENTS = ['shoulder', 'hip', 'spine', 'head_shift', 'head_tilt']
+TREND_COMPONENTS = IMBALANCE_COMPONENTS + ['score']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    patient TEXT NOT NULL,
+    height_mm REAL,
+    model_path TEXT,
+    confidence REAL,
+    created_at TEXT NOT NULL,
+    image_count INTEGER NOT NULL DEFAULT 0,
+    mean_score REAL
+);
+
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    patient TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    image_path TEXT NOT NULL,
+    analysis_type TEXT,
+    score REAL,
+    success INTEGER NOT NULL DEFAULT 1,
+    classifications TEXT,
+    duplicate_of TEXT
+);
+
+CREATE TABLE IF NOT EXISTS detections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    class_name TEXT NOT NULL,
+    classification TEXT,
+    confidence REAL,
+    x1 REAL, y1 REAL, x2 REAL, y2 REAL,
+    keypoints TEXT,
+    mm_per_px REAL,
+    scale_method TEXT
+);
+
+CREATE TABLE IF NOT EXISTS imbalance (
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    patient TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    component TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (image_id, component)
+);
+
+-- Aggregate incremental per pasien per komponen (Welford: n, mean, m2)
+CREATE TABLE IF NOT EXISTS patient_aggregates (
+    patient TEXT NOT NULL,
+    component TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    min_value REAL NOT NULL,
+    max_value REAL NOT NULL,
+    last_at TEXT NOT NULL,
+    PRIMARY KEY (patient, component)
+);
+
+-- Rata-rata per sesi per komponen (satu titik trend per sesi)
+CREATE TABLE IF NOT EXISTS session_trends (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    patient TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    component TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    PRIMARY KEY (session_id, component)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_patient_date ON sessions(patient, created_at);
+CREATE INDEX IF NOT EXISTS idx_images_patient_date ON images(patient, created_at);
+CREATE INDEX IF NOT EXISTS idx_images_score ON images(score);
+CREATE INDEX IF NOT EXISTS idx_images_session ON images(session_id);
+CREATE INDEX IF NOT EXISTS idx_detections_image ON detections(image_id);
+CREATE INDEX IF NOT EXISTS idx_imbalance_patient_component ON imbalance(patient, component, created_at);
+CREATE INDEX IF NOT EXISTS idx_session_trends_patient ON session_trends(patient, component, created_at);
+"""
+
+# Kolom yang ditambahkan setelah skema awal: table -> list (nama, tipe)
+MIGRATION_COLUMNS = {
+    'detections': [('mm_per_px', 'REAL'), ('scale_method', 'TEXT')],
+    'images': [('duplicate_of', 'TEXT')],
+}
+
+
+class ResultsDatabase:
+    """Database SQLite (WAL mode) untuk sesi, image, deteksi dan nilai imbalance"""
+
+    def __init__(self, db_path=RESULTS_DB_PATH):
+        """
+        Initialize Results Database
+
+        Args:
+            db_path (str): Path file database
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.commit()
+
+        # Database lama (sebelum ada aggregate): hitung sekali dari riwayat
+        has_sessions = self.conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone()
+        has_trends = self.conn.execute("SELECT 1 FROM session_trends LIMIT 1").fetchone()
+        if has_sessions and not has_trends:
+            self.rebuild_aggregates()
+
+    def _migrate(self):
+        """Tambahkan kolom baru ke database lama (ALTER TABLE)"""
+        for table, columns in MIGRATION_COLUMNS.items():
+            existing = {row['name'] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, column_type in columns:
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    def close(self):
+        """Tutup koneksi database"""
+        with self._lock:
+            self.conn.close()
+
+    def save_session(self, patient, height_mm, results, model_path=None, confidence=None, created_at=None):
+        """
+        Simpan satu sesi analisis dalam satu transaksi (batched insert)
+
+        Foto burst duplikat (duplicate_of) disimpan sebagai image yang ditandai
+        tetapi tidak dihitung di image_count, mean_score, imbalance dan aggregate.
+
+        Args:
+            patient (str): Nama pasien
+            height_mm (float): Tinggi badan dalam mm
+            results (list): List hasil (dict dengan image_path, posture_results)
+            model_path (str): Path model yang dipakai
+            confidence (float): Confidence threshold
+            created_at (str): Timestamp ISO (default: sekarang)
+
+        Returns:
+            int: ID sesi
+        """
+        created_at = created_at or datetime.now().isoformat(timespec='seconds')
+        analyzed = [r for r in results if not r.get('duplicate_of')]
+        scores = [
+            r['posture_results'].get('score', 0)
+            for r in analyzed if r['posture_results'].get('success', True)
+        ]
+        mean_score = sum(scores) / len(scores) if scores else None
+
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO sessions (patient, height_mm, model_path, confidence, created_at, image_count, mean_score) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (patient, height_mm, model_path, confidence, created_at, len(analyzed), mean_score)
+            )
+            session_id = cursor.lastrowid
+
+            detection_rows = []
+            imbalance_rows = []
+
+            for result in results:
+                posture = result['posture_results']
+                success = posture.get('success', True)
+                duplicate_of = result.get('duplicate_of')
+
+                cursor = self.conn.execute(
+                    "INSERT INTO images "
+                    "(session_id, patient, created_at, image_path, analysis_type, score, success, classifications, duplicate_of) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        session_id, patient, created_at, result['image_path'],
+                        posture.get('analysis_type'),
+                        posture.get('score') if success else None,
+                        int(success),
+                        json.dumps(posture.get('classifications', {})),
+                        duplicate_of
+                    )
+                )
+                image_id = cursor.lastrowid
+
+                for det in posture.get('detections', []):
+                    x1, y1, x2, y2 = det['bbox']
+                    detection_rows.append((
+                        image_id, det['class'], det['classification'], det['confidence'],
+                        x1, y1, x2, y2,
+                        json.dumps(det['keypoints']) if det.get('keypoints') else None,
+                        det.get('mm_per_px'), det.get('scale_method')
+                    ))
+
+                if duplicate_of:
+                    continue
+                for component, value in posture.get('imbalance', {}).items():
+                    imbalance_rows.append((image_id, patient, created_at, component, float(value)))
+
+            self.conn.executemany(
+                "INSERT INTO detections "
+                "(image_id, class_name, classification, confidence, x1, y1, x2, y2, keypoints, mm_per_px, scale_method) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                detection_rows
+            )
+            self.conn.executemany(
+                "INSERT INTO imbalance (image_id, patient, created_at, component, value) VALUES (?, ?, ?, ?, ?)",
+                imbalance_rows
+            )
+
+            # Update aggregate incremental dengan nilai sesi ini saja
+            values = {}
+            for _, _, _, component, value in imbalance_rows:
+                values.setdefault(component, []).append(value)
+            if scores:
+                values['score'] = [float(s) for s in scores]
+            self._update_aggregates(session_id, patient, created_at, values)
+
+        return session_id
+
+    def _update_aggregates(self, session_id, patient, created_at, values):
+        """
+        Merge statistik satu sesi ke aggregate pasien (Welford parallel merge)
+
+        Harus dipanggil di dalam transaksi yang sedang berjalan.
+
+        Args:
+            session_id (int): ID sesi
+            patient (str): Nama pasien
+            created_at (str): Timestamp sesi
+            values (dict): component -> list nilai dalam sesi
+        """
+        for component, samples in values.items():
+            n_b = len(samples)
+            mean_b = sum(samples) / n_b
+            m2_b = sum((v - mean_b) ** 2 for v in samples)
+
+            self.conn.execute(
+                "INSERT INTO session_trends (session_id, patient, created_at, component, n, mean) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, patient, created_at, component, n_b, mean_b)
+            )
+
+            row = self.conn.execute(
+                "SELECT n, mean, m2, min_value, max_value, last_at FROM patient_aggregates "
+                "WHERE patient = ? AND component = ?",
+                (patient, component)
+            ).fetchone()
+
+            if row is None:
+                n, mean, m2 = n_b, mean_b, m2_b
+                min_value, max_value, last_at = min(samples), max(samples), created_at
+            else:
+                n_a, mean_a, m2_a = row['n'], row['mean'], row['m2']
+                n = n_a + n_b
+                delta = mean_b - mean_a
+                mean = mean_a + delta * n_b / n
+                m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+                min_value = min(row['min_value'], min(samples))
+                max_value = max(row['max_value'], max(samples))
+                last_at = max(row['last_at'], created_at)
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO patient_aggregates "
+                "(patient, component, n, mean, m2, min_value, max_value, last_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (patient, component, n, mean, m2, min_value, max_value, last_at)
+            )
+
+    def rebuild_aggregates(self):
+        """Hitung ulang semua aggregate dari tabel riwayat (migrasi / perbaikan)"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM patient_aggregates")
+            self.conn.execute("DELETE FROM session_trends")
+
+            sessions = self.conn.execute(
+                "SELECT id, patient, created_at FROM sessions ORDER BY created_at, id"
+            ).fetchall()
+
+            for session in sessions:
+                values = {}
+                for row in self.conn.execute(
+                    "SELECT m.component, m.value FROM imbalance m JOIN images i ON i.id = m.image_id "
+                    "WHERE i.session_id = ?", (session['id'],)
+                ):
+                    values.setdefault(row['component'], []).append(row['value'])
+
+                scores = [
+                    row['score'] for row in self.conn.execute(
+                        "SELECT score FROM images WHERE session_id = ? AND score IS NOT NULL AND duplicate_of IS NULL",
+                        (session['id'],)
+                    )
+                ]
+                if scores:
+                    values['score'] = scores
+
+                self._update_aggregates(session['id'], session['patient'], session['created_at'], values)
+
+    def get_patient_aggregates(self, patient):
+        """
+        Get statistik aggregate per komponen seorang pasien (tanpa scan riwayat)
+
+        Args:
+            patient (str): Nama pasien
+
+        Returns:
+            dict: component -> {n, mean, std, min, max, last_at}
+        """
+        rows = self._query("SELECT * FROM patient_aggregates WHERE patient = ?", (patient,))
+
+        return {
+            row['component']: {
+                'n': row['n'],
+                'mean': row['mean'],
+                'std': (row['m2'] / (row['n'] - 1)) ** 0.5 if row['n'] > 1 else 0.0,
+                'min': row['min_value'],
+                'max': row['max_value'],
+                'last_at': row['last_at']
+            }
+            for row in rows
+        }
+
+    def get_patient_trends(self, patient):
+        """
+        Get titik trend (rata-rata per sesi) untuk semua komponen
+
+        Args:
+            patient (str): Nama pasien
+
+        Returns:
+            dict: component -> list of (created_at, mean) terurut waktu
+        """
+        rows = self._query(
+            "SELECT component, created_at, mean FROM session_trends WHERE patient = ? ORDER BY created_at, session_id",
+            (patient,)
+        )
+
+        trends = {}
+        for row in rows:
+            trends.setdefault(row['component'], []).append((row['created_at'], row['mean']))
+        return trends
+
+    def get_latest_session_id(self, patient):
+        """
+        Get ID sesi terakhir seorang pasien (untuk invalidasi cache)
+
+        Args:
+            patient (str): Nama pasien
+
+        Returns:
+            int: ID sesi atau None
+        """
+        rows = self._query("SELECT MAX(id) AS id FROM sessions WHERE patient = ?", (patient,))
+        return rows[0]['id'] if rows else None
+
+    def _query(self, sql, params=()):
+        """Jalankan query dan kembalikan list dict"""
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_patients(self):
+        """
+        Get daftar pasien dengan jumlah sesi
+
+        Returns:
+            list: List dict (patient, sessions, last_session)
+        """
+        return self._query(
+            "SELECT patient, COUNT(*) AS sessions, MAX(created_at) AS last_session "
+            "FROM sessions GROUP BY patient ORDER BY patient"
+        )
+
+    def get_patient_sessions(self, patient, since=None, until=None):
+        """
+        Get riwayat sesi seorang pasien
+
+        Args:
+            patient (str): Nama pasien
+            since (str): Batas awal tanggal ISO (opsional)
+            until (str): Batas akhir tanggal ISO (opsional)
+
+        Returns:
+            list: List sesi (terbaru dulu)
+        """
+        sql = "SELECT * FROM sessions WHERE patient = ?"
+        params = [patient]
+        if since:
+            sql += " AND created_at >= ?"
+            params.append(since)
+        if until:
+            # Tanggal tanpa jam mencakup seluruh hari tersebut
+            if len(until) == 10:
+                until += 'T23:59:59'
+            sql += " AND created_at <= ?"
+            params.append(until)
+        sql += " ORDER BY created_at DESC"
+
+        return self._query(sql, params)
+
+    def get_session_images(self, session_id):
+        """
+        Get image dalam satu sesi
+
+        Args:
+            session_id (int): ID sesi
+
+        Returns:
+            list: List image
+        """
+        return self._query("SELECT * FROM images WHERE session_id = ? ORDER BY id", (session_id,))
+
+    def get_session_imbalance(self, session_id):
+        """
+        Get rata-rata nilai imbalance per komponen untuk satu sesi
+
+        Args:
+            session_id (int): ID sesi
+
+        Returns:
+            dict: component -> rata-rata nilai
+        """
+        rows = self._query(
+            "SELECT m.component, AVG(m.value) AS value FROM imbalance m "
+            "JOIN images i ON i.id = m.image_id WHERE i.session_id = ? GROUP BY m.component",
+            (session_id,)
+        )
+        return {row['component']: row['value'] for row in rows}
+
+    def get_component_history(self, patient, component):
+        """
+        Get riwayat nilai satu komponen imbalance seorang pasien
+
+        Args:
+            patient (str): Nama pasien
+            component (str): Nama komponen (shoulder, hip, ...)
+
+        Returns:
+            list: List dict (created_at, value) terurut waktu
+        """
+        return self._query(
+            "SELECT created_at, value FROM imbalance WHERE patient = ? AND component = ? ORDER BY created_at",
+            (patient, component)
+        )
+
+    def find_images_by_score(self, max_score, patient=None, limit=100):
+        """
+        Cari image dengan score di bawah batas (outlier)
+
+        Args:
+            max_score (float): Batas atas score
+            patient (str): Filter pasien (opsional)
+            limit (int): Jumlah maksimum hasil
+
+        Returns:
+            list: List image terurut score naik
+        """
+        sql = "SELECT * FROM images WHERE score IS NOT NULL AND duplicate_of IS NULL AND score <= ?"
+        params = [max_score]
+        if patient:
+            sql += " AND patient = ?"
+            params.append(patient)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        return self._query(sql, params)
+
+    def iter_image_detections(self, patient=None, batch_size=1000):
+        """
+        Iterasi semua image beserta deteksinya secara streaming (untuk export studi)
+
+        Args:
+            patient (str): Filter pasien (None = semua)
+            batch_size (int): Jumlah baris per fetch
+
+        Yields:
+            tuple: (image dict: image_id, image_path, patient, height_mm; list deteksi dengan
+                class_name, confidence, bbox, keypoints, mm_per_px, scale_method)
+        """
+        sql = (
+            "SELECT i.id AS image_id, i.image_path, i.patient, s.height_mm, "
+            "d.class_name, d.confidence, d.x1, d.y1, d.x2, d.y2, d.keypoints, d.mm_per_px, d.scale_method "
+            "FROM images i JOIN sessions s ON s.id = i.session_id "
+            "LEFT JOIN detections d ON d.image_id = i.id "
+            # Foto burst duplikat tidak diarsipkan dua kali
+            "WHERE i.duplicate_of IS NULL"
+        )
+        params = ()
+        if patient is not None:
+            sql += " AND i.patient = ?"
+            params = (patient,)
+        sql += " ORDER BY i.id, d.id"
+
+        cursor = self.conn.cursor()
+        with self._lock:
+            cursor.execute(sql, params)
+
+        current_id = None
+        image = None
+        detections = []
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+
+            for row in rows:
+                if row['image_id'] != current_id:
+                    if image is not None:
+                        yield image, detections
+                    current_id = row['image_id']
+                    image = {
+                        'image_id': row['image_id'],
+                        'image_path': row['image_path'],
+                        'patient': row['patient'],
+                        'height_mm': row['height_mm']
+                    }
+                    detections = []
+
+                if row['class_name'] is not None:
+                    detections.append({
+                        'class_name': row['class_name'],
+                        'confidence': row['confidence'],
+                        'bbox': [row['x1'], row['y1'], row['x2'], row['y2']],
+                        'keypoints': json.loads(row['keypoints']) if row['keypoints'] else None,
+                        'mm_per_px': row['mm_per_px'],
+                        'scale_method': row['scale_method']
+                    })
+
+        if image is not None:
+            yield image, detections
+
+    def compare_sessions(self, session_a, session_b):
+        """
+        Bandingkan rata-rata imbalance dan score dua sesi
+
+        Args:
+            session_a (int): ID sesi pertama (biasanya lebih lama)
+            session_b (int): ID sesi kedua
+
+        Returns:
+            dict: component -> {'a', 'b', 'delta'} termasuk 'score'
+        """
+        imb_a = self.get_session_imbalance(session_a)
+        imb_b = self.get_session_imbalance(session_b)
+
+        scores = {
+            row['id']: row['mean_score']
+            for row in self._query("SELECT id, mean_score FROM sessions WHERE id IN (?, ?)", (session_a, session_b))
+        }
+        imb_a['score'] = scores.get(session_a)
+        imb_b['score'] = scores.get(session_b)
+
+        comparison = {}
+        for component in IMBALANCE_COMPONENTS + ['score']:
+            a = imb_a.get(component)
+            b = imb_b.get(component)
+            if a is None and b is None:
+                continue
+            comparison[component] = {
+                'a': a,
+                'b': b,
+                'delta': (b - a) if a is not None and b is not None else None
+            }
+
+        return comparison
@@ -0,0 +1,348 @@
+"""
+Runtime Tuning - Jumlah thread torch / OpenCV / BLAS yang konsisten untuk CPU inference
+
+Tanpa pengaturan, torch, OpenCV dan BLAS masing-masing memakai semua core;
+jika digabung dengan worker paralel (threads x workers) CPU menjadi
+oversubscribed dan throughput turun. Modul ini mendeteksi core yang benar-benar
+tersedia (affinity dan quota cgroup), membagi core per worker sesuai mode
+eksekusi, dan menyediakan auto-tune benchmark untuk memilih konfigurasi
+terbaik di mesin ini.
+"""
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from config.config import *
+
+MODE_LATENCY = 'latency'
+MODE_THROUGHPUT = 'throughput'
+MODES = (MODE_LATENCY, MODE_THROUGHPUT)
+
+# Environment variable BLAS/OpenMP (berlaku untuk proses yang di-spawn setelahnya)
+BLAS_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+CGROUP_V2_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+CGROUP_V1_QUOTA = '/sys/fs/cgroup/cpu/cpu.cfs_quota_us'
+CGROUP_V1_PERIOD = '/sys/fs/cgroup/cpu/cpu.cfs_period_us'
+
+# Config terakhir yang diterapkan (dipakai ulang saat torch di-load belakangan)
+_applied = None
+
+
+def _read_file(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit():
+    """
+    Quota CPU dari cgroup (container / systemd slice)
+
+    Returns:
+        float: Jumlah CPU yang diizinkan, atau None jika tidak dibatasi
+    """
+    cpu_max = _read_file(CGROUP_V2_CPU_MAX)
+    if cpu_max:
+        quota, _, period = cpu_max.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+        return None
+
+    quota = _read_file(CGROUP_V1_QUOTA)
+    period = _read_file(CGROUP_V1_PERIOD)
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_cpus():
+    """
+    Jumlah core yang bisa dipakai proses ini (affinity dan quota cgroup)
+
+    Returns:
+        int: Jumlah core (minimal 1)
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    limit = cgroup_cpu_limit()
+    if limit:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def plan_threads(mode=RUNTIME_MODE, workers=1, cpus=None):
+    """
+    Hitung jumlah thread per library untuk mode eksekusi
+
+    Latency: satu inference memakai semua core (torch intra-op). Throughput:
+    core dibagi rata ke setiap worker, dan OpenCV/BLAS satu thread per worker
+    agar total thread tidak melebihi jumlah core.
+
+    Args:
+        mode (str): MODE_LATENCY atau MODE_THROUGHPUT
+        workers (int): Jumlah worker paralel (throughput mode)
+        cpus (int): Jumlah core (None = deteksi otomatis)
+
+    Returns:
+        dict: mode, cpus, workers, torch, torch_interop, opencv, blas
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode runtime tidak dikenal: {mode}")
+
+    cpus = cpus or available_cpus()
+    workers = 1 if mode == MODE_LATENCY else max(1, min(int(workers), cpus))
+    per_worker = max(1, cpus // workers)
+
+    return {
+        'mode': mode,
+        'cpus': cpus,
+        'workers': workers,
+        'torch': per_worker,
+        'torch_interop': 1,
+        'opencv': per_worker if mode == MODE_LATENCY else 1,
+        'blas': per_worker if mode == MODE_LATENCY else 1,
+    }
+
+
+def apply_threads(config):
+    """
+    Terapkan jumlah thread ke torch, OpenCV dan BLAS
+
+    torch dan threadpoolctl bersifat opsional; environment variable BLAS
+    ikut di-set agar worker process yang di-spawn memakai nilai yang sama.
+    torch tidak di-import di sini (GUI thin-client / worker-process tidak
+    memuat PyTorch); jika belum ter-load, thread torch diterapkan oleh
+    apply_torch_threads saat model di-load.
+
+    Args:
+        config (dict): Hasil plan_threads / autotune
+
+    Returns:
+        dict: Config yang diterapkan
+    """
+    for var in BLAS_ENV_VARS:
+        os.environ[var] = str(config['blas'])
+
+    cv2.setNumThreads(int(config['opencv']))
+
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=int(config['blas']))
+    except ImportError:
+        pass
+
+    global _applied
+    _applied = config
+    apply_torch_threads(config)
+    return config
+
+
+def apply_torch_threads(config=None):
+    """
+    Terapkan jumlah thread torch jika torch sudah di-import
+
+    Dipanggil setelah model di-load (YOLOAnalyzer.load_model) agar config
+    startup juga berlaku untuk torch tanpa memaksa import torch lebih awal.
+
+    Args:
+        config (dict): Config thread (None = config terakhir dari apply_threads)
+    """
+    config = config or _applied
+    torch = sys.modules.get('torch')
+    if config is None or torch is None:
+        return
+
+    torch.set_num_threads(int(config['torch']))
+    try:
+        torch.set_num_interop_threads(int(config['torch_interop']))
+    except RuntimeError:
+        # Hanya bisa di-set sebelum ada operasi paralel pertama
+        pass
+
+
+def load_tuning(path=RUNTIME_TUNING_PATH):
+    """Config hasil autotune yang tersimpan (None jika belum ada)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_tuning(config, path=RUNTIME_TUNING_PATH):
+    """Simpan config hasil autotune"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+def configure_runtime(mode=RUNTIME_MODE, workers=1):
+    """
+    Set thread runtime saat startup
+
+    Hasil autotune dipakai jika ada untuk mode, jumlah worker, dan jumlah
+    core yang sama, selain itu dihitung dengan plan_threads.
+
+    Args:
+        mode (str): MODE_LATENCY atau MODE_THROUGHPUT
+        workers (int): Jumlah worker paralel
+
+    Returns:
+        dict: Config yang diterapkan
+    """
+    if not RUNTIME_TUNING_ENABLED:
+        return None
+
+    tuned = load_tuning()
+    if (tuned and tuned.get('mode') == mode and tuned.get('workers') == workers
+            and tuned.get('cpus') == available_cpus()):
+        return apply_threads(tuned)
+    return apply_threads(plan_threads(mode, workers))
+
+
+def _synthetic_workload(rng, image_size=(640, 480)):
+    """Workload CPU pengganti model: decode-like resize, blur dan matmul"""
+    width, height = image_size
+    image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    weights = rng.standard_normal((256, 256)).astype(np.float32)
+
+    def run(_):
+        resized = cv2.resize(image, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+        blurred = cv2.GaussianBlur(resized, (7, 7), 0)
+        features = blurred.reshape(-1)[:64 * 256].astype(np.float32).reshape(64, 256) / 255.0
+        return float(np.tanh(features @ weights).sum())
+
+    return run
+
+
+def _model_workload(model_path, rng, image_size=(640, 480)):
+    """
+    Workload inference YOLO asli pada image sintetis
+
+    Model ultralytics tidak thread-safe, jadi setiap worker thread memuat
+    YOLOAnalyzer sendiri (lazy, saat pertama kali dipanggil di thread itu).
+    """
+    from src.analysis.yolo_analyzer import YOLOAnalyzer
+
+    local = threading.local()
+    width, height = image_size
+    image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+
+    def run(_):
+        if not hasattr(local, 'yolo_analyzer'):
+            local.yolo_analyzer = YOLOAnalyzer(model_path, DEFAULT_CONFIDENCE)
+        return local.yolo_analyzer.predict_batch([image])
+
+    return run
+
+
+def _measure(workload, workers, seconds):
+    """Jalankan workload dengan sejumlah worker thread; return (items/detik, p50 ms, p95 ms)"""
+    latencies = []
+
+    def timed_run(i):
+        start_ns = time.perf_counter_ns()
+        workload(i)
+        latencies.append(time.perf_counter_ns() - start_ns)
+
+    # Warmup di setiap worker thread (load model per thread, alokasi thread
+    # pool library, cache); barrier memastikan tiap task jalan di thread berbeda
+    barrier = threading.Barrier(workers)
+
+    def warmup(i):
+        barrier.wait()
+        workload(i)
+
+    count = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(warmup, range(workers)))
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            list(executor.map(timed_run, range(count, count + workers)))
+            count += workers
+    elapsed = time.perf_counter() - start
+
+    samples = np.array(latencies) / 1e6
+    return count / elapsed, float(np.percentile(samples, 50)), float(np.percentile(samples, 95))
+
+
+def candidate_configs(mode, cpus=None):
+    """
+    Konfigurasi yang dicoba autotune
+
+    Latency: worker 1 dengan jumlah thread torch/OpenCV 1, 2, 4, ... cpus.
+    Throughput: worker 1, 2, 4, ... cpus dengan core dibagi rata.
+
+    Args:
+        mode (str): MODE_LATENCY atau MODE_THROUGHPUT
+        cpus (int): Jumlah core (None = deteksi otomatis)
+
+    Returns:
+        list: List config (format plan_threads)
+    """
+    cpus = cpus or available_cpus()
+    counts = sorted({min(cpus, 2 ** i) for i in range(int(math.log2(cpus)) + 1)} | {cpus})
+
+    if mode == MODE_THROUGHPUT:
+        return [plan_threads(MODE_THROUGHPUT, workers, cpus) for workers in counts]
+
+    configs = []
+    for threads in counts:
+        config = plan_threads(MODE_LATENCY, 1, cpus)
+        config.update(torch=threads, opencv=threads, blas=threads)
+        configs.append(config)
+    return configs
+
+
+def autotune(mode=RUNTIME_MODE, model_path=None, seconds=RUNTIME_TUNING_SECONDS, on_progress=None):
+    """
+    Benchmark semua kandidat konfigurasi dan pilih yang terbaik
+
+    Latency mode memilih p95 latency terendah, throughput mode memilih
+    image/detik tertinggi. Tanpa model_path dipakai workload CPU sintetis
+    (OpenCV + BLAS); workload ini tidak memakai torch, sehingga thread torch
+    pada hasil tetap dari plan_threads, bukan dari pengukuran.
+
+    Args:
+        mode (str): MODE_LATENCY atau MODE_THROUGHPUT
+        model_path (str): Path model YOLO .pt (None = workload sintetis)
+        seconds (float): Durasi pengukuran per kandidat
+        on_progress (callable): Dipanggil dengan dict config + hasil pengukuran per kandidat
+
+    Returns:
+        dict: Config terbaik dengan hasil pengukuran semua kandidat ('results')
+    """
+    rng = np.random.default_rng(0)
+    workload = _model_workload(model_path, rng) if model_path else _synthetic_workload(rng)
+
+    results = []
+    for config in candidate_configs(mode):
+        apply_threads(config)
+        throughput, p50_ms, p95_ms = _measure(workload, config['workers'], seconds)
+        measured = {**config, 'throughput': throughput, 'p50_ms': p50_ms, 'p95_ms': p95_ms}
+        results.append(measured)
+        if on_progress:
+            on_progress(measured)
+
+    if mode == MODE_LATENCY:
+        best = min(results, key=lambda r: r['p95_ms'])
+    else:
+        best = max(results, key=lambda r: r['throughput'])
+
+    if not model_path:
+        planned = plan_threads(mode, best['workers'], best['cpus'])
+        best = {**best, 'torch': planned['torch'], 'torch_interop': planned['torch_interop']}
+
+    apply_threads(best)
+    return {**best, 'workload': 'model' if model_path else 'synthetic', 'results': results}
@@ -0,0 +1,278 @@
+"""
+Shared Memory Transport - Kirim image hasil dari worker process ke GUI tanpa pickle
+
+Image (original/annotated/combined) ditulis ke ring buffer di
+multiprocessing.shared_memory; queue hanya membawa metadata kecil (hasil
+compact, offset dan shape). Di sisi GUI image dibaca sebagai view NumPy
+langsung ke shared memory (zero-copy).
+"""
+import queue
+import time
+import weakref
+from collections import deque
+from multiprocessing import shared_memory
+import numpy as np
+from config.config import SHM_ALLOC_TIMEOUT
+
+ALIGNMENT = 64
+POLL_INTERVAL = 0.5
+
+
+def _align(value):
+    """Bulatkan ke kelipatan ALIGNMENT"""
+    return (value + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SharedFrame(np.ndarray):
+    """
+    View NumPy ke shared memory.
+
+    Semua view (termasuk slice turunannya) memegang lease block; block
+    dikembalikan ke ring saat view terakhir di-garbage-collect.
+    """
+
+    def __array_finalize__(self, obj):
+        # Hanya view (bukan array baru hasil operasi) yang ikut memegang lease
+        self._lease = getattr(obj, '_lease', None) if self.base is not None else None
+
+
+class _Lease:
+    """Penanda block yang sedang dipakai GUI"""
+
+
+def detach_frames(result, keys=None):
+    """
+    Copy image yang masih berupa view shared memory ke memori proses sendiri
+
+    Dipanggil setelah display thumbnail di-render langsung dari shared
+    memory, agar hasil bisa disimpan lama tanpa menahan block ring.
+
+    Args:
+        result (dict): Hasil render
+        keys (list): Key image (None = semua SharedFrame di result)
+
+    Returns:
+        dict: Result yang sama (di-update in-place)
+    """
+    for key in keys or list(result):
+        value = result.get(key)
+        if isinstance(value, SharedFrame):
+            result[key] = np.array(value)
+    return result
+
+
+class _FrameRing:
+    """
+    Alokator ring buffer di sisi producer (worker process)
+
+    Block dialokasikan berurutan dan di-reclaim FIFO; block yang dilepas
+    tidak berurutan menunggu sampai block sebelumnya juga dilepas.
+
+    GUI baru melepas block sebuah request setelah request tersebut selesai,
+    sehingga jika block tertua milik request yang sedang berjalan, menunggu
+    tidak ada gunanya: allocate langsung gagal (fallback kirim inline).
+    """
+
+    def __init__(self, capacity, release_queue):
+        self.capacity = capacity
+        self.release_queue = release_queue
+        self._blocks = deque()  # (block_id, start, end) urut alokasi
+        self._released = set()
+        self._next_id = 0
+        self._request_start_id = 0
+
+    def begin_request(self):
+        """Tandai awal request baru (block sebelumnya bisa dilepas GUI)"""
+        self._request_start_id = self._next_id
+
+    def _reclaim(self, timeout=None):
+        """Ambil block yang sudah dilepas GUI, lalu majukan tail ring"""
+        try:
+            if timeout:
+                self._released.add(self.release_queue.get(timeout=timeout))
+            while True:
+                self._released.add(self.release_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        while self._blocks and self._blocks[0][0] in self._released:
+            self._released.discard(self._blocks.popleft()[0])
+
+    def _find_space(self, size):
+        """Offset untuk block berukuran size, atau None jika belum ada ruang"""
+        if not self._blocks:
+            return 0 if size <= self.capacity else None
+
+        head = self._blocks[-1][2]
+        tail = self._blocks[0][1]
+
+        if self._blocks[0][1] <= self._blocks[-1][1]:
+            # Region terpakai [tail, head): ruang di akhir buffer, lalu wrap ke awal
+            if self.capacity - head >= size:
+                return head
+            if tail >= size:
+                return 0
+            return None
+
+        # Sudah wrap: ruang kosong hanya [head, tail)
+        return head if tail - head >= size else None
+
+    def allocate(self, size, timeout=SHM_ALLOC_TIMEOUT):
+        """
+        Alokasikan block
+
+        Args:
+            size (int): Ukuran (byte)
+            timeout (float): Maksimum waktu menunggu GUI melepas block
+
+        Returns:
+            tuple: (block_id, offset) atau None jika tidak muat
+        """
+        size = _align(size)
+        if size > self.capacity:
+            return None
+
+        deadline = time.monotonic() + timeout
+        self._reclaim()
+        while True:
+            offset = self._find_space(size)
+            if offset is not None:
+                block_id = self._next_id
+                self._next_id += 1
+                self._blocks.append((block_id, offset, offset + size))
+                return block_id, offset
+
+            # Ring penuh oleh request ini sendiri: GUI belum akan melepasnya
+            if self._blocks[0][0] >= self._request_start_id:
+                return None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._reclaim(timeout=min(remaining, POLL_INTERVAL))
+
+
+class ResultProducer:
+    """Sisi worker process: tulis image ke ring, kirim metadata lewat queue"""
+
+    def __init__(self, shm_name, capacity, result_queue, release_queue):
+        self.shm = shared_memory.SharedMemory(name=shm_name)
+        self.result_queue = result_queue
+        self.ring = _FrameRing(capacity, release_queue)
+
+    def put(self, message):
+        """Kirim pesan kontrol (ready, done, error)"""
+        self.result_queue.put(message)
+
+    def begin_request(self):
+        """Dipanggil worker sebelum memproses request baru"""
+        self.ring.begin_request()
+
+    def send(self, compact, result_id, frames):
+        """
+        Kirim satu hasil render
+
+        Args:
+            compact (dict): Hasil compact (JSON-serializable)
+            result_id (str): ID hasil render
+            frames (dict): Nama -> image array
+        """
+        layout = {}
+        total = 0
+        for name, array in frames.items():
+            array = np.ascontiguousarray(array)
+            frames[name] = array
+            layout[name] = (total, array.shape, array.dtype.str)
+            total = _align(total + array.nbytes)
+
+        allocation = self.ring.allocate(total)
+        if allocation is None:
+            # Tidak muat / GUI belum melepas block: kirim langsung lewat queue
+            self.result_queue.put({
+                'type': 'result', 'compact': compact, 'result_id': result_id,
+                'block': None, 'frames': frames
+            })
+            return
+
+        block_id, offset = allocation
+        for name, array in frames.items():
+            start = offset + layout[name][0]
+            target = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf, offset=start)
+            target[...] = array
+
+        self.result_queue.put({
+            'type': 'result', 'compact': compact, 'result_id': result_id,
+            'block': (block_id, offset, layout), 'frames': None
+        })
+
+    def close(self):
+        """Lepas mapping shared memory (segmen tetap milik GUI)"""
+        self.shm.close()
+
+
+class ResultTransport:
+    """
+    Sisi GUI: pemilik segmen shared memory dan queue.
+
+    Buat di proses GUI, kirim producer_args() ke worker process, lalu
+    worker membuat ResultProducer(*args).
+    """
+
+    def __init__(self, context, size_mb):
+        """
+        Initialize Result Transport
+
+        Args:
+            context: multiprocessing context (mis. get_context('spawn'))
+            size_mb (int): Ukuran ring buffer (MB)
+        """
+        self.capacity = int(size_mb * 1024 * 1024)
+        self.shm = shared_memory.SharedMemory(create=True, size=self.capacity)
+        self.result_queue = context.Queue()
+        self.release_queue = context.Queue()
+
+    def producer_args(self):
+        """Argumen untuk ResultProducer di worker process"""
+        return (self.shm.name, self.capacity, self.result_queue, self.release_queue)
+
+    def receive(self, is_alive=None):
+        """
+        Tunggu pesan berikutnya dari worker
+
+        Args:
+            is_alive (callable): Cek worker masih hidup (selama menunggu)
+
+        Returns:
+            dict: Pesan; untuk 'result', image berupa view SharedFrame
+        """
+        while True:
+            try:
+                message = self.result_queue.get(timeout=POLL_INTERVAL)
+                break
+            except queue.Empty:
+                if is_alive is not None and not is_alive():
+                    raise Exception("❌ Worker process analisis berhenti tiba-tiba")
+
+        if message['type'] == 'result' and message['block'] is not None:
+            block_id, offset, layout = message['block']
+            lease = _Lease()
+            weakref.finalize(lease, self.release_queue.put, block_id)
+
+            frames = {}
+            for name, (relative, shape, dtype) in layout.items():
+                view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.shm.buf,
+                                  offset=offset + relative).view(SharedFrame)
+                view._lease = lease
+                frames[name] = view
+            message['frames'] = frames
+
+        return message
+
+    def close(self):
+        """Tutup dan hapus segmen shared memory"""
+        try:
+            self.shm.close()
+        except BufferError:
+            # Masih ada view yang dipegang; memori dibebaskan setelah view terakhir hilang
+            pass
+        self.shm.unlink()
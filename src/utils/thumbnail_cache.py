@@ -0,0 +1,296 @@
+"""
+Thumbnail Cache - Cache thumbnail per hasil untuk rendering Tk yang non-blocking
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from config.config import (THUMBNAIL_CACHE_SIZE, PHOTO_CACHE_SIZE, THUMBNAIL_WORKERS,
+                           GALLERY_CACHE_DIR, GALLERY_TILE_SIZE)
+from src.utils.image_utils import resize_image_for_display, numpy_to_photoimage
+from src.utils.profiling import span
+
+POLL_INTERVAL_MS = 15
+PLACEHOLDER_GRAY = 200
+
+
+class ThumbnailCache:
+    """
+    Cache dua tingkat untuk thumbnail display.
+
+    Tingkat pertama menyimpan array yang sudah di-resize (di-render off-thread),
+    tingkat kedua menyimpan PhotoImage yang dibuat lazily di Tk thread. Keduanya
+    dibatasi dengan LRU.
+    """
+
+    def __init__(self, max_items=THUMBNAIL_CACHE_SIZE, max_photos=PHOTO_CACHE_SIZE, workers=THUMBNAIL_WORKERS):
+        """
+        Initialize Thumbnail Cache
+
+        Args:
+            max_items (int): Jumlah maksimum array thumbnail
+            max_photos (int): Jumlah maksimum PhotoImage
+            workers (int): Jumlah thread untuk render thumbnail
+        """
+        self.max_items = max_items
+        self.max_photos = max_photos
+        self._arrays = OrderedDict()
+        self._photos = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnail')
+
+    @staticmethod
+    def make_key(result, kind, max_width, max_height):
+        """
+        Buat key cache untuk satu image dari hasil analisis
+
+        Args:
+            result (dict): Hasil analisis (harus punya 'result_id')
+            kind (str): Nama image dalam hasil, mis. 'combined_img'
+            max_width (int): Lebar maksimum thumbnail
+            max_height (int): Tinggi maksimum thumbnail
+
+        Returns:
+            tuple: Key cache
+        """
+        return (result['result_id'], kind, max_width, max_height)
+
+    def _store_array(self, key, thumbnail):
+        """Simpan array thumbnail dengan eviction LRU"""
+        with self._lock:
+            self._arrays[key] = thumbnail
+            self._arrays.move_to_end(key)
+            while len(self._arrays) > self.max_items:
+                self._arrays.popitem(last=False)
+
+    def _render(self, key, image, max_width, max_height):
+        """Resize image ke thumbnail (dijalankan di worker thread)"""
+        with span('thumbnail_render'):
+            thumbnail = resize_image_for_display(image, max_width=max_width, max_height=max_height)
+        if not thumbnail.flags.owndata:
+            # Image kecil tidak di-resize: jangan menahan buffer sumber (mis. shared memory)
+            thumbnail = np.array(thumbnail)
+        self._store_array(key, thumbnail)
+        return thumbnail
+
+    def prerender(self, result, kind, max_width, max_height):
+        """
+        Render thumbnail secara sinkron (dipanggil dari worker thread analisis)
+
+        Args:
+            result (dict): Hasil analisis
+            kind (str): Nama image dalam hasil
+            max_width (int): Lebar maksimum
+            max_height (int): Tinggi maksimum
+        """
+        key = self.make_key(result, kind, max_width, max_height)
+        with self._lock:
+            if key in self._arrays:
+                return
+        self._render(key, result[kind], max_width, max_height)
+
+    def _get_photo(self, key):
+        """Ambil PhotoImage dari cache, buat dari array jika perlu (Tk thread)"""
+        with self._lock:
+            photo = self._photos.get(key)
+            if photo is not None:
+                self._photos.move_to_end(key)
+                return photo
+
+            thumbnail = self._arrays.get(key)
+            if thumbnail is None:
+                return None
+            self._arrays.move_to_end(key)
+
+        return self._store_photo(key, thumbnail)
+
+    def _store_photo(self, key, thumbnail):
+        """Buat PhotoImage dari array thumbnail dan simpan di cache (Tk thread)"""
+        with span('photoimage_convert'):
+            photo = numpy_to_photoimage(thumbnail)
+
+        with self._lock:
+            self._photos[key] = photo
+            while len(self._photos) > self.max_photos:
+                self._photos.popitem(last=False)
+
+        return photo
+
+    def request_photo(self, widget, result, kind, max_width, max_height, callback):
+        """
+        Minta PhotoImage thumbnail tanpa mem-block Tk main loop
+
+        Jika thumbnail sudah tersedia, callback dipanggil langsung. Jika belum,
+        thumbnail di-render di background dan callback dipanggil dari Tk thread
+        (via widget.after) setelah selesai. Jika render gagal, error dicetak
+        dan callback dipanggil dengan placeholder abu-abu.
+
+        Args:
+            widget (tk.Widget): Widget untuk scheduling after()
+            result (dict): Hasil analisis
+            kind (str): Nama image dalam hasil
+            max_width (int): Lebar maksimum
+            max_height (int): Tinggi maksimum
+            callback (callable): Dipanggil dengan PhotoImage
+        """
+        key = self.make_key(result, kind, max_width, max_height)
+
+        photo = self._get_photo(key)
+        if photo is not None:
+            callback(photo)
+            return
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._render, key, result[kind], max_width, max_height)
+                self._pending[key] = future
+
+        def poll():
+            if not future.done():
+                widget.after(POLL_INTERVAL_MS, poll)
+                return
+
+            with self._lock:
+                self._pending.pop(key, None)
+
+            error = future.exception()
+            if error is not None:
+                print(f"❌ Error render thumbnail {kind}: {error}")
+                callback(numpy_to_photoimage(
+                    np.full((max_height, max_width, 3), PLACEHOLDER_GRAY, dtype=np.uint8)
+                ))
+                return
+
+            photo = self._get_photo(key)
+            if photo is None:
+                # Array sudah di-evict dari LRU sebelum sempat diambil: pakai hasil future
+                photo = self._store_photo(key, future.result())
+            callback(photo)
+
+        widget.after(POLL_INTERVAL_MS, poll)
+
+    def clear(self):
+        """Hapus semua thumbnail dari cache"""
+        with self._lock:
+            self._arrays.clear()
+            self._photos.clear()
+
+
+class DiskThumbnailCache:
+    """
+    Cache thumbnail di disk untuk gallery sesi besar.
+
+    Thumbnail disimpan sebagai JPEG kecil dengan key dari path, mtime dan
+    ukuran file, sehingga file yang berubah otomatis di-render ulang.
+    """
+
+    def __init__(self, cache_dir=GALLERY_CACHE_DIR, tile_size=GALLERY_TILE_SIZE):
+        """
+        Initialize Disk Thumbnail Cache
+
+        Args:
+            cache_dir (str): Folder cache thumbnail
+            tile_size (int): Ukuran maksimum sisi thumbnail (px)
+        """
+        self.cache_dir = cache_dir
+        self.tile_size = tile_size
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, image_path):
+        """
+        Get path file cache untuk image
+
+        Args:
+            image_path (str): Path image asli
+
+        Returns:
+            str: Path file thumbnail (None jika image tidak ada)
+        """
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+
+        payload = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.tile_size}"
+        key = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.jpg")
+
+    def load(self, image_path):
+        """
+        Load thumbnail RGB (dari cache disk atau decode + simpan)
+
+        Args:
+            image_path (str): Path image asli
+
+        Returns:
+            numpy.ndarray: Thumbnail RGB atau None jika gagal
+        """
+        cache_path = self.cache_path(image_path)
+        if cache_path is None:
+            return None
+
+        thumbnail = cv2.imread(cache_path) if os.path.exists(cache_path) else None
+        if thumbnail is None:
+            with span('gallery_thumbnail_decode'):
+                # Decode di resolusi 1/4 jauh lebih cepat untuk foto besar
+                image = cv2.imread(image_path, cv2.IMREAD_REDUCED_COLOR_4)
+                if image is None:
+                    return None
+
+                thumbnail = resize_image_for_display(image, self.tile_size, self.tile_size)
+                self._store(cache_path, thumbnail)
+
+        return cv2.cvtColor(thumbnail, cv2.COLOR_BGR2RGB)
+
+    def _store(self, cache_path, thumbnail):
+        """
+        Simpan thumbnail ke cache disk secara atomik
+
+        File ditulis ke .tmp unik per thread lalu di-replace, sehingga writer
+        lain atau load_bytes tidak pernah membaca JPEG yang setengah ditulis.
+        """
+        ok, encoded = cv2.imencode('.jpg', thumbnail, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        if not ok:
+            return
+
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded.tobytes())
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Cache hanya optimasi; gagal simpan tidak menggagalkan load
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load_bytes(self, image_path):
+        """
+        Load thumbnail sebagai JPEG bytes (tanpa decode jika sudah di-cache)
+
+        Args:
+            image_path (str): Path image asli
+
+        Returns:
+            bytes: Isi file JPEG thumbnail atau None jika gagal
+        """
+        cache_path = self.cache_path(image_path)
+        if cache_path is None:
+            return None
+
+        if not os.path.exists(cache_path):
+            thumbnail = self.load(image_path)
+            if thumbnail is None:
+                return None
+            if not os.path.exists(cache_path):
+                # Cache disk tidak bisa ditulis: encode langsung dari memori
+                ok, encoded = cv2.imencode('.jpg', cv2.cvtColor(thumbnail, cv2.COLOR_RGB2BGR),
+                                           [cv2.IMWRITE_JPEG_QUALITY, 85])
+                return encoded.tobytes() if ok else None
+
+        with open(cache_path, 'rb') as f:
+            return f.read()
@@ -0,0 +1,116 @@
+"""
+Trend Plot - Render grafik trend komponen postur (matplotlib, tanpa pyplot)
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+from config.config import TREND_PLOT_CACHE_SIZE
+
+TREND_PANELS = [
+    ('shoulder', 'Shoulder Imbalance', 'mm'),
+    ('hip', 'Hip Imbalance', 'mm'),
+    ('spine', 'Spine Deviation', 'mm'),
+    ('head_shift', 'Head Shift', 'mm'),
+    ('head_tilt', 'Head Tilt', '°'),
+    ('score', 'Overall Score', '/100'),
+]
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def render_trend_image(patient, trends, aggregates, width=1000, height=650, dpi=100):
+    """
+    Render grafik trend semua komponen ke array RGB
+
+    Menggunakan Figure + FigureCanvasAgg secara langsung (bukan pyplot) sehingga
+    aman dijalankan di luar Tk thread.
+
+    Args:
+        patient (str): Nama pasien
+        trends (dict): component -> list of (created_at, mean)
+        aggregates (dict): component -> statistik aggregate
+        width (int): Lebar image (px)
+        height (int): Tinggi image (px)
+        dpi (int): DPI figure
+
+    Returns:
+        numpy.ndarray: Image RGB
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    fig.suptitle(f"Trend Postur: {patient}", fontsize=13, fontweight='bold')
+
+    axes = fig.subplots(2, 3)
+    for ax, (component, title, unit) in zip(axes.flat, TREND_PANELS):
+        points = trends.get(component, [])
+        ax.set_title(title, fontsize=10)
+        ax.set_ylabel(unit, fontsize=8)
+        ax.tick_params(labelsize=7)
+        ax.grid(alpha=0.3)
+
+        if not points:
+            ax.text(0.5, 0.5, "Belum ada data", ha='center', va='center', transform=ax.transAxes, color='gray')
+            continue
+
+        dates = [datetime.fromisoformat(created_at) for created_at, _ in points]
+        values = [value for _, value in points]
+        ax.plot(dates, values, marker='o', markersize=3, linewidth=1.2, color='#3498db')
+
+        # Running mean dan ±1 std dari aggregate incremental
+        stats = aggregates.get(component)
+        if stats:
+            ax.axhline(stats['mean'], color='#27ae60', linestyle='--', linewidth=1)
+            if stats['std'] > 0:
+                ax.axhspan(stats['mean'] - stats['std'], stats['mean'] + stats['std'], color='#27ae60', alpha=0.1)
+
+    fig.autofmt_xdate(rotation=30)
+    fig.tight_layout(rect=(0, 0, 1, 0.95))
+    canvas.draw()
+
+    rgba = np.asarray(canvas.buffer_rgba())
+    return rgba[:, :, :3].copy()
+
+
+def get_trend_image(db, patient, width=1000, height=650):
+    """
+    Get image trend dari cache atau render baru
+
+    Cache di-key dengan ID sesi terakhir pasien, sehingga otomatis invalid
+    ketika ada sesi baru.
+
+    Args:
+        db (ResultsDatabase): Database hasil
+        patient (str): Nama pasien
+        width (int): Lebar image
+        height (int): Tinggi image
+
+    Returns:
+        numpy.ndarray: Image RGB
+    """
+    key = (patient, db.get_latest_session_id(patient), width, height)
+
+    with _cache_lock:
+        image = _cache.get(key)
+        if image is not None:
+            _cache.move_to_end(key)
+            return image
+
+    image = render_trend_image(
+        patient,
+        db.get_patient_trends(patient),
+        db.get_patient_aggregates(patient),
+        width,
+        height
+    )
+
+    with _cache_lock:
+        _cache[key] = image
+        while len(_cache) > TREND_PLOT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return image